@@ -10,6 +10,11 @@ const mockAdvanceOneStep = jest.fn().mockResolvedValue(true);
 const mockSetSpeedFactor = jest.fn();
 const mockSkipTo = jest.fn().mockResolvedValue(true);
 const mockGetTotalSteps = () => 100;
+const mockAppendEvents = jest.fn();
+const mockFinishLoading = jest.fn();
+const mockLoadBase64SimulationData = jest
+  .fn()
+  .mockResolvedValue({ grid: { width: 0 } });
 
 jest.mock('simplay-web', () => {
   return {
@@ -22,11 +27,21 @@ jest.mock('simplay-web', () => {
         setSpeedFactor: mockSetSpeedFactor,
         skipTo: mockSkipTo,
         getTotalSteps: mockGetTotalSteps,
+        appendEvents: mockAppendEvents,
+        finishLoading: mockFinishLoading,
         addStepChangedEventListener: (callback: (step: number) => void) => {
           callback(1);
         }
       };
-    })
+    }),
+    loadBase64SimulationData: (data: string) =>
+      mockLoadBase64SimulationData(data)
+  };
+});
+
+jest.mock('../worker', () => {
+  return {
+    createSimulationDataWorker: () => undefined
   };
 });
 
@@ -166,4 +181,76 @@ describe('RenderSimplay tests', () => {
       expect(mockSetSpeedFactor).toHaveBeenCalled();
     });
   });
+
+  it('should load gzip compressed data', () => {
+    const gzipRenderer = new RenderSimplay({
+      mimeType: 'application/simplay+gzip'
+    } as IRenderMime.IRendererOptions);
+    const gzipModel = {
+      data: {
+        'application/simplay+gzip': 'H4sIAAAAAAAAA6uu5QIAG6eAzQMAAAA='
+      } as IRenderMime.IMimeModel.ISetDataOptions
+    } as IRenderMime.IMimeModel;
+    return gzipRenderer.renderModel(gzipModel).then(() => {
+      expect(mockLoadBase64SimulationData).toHaveBeenCalledWith(
+        'H4sIAAAAAAAAA6uu5QIAG6eAzQMAAAA='
+      );
+      expect(SimulationSpooler).toHaveBeenCalled();
+    });
+  });
+
+  it('should append the updates of a live output', async () => {
+    const liveRenderer = new RenderSimplay({
+      mimeType: 'application/simplay+json'
+    } as IRenderMime.IRendererOptions);
+    const update = (data: Record<string, unknown>) =>
+      ({
+        data: { 'application/simplay+json': data }
+      } as unknown as IRenderMime.IMimeModel);
+    const calls = (SimulationSpooler as unknown as jest.Mock).mock.calls
+      .length;
+    await liveRenderer.renderModel(
+      update({
+        grid: { width: 0 },
+        events: [],
+        live: { id: 'a', sequence: 0, until: 0 }
+      })
+    );
+    const events = [{ forId: 'x', timestamp: 1 }];
+    await liveRenderer.renderModel(
+      update({ events, live: { id: 'a', sequence: 1, until: 1 } })
+    );
+    await liveRenderer.renderModel(
+      update({
+        grid: { width: 0 },
+        events,
+        live: { id: 'a', sequence: 2, done: true, streamed: 1 }
+      })
+    );
+    expect(
+      (SimulationSpooler as unknown as jest.Mock).mock.calls.length
+    ).toBe(calls + 1);
+    expect(mockAppendEvents).toHaveBeenCalledWith(events, 1);
+    expect(mockFinishLoading).toHaveBeenCalled();
+  });
+
+  it('should wait for the end of a live output it missed the start of', () => {
+    const liveRenderer = new RenderSimplay({
+      mimeType: 'application/simplay+json'
+    } as IRenderMime.IRendererOptions);
+    return liveRenderer
+      .renderModel({
+        data: {
+          'application/simplay+json': {
+            events: [],
+            live: { id: 'a', sequence: 3, until: 1 }
+          }
+        } as unknown as IRenderMime.IMimeModel.ISetDataOptions
+      } as IRenderMime.IMimeModel)
+      .then(() => {
+        expect(
+          liveRenderer.node.querySelector('.simplay-loading')?.textContent
+        ).toBe('Simulation is running…');
+      });
+  });
 });
@@ -0,0 +1,120 @@
+import { SimulationDataSerialized, SimulationSpooler } from 'simplay-web';
+import { LiveStream } from '../live';
+
+function event(timestamp: number) {
+  return {
+    forId: 'tank',
+    timestamp,
+    action: 'CONTAINER.SET_LEVEL',
+    args: { level: timestamp }
+  } as unknown as SimulationDataSerialized['events'][number];
+}
+
+function createSpooler(appendEvents = jest.fn()) {
+  return {
+    appendEvents,
+    finishLoading: jest.fn()
+  } as unknown as SimulationSpooler & {
+    appendEvents: jest.Mock;
+    finishLoading: jest.Mock;
+  };
+}
+
+describe('LiveStream tests', () => {
+  it('should set the loaded steps of the first update', () => {
+    const spooler = createSpooler();
+    new LiveStream({ id: 'a', sequence: 0, until: 3 }, spooler, jest.fn());
+    expect(spooler.appendEvents).toHaveBeenCalledWith([], 3);
+  });
+
+  it('should append the events of every update', () => {
+    const spooler = createSpooler();
+    const onAppended = jest.fn();
+    const stream = new LiveStream(
+      { id: 'a', sequence: 0, until: 0 },
+      spooler,
+      onAppended
+    );
+    const events = [event(1), event(2)];
+    expect(
+      stream.update({ events, live: { id: 'a', sequence: 1, until: 2 } })
+    ).toBe(true);
+    expect(spooler.appendEvents).toHaveBeenLastCalledWith(events, 2);
+    expect(onAppended).toHaveBeenCalledTimes(1);
+  });
+
+  it('should append the remaining events once done', () => {
+    const spooler = createSpooler();
+    const stream = new LiveStream(
+      { id: 'a', sequence: 0, until: 0 },
+      spooler,
+      jest.fn()
+    );
+    stream.update({
+      events: [event(1)],
+      live: { id: 'a', sequence: 1, until: 1 }
+    });
+    expect(
+      stream.update({
+        events: [event(1), event(2)],
+        live: { id: 'a', sequence: 2, done: true, streamed: 1 }
+      })
+    ).toBe(true);
+    expect(spooler.appendEvents).toHaveBeenLastCalledWith(
+      [event(2)],
+      Infinity
+    );
+    expect(spooler.finishLoading).toHaveBeenCalled();
+  });
+
+  it('should render from scratch once done if an update was missed', () => {
+    const spooler = createSpooler();
+    const stream = new LiveStream(
+      { id: 'a', sequence: 0, until: 0 },
+      spooler,
+      jest.fn()
+    );
+    expect(
+      stream.update({
+        events: [event(2)],
+        live: { id: 'a', sequence: 2, until: 2 }
+      })
+    ).toBe(true);
+    expect(spooler.appendEvents).toHaveBeenCalledTimes(1);
+    expect(
+      stream.update({
+        events: [event(1), event(2)],
+        live: { id: 'a', sequence: 3, done: true, streamed: 1 }
+      })
+    ).toBe(false);
+    expect(spooler.finishLoading).not.toHaveBeenCalled();
+  });
+
+  it('should stop appending events that precede the streamed events', () => {
+    const appendEvents = jest.fn();
+    const spooler = createSpooler(appendEvents);
+    const stream = new LiveStream(
+      { id: 'a', sequence: 0, until: 0 },
+      spooler,
+      jest.fn()
+    );
+    appendEvents.mockImplementationOnce(() => {
+      throw new Error('Appended events must not precede the indexed events');
+    });
+    stream.update({
+      events: [event(0)],
+      live: { id: 'a', sequence: 1, until: 5 }
+    });
+    stream.update({
+      events: [event(6)],
+      live: { id: 'a', sequence: 2, until: 6 }
+    });
+    expect(appendEvents).toHaveBeenCalledTimes(2);
+    expect(
+      stream.update({
+        events: [],
+        live: { id: 'a', sequence: 3, done: true, streamed: 2 }
+      })
+    ).toBe(false);
+  });
+});
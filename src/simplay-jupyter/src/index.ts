@@ -1,6 +1,12 @@
 import { Widget } from '@lumino/widgets';
 import { IRenderMime } from '@jupyterlab/rendermime-interfaces';
-import { SimulationSpooler, SimulationDataSerialized } from 'simplay-web';
+import {
+  SimulationSpooler,
+  SimulationDataSerialized,
+  decodeBase64,
+  loadBase64SimulationData,
+  loadSimulationDataInWorker
+} from 'simplay-web';
 import playIcon from '../style/icons/play_arrow.svg';
 import pauseIcon from '../style/icons/pause.svg';
 import skipIcon from '../style/icons/skip_next.svg';
@@ -12,6 +18,8 @@ import { Handler } from './utils';
 import { SpeedSelector, SpeedSelectorValues } from './speedSelector';
 import { AccurateSlider } from './accurateSlider';
 import { StepInfo } from './stepInfo';
+import { createSimulationDataWorker } from './worker';
+import { LiveSimulationData, LiveStream } from './live';
 
 const SIMPLAY_CSS_COMMON_CLASS = 'jp-render-simplay';
 
@@ -21,6 +29,12 @@ const SIMPLAY_CSS_COMMON_CLASS = 'jp-render-simplay';
  */
 export const SIMPLAY_MIME_TYPE = 'application/simplay+json';
 
+/**
+ * The MIME type for gzip compressed simplay, embedded base64 encoded.
+ *
+ */
+export const SIMPLAY_GZIP_MIME_TYPE = 'application/simplay+gzip';
+
 /**
  * A widget for rendering SimPlay, for usage with rendermime.
  */
@@ -31,6 +45,7 @@ export class RenderSimplay extends Widget implements IRenderMime.IRenderer {
     super();
     console.info('JupyterLab extension simplay_jupyter is activated!');
     this._mimeType = options.mimeType;
+    this._resolver = options.resolver;
     this.addClass(SIMPLAY_CSS_COMMON_CLASS);
   }
 
@@ -38,30 +53,140 @@ export class RenderSimplay extends Widget implements IRenderMime.IRenderer {
    * Render SimPlay into this widget's node.
    */
   renderModel(model: IRenderMime.IMimeModel): Promise<void> {
+    // updates of a live output must be applied in order, even while the
+    // first update is still loading
+    const rendered = this._rendered.then(() => this.render(model));
+    this._rendered = rendered.catch(() => undefined);
+    return rendered;
+  }
+
+  private async render(model: IRenderMime.IMimeModel): Promise<void> {
+    const source = model.data[this._mimeType];
+    const live =
+      typeof source === 'string'
+        ? undefined
+        : (source as unknown as LiveSimulationData).live;
+    if (
+      live &&
+      this._liveStream &&
+      this._liveStream.update(source as unknown as LiveSimulationData)
+    ) {
+      return;
+    }
+    this._liveStream = undefined;
     this.reset();
-    const data = model.data[
-      this._mimeType
-    ] as unknown as SimulationDataSerialized;
+    if (live && !live.done && live.sequence > 0) {
+      // the start of the stream was missed, e.g. the notebook was opened
+      // while the simulation was running
+      this.showStatus('Simulation is running…');
+      return;
+    }
+    const { data: loaded, eventOrder } =
+      typeof source === 'string'
+        ? await this.load(source)
+        : {
+            data: source as unknown as SimulationDataSerialized,
+            eventOrder: undefined
+          };
+    const data = await this.resolveAssets(loaded);
 
     // add 4 to align the left and right side of the grid and the slider
     const simplayContainer = this.createSimplayContainer(data.grid.width + 4);
     const simplayGridContainer = this.createSimplayGridContainer();
     const controlsContainer = this.createControlsContainer();
 
-    const simulationSpooler = new SimulationSpooler(data, simplayGridContainer);
+    const streaming = live && !live.done ? live : undefined;
+    const simulationSpooler = new SimulationSpooler(
+      data,
+      simplayGridContainer,
+      { eventOrder, loading: streaming !== undefined }
+    );
 
-    this.createControls(controlsContainer, simulationSpooler);
+    const updateTotalSteps = this.createControls(
+      controlsContainer,
+      simulationSpooler
+    );
+    if (streaming) {
+      this._liveStream = new LiveStream(streaming, simulationSpooler, () =>
+        updateTotalSteps(simulationSpooler.getTotalSteps())
+      );
+    }
 
     simplayContainer.appendChild(simplayGridContainer);
     simplayContainer.appendChild(controlsContainer);
     this.node.appendChild(simplayContainer);
-    return Promise.resolve();
   }
 
+  /**
+   * Loads base64 encoded simulation data in a worker if possible, showing
+   * the progress in the meantime.
+   */
+  private async load(
+    source: string
+  ): Promise<{ data: SimulationDataSerialized; eventOrder?: Int32Array }> {
+    const worker = createSimulationDataWorker();
+    if (!worker) {
+      return { data: await loadBase64SimulationData(source) };
+    }
+    const progress = this.showStatus('Loading simulation…');
+    try {
+      return await loadSimulationDataInWorker(
+        decodeBase64(source),
+        worker,
+        stage => {
+          progress.textContent =
+            stage === 'decoding'
+              ? 'Decoding simulation…'
+              : 'Indexing simulation events…';
+        }
+      );
+    } finally {
+      worker.terminate();
+      progress.remove();
+    }
+  }
+
+  private showStatus(text: string): HTMLDivElement {
+    const status = document.createElement('div');
+    status.classList.add('simplay-loading');
+    status.setAttribute('role', 'status');
+    status.textContent = text;
+    this.node.appendChild(status);
+    return status;
+  }
+
+  /**
+   * Resolves assets that are not embedded in the data, relative to the
+   * notebook or file the output belongs to.
+   */
+  private async resolveAssets(
+    data: SimulationDataSerialized
+  ): Promise<SimulationDataSerialized> {
+    const resolver = this._resolver;
+    if (!resolver || !data.assets) {
+      return data;
+    }
+    const assets: Record<string, string> = {};
+    for (const [hash, asset] of Object.entries(data.assets)) {
+      const isLocal = resolver.isLocal ? resolver.isLocal(asset) : true;
+      if (asset.startsWith('data:') || !isLocal) {
+        assets[hash] = asset;
+        continue;
+      }
+      const path = await resolver.resolveUrl(asset);
+      assets[hash] = await resolver.getDownloadUrl(path);
+    }
+    return { ...data, assets };
+  }
+
+  /**
+   * @returns a function that updates the total number of steps the
+   * controls show, e.g. when events of a live simulation are added
+   */
   private createControls(
     controlsContainer: HTMLDivElement,
     simulationSpooler: SimulationSpooler
-  ) {
+  ): (totalSteps: number) => void {
     const sliderContainer = document.createElement('div');
     sliderContainer.classList.add('simplay-controls');
     const controlButtonsContainer = document.createElement('div');
@@ -77,7 +202,7 @@ export class RenderSimplay extends Widget implements IRenderMime.IRenderer {
     const stepInfo = new StepInfo(
       'simplay-step-info',
       0,
-      simulationSpooler.getTotalSteps()
+      RenderSimplay.sliderMax(simulationSpooler.getTotalSteps())
     );
     const stepSlider = this.createStepSlider(
       simulationSpooler,
@@ -113,6 +238,18 @@ export class RenderSimplay extends Widget implements IRenderMime.IRenderer {
 
     controlsContainer.appendChild(sliderContainer);
     controlsContainer.appendChild(controlButtonsContainer);
+
+    return totalSteps => {
+      stepInfo.totalSteps = RenderSimplay.sliderMax(totalSteps);
+      stepSlider.maxVal = RenderSimplay.sliderMax(totalSteps);
+    };
+  }
+
+  /**
+   * The slider needs a range, a live simulation may not have any steps yet
+   */
+  private static sliderMax(totalSteps: number): number {
+    return Math.max(totalSteps, 1);
   }
 
   private reset() {
@@ -158,7 +295,7 @@ export class RenderSimplay extends Widget implements IRenderMime.IRenderer {
     const stepSlider = new AccurateSlider(
       'simplay-slider',
       0,
-      simulationSpooler.getTotalSteps(),
+      RenderSimplay.sliderMax(simulationSpooler.getTotalSteps()),
       0
     );
 
@@ -324,6 +461,9 @@ export class RenderSimplay extends Widget implements IRenderMime.IRenderer {
   }
 
   private _mimeType: string;
+  private _resolver: IRenderMime.IResolver | null;
+  private _liveStream?: LiveStream;
+  private _rendered: Promise<void> = Promise.resolve();
 }
 
 /**
@@ -331,7 +471,7 @@ export class RenderSimplay extends Widget implements IRenderMime.IRenderer {
  */
 export const rendererFactory: IRenderMime.IRendererFactory = {
   safe: true,
-  mimeTypes: [SIMPLAY_MIME_TYPE],
+  mimeTypes: [SIMPLAY_MIME_TYPE, SIMPLAY_GZIP_MIME_TYPE],
   createRenderer: options => new RenderSimplay(options)
 };
 
@@ -359,4 +499,28 @@ const extension: IRenderMime.IExtension = {
   ]
 };
 
-export default extension;
+const compressedExtension: IRenderMime.IExtension = {
+  id: 'simplay-jupyter:gzip',
+  rendererFactory,
+  rank: 59,
+  dataType: 'string',
+  documentWidgetFactoryOptions: [
+    {
+      name: 'Simplay (gzip)',
+      primaryFileType: 'simplay-gzip',
+      fileTypes: ['simplay-gzip'],
+      defaultFor: ['simplay-gzip']
+    }
+  ],
+  fileTypes: [
+    {
+      mimeTypes: [SIMPLAY_GZIP_MIME_TYPE],
+      name: 'simplay-gzip',
+      extensions: ['.simplay.gz'],
+      iconClass: 'jp-simplayIcon',
+      fileFormat: 'base64'
+    }
+  ]
+};
+
+export default [extension, compressedExtension];
@@ -0,0 +1,100 @@
+import { SimulationDataSerialized, SimulationSpooler } from 'simplay-web';
+
+/**
+ * Added by the kernel to every update of an output that streams a
+ * simulation while it runs, see `simplay.live`
+ */
+export interface LiveUpdate {
+  /**
+   * Id of the stream
+   */
+  id: string;
+  /**
+   * Number of the update, starting at 0
+   */
+  sequence: number;
+  /**
+   * The first step whose events may still be streamed
+   */
+  until?: number;
+  /**
+   * Set on the last update, which holds the complete simulation
+   */
+  done?: boolean;
+  /**
+   * Number of events streamed before the last update
+   */
+  streamed?: number;
+}
+
+/**
+ * The data of an update of a live output. The first and the last update
+ * hold the complete simulation, all others only the new events.
+ */
+export interface LiveSimulationData extends Partial<SimulationDataSerialized> {
+  live: LiveUpdate;
+}
+
+/**
+ * Appends the updates of a live output to the spooler playing it
+ */
+export class LiveStream {
+  private sequence: number;
+  private broken = false;
+
+  /**
+   * @param live the first update of the stream
+   * @param spooler created from the first update, with the loading option
+   * @param onAppended called after events were appended
+   */
+  constructor(
+    live: LiveUpdate,
+    private spooler: SimulationSpooler,
+    private onAppended: () => void
+  ) {
+    this.sequence = live.sequence;
+    this.spooler.appendEvents([], live.until ?? 0);
+  }
+
+  /**
+   * Applies an update of the output
+   * @param data of the update
+   * @returns false if the update must be rendered from scratch instead,
+   * because it is the last update and an update was missed
+   */
+  update(data: LiveSimulationData): boolean {
+    const { live } = data;
+    const events = data.events ?? [];
+    const inSequence = live.sequence === this.sequence + 1;
+    this.sequence = live.sequence;
+    if (live.done) {
+      if (inSequence && !this.broken) {
+        this.append(events.slice(live.streamed ?? 0), Infinity);
+      }
+      if (!inSequence || this.broken) {
+        return false;
+      }
+      this.spooler.finishLoading();
+      return true;
+    }
+    if (!inSequence) {
+      this.broken = true;
+    }
+    if (!this.broken) {
+      this.append(events, live.until ?? 0);
+    }
+    return true;
+  }
+
+  private append(events: SimulationDataSerialized['events'], until: number) {
+    try {
+      this.spooler.appendEvents(events, until);
+    } catch {
+      // events recorded in the past of the streamed events, they are shown
+      // once the stream is done
+      this.broken = true;
+      return;
+    }
+    this.onAppended();
+  }
+}
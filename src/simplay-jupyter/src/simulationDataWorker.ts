@@ -0,0 +1,3 @@
+// Entry point of the worker simulations are prepared in, bundled by
+// webpack on its own, see createSimulationDataWorker
+import 'simplay-web/dist/SimulationDataWorker';
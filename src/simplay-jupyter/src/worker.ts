@@ -0,0 +1,12 @@
+/**
+ * Creates the worker simulations are decoded and indexed in, so large
+ * simulations do not block JupyterLab while they are loaded.
+ *
+ * @returns the worker, or undefined if workers are not available
+ */
+export function createSimulationDataWorker(): Worker | undefined {
+  if (typeof Worker === 'undefined') {
+    return undefined;
+  }
+  return new Worker(new URL('./simulationDataWorker.js', import.meta.url));
+}
@@ -0,0 +1,33 @@
+import { LiveSimulationClient } from '../../src/LiveSimulationClient';
+
+const container = document.getElementById('simulationContainer');
+const status = document.getElementById('status');
+const currentTick = document.getElementById('currentTick');
+
+function showStatus(text: string) {
+  if (status) {
+    status.textContent = text;
+  }
+}
+
+function connect() {
+  if (!container) {
+    return;
+  }
+  const protocol = location.protocol === 'https:' ? 'wss:' : 'ws:';
+  const socket = new WebSocket(`${protocol}//${location.host}/events`);
+  const client = new LiveSimulationClient(socket, container);
+  client.addStateListener((spooler) => {
+    showStatus('Live');
+    spooler.addStepChangedEventListener((timestamp) => {
+      if (currentTick) {
+        currentTick.textContent = timestamp.toString();
+      }
+    });
+  });
+  socket.addEventListener('close', () =>
+    showStatus('Disconnected, the simulation has ended')
+  );
+}
+
+connect();
@@ -0,0 +1,182 @@
+import { EventAction } from './event/EventAction';
+import { BinaryEventColumnsSerialized } from './event/EventColumnsSerialized';
+import { EventSerialized } from './event/EventSerialized';
+import { SimulationDataSerialized } from './SimulationDataSerialized';
+
+/**
+ * First bytes of every binary simulation, the last byte is the version
+ */
+const MAGIC = [0x53, 0x49, 0x4d, 0x50, 0x4c, 0x41, 0x59, 0x01];
+const PREAMBLE_SIZE = 16;
+const ALIGNMENT = 8;
+
+const KIND_BITS = 3;
+const KIND_MASK = (1 << KIND_BITS) - 1;
+const ARG0_SHIFT = KIND_BITS;
+const ARG1_SHIFT = 2 * KIND_BITS;
+const RAW_ARGS = 1 << 15;
+const KIND_INT = 1;
+const KIND_FLOAT = 2;
+const KIND_BOOL = 3;
+const KIND_STR = 4;
+const KIND_OBJECT = 5;
+
+interface BinaryHeader extends Omit<SimulationDataSerialized, 'events'> {
+  actions: EventAction[];
+  argNames: string[][];
+  strings: string[];
+  objects: unknown[];
+}
+
+function align(offset: number): number {
+  return offset + ((ALIGNMENT - (offset % ALIGNMENT)) % ALIGNMENT);
+}
+
+/**
+ * Checks whether the given data is a binary simulation
+ * @param buffer data to check
+ * @returns true if the data starts with the binary format's magic bytes
+ */
+export function isBinarySimulationData(buffer: ArrayBuffer): boolean {
+  if (buffer.byteLength < PREAMBLE_SIZE) {
+    return false;
+  }
+  const magic = new Uint8Array(buffer, 0, MAGIC.length);
+  return MAGIC.every((byte, index) => magic[index] === byte);
+}
+
+/**
+ * Reads a simulation written by `write_binary` of the simplay python
+ * package without decoding its events. The events are kept in their typed
+ * columns, which are read without copying, only the header with entities,
+ * visuals, grid and the string table is JSON.
+ * @param buffer binary simulation
+ * @returns the simulation with its events in binaryEventColumns
+ */
+export function readSimulationData(
+  buffer: ArrayBuffer
+): SimulationDataSerialized {
+  if (!isBinarySimulationData(buffer)) {
+    throw new Error('Data is not a binary SimPlay simulation');
+  }
+  const view = new DataView(buffer);
+  const headerLength = view.getUint32(8, true);
+  const count = view.getUint32(12, true);
+  const header = JSON.parse(
+    new TextDecoder().decode(
+      new Uint8Array(buffer, PREAMBLE_SIZE, headerLength)
+    )
+  ) as BinaryHeader;
+
+  let offset = align(PREAMBLE_SIZE + headerLength);
+  const column = <T>(
+    ctor: { new (buffer: ArrayBuffer, offset: number, length: number): T },
+    bytesPerElement: number
+  ): T => {
+    const result = new ctor(buffer, offset, count);
+    offset = align(offset + count * bytesPerElement);
+    return result;
+  };
+
+  return {
+    events: [],
+    binaryEventColumns: {
+      timestamps: column(Float64Array, 8),
+      arg0: column(Float64Array, 8),
+      arg1: column(Float64Array, 8),
+      forIds: column(Uint32Array, 4),
+      kinds: column(Uint16Array, 2),
+      actionCodes: column(Uint8Array, 1),
+      actions: header.actions,
+      argNames: header.argNames,
+      strings: header.strings,
+      objects: header.objects,
+    },
+    entities: header.entities,
+    visuals: header.visuals,
+    assets: header.assets,
+    grid: header.grid,
+    keyframes: header.keyframes,
+  };
+}
+
+/**
+ * Decodes the events of a binary simulation from their typed columns
+ * @param columns the events, see readSimulationData
+ * @returns the events in the order they were recorded
+ */
+export function eventsFromBinaryColumns(
+  columns: BinaryEventColumnsSerialized
+): EventSerialized[] {
+  const {
+    timestamps,
+    arg0,
+    arg1,
+    forIds,
+    kinds,
+    actionCodes,
+    strings,
+    objects,
+    argNames,
+  } = columns;
+  const decode = (kind: number, value: number): unknown => {
+    switch (kind) {
+      case KIND_INT:
+      case KIND_FLOAT:
+        return value;
+      case KIND_BOOL:
+        return value !== 0;
+      case KIND_STR:
+        return strings[value];
+      case KIND_OBJECT:
+        return objects[value];
+      default:
+        return undefined;
+    }
+  };
+
+  const count = timestamps.length;
+  const events: EventSerialized[] = new Array(count);
+  for (let i = 0; i < count; i++) {
+    const code = actionCodes[i];
+    const kind = kinds[i];
+    let args: Record<string, unknown>;
+    if (kind & RAW_ARGS) {
+      args = objects[arg0[i]] as Record<string, unknown>;
+    } else {
+      args = {};
+      const names = argNames[code];
+      if (names.length > 0) {
+        args[names[0]] = decode((kind >> ARG0_SHIFT) & KIND_MASK, arg0[i]);
+      }
+      if (names.length > 1) {
+        args[names[1]] = decode((kind >> ARG1_SHIFT) & KIND_MASK, arg1[i]);
+      }
+    }
+    events[i] = {
+      action: columns.actions[code],
+      args: args,
+      forId: strings[forIds[i]],
+      timestamp: timestamps[i],
+    };
+  }
+  return events;
+}
+
+/**
+ * Decodes a simulation written by `write_binary` of the simplay python
+ * package.
+ * @param buffer binary simulation
+ * @returns the simulation in the same form as the JSON output
+ */
+export function decodeSimulationData(
+  buffer: ArrayBuffer
+): SimulationDataSerialized {
+  const { binaryEventColumns, ...data } = readSimulationData(buffer);
+  return {
+    ...data,
+    events: eventsFromBinaryColumns(
+      binaryEventColumns as BinaryEventColumnsSerialized
+    ),
+  };
+}
@@ -0,0 +1,114 @@
+import { EventSerialized } from './event/EventSerialized';
+import { SimulationDataSerialized } from './SimulationDataSerialized';
+import {
+  SimulationSpooler,
+  SimulationSpoolerOptions,
+} from './SimulationSpooler';
+
+/**
+ * The format in the header of simulations written by `write_chunked`
+ */
+export const CHUNKED_FORMAT = 'simplay-chunked';
+
+/**
+ * First line of a chunked simulation, everything but the events
+ */
+export interface ChunkedSimulationHeader
+  extends Omit<SimulationDataSerialized, 'events' | 'eventColumns'> {
+  format: typeof CHUNKED_FORMAT;
+  /**
+   * The number of steps of a chunk
+   */
+  chunkSteps: number;
+}
+
+/**
+ * Every further line of a chunked simulation
+ */
+export interface EventChunkSerialized {
+  /**
+   * The first step after the chunk, the events of all steps before it are
+   * in this or an earlier chunk
+   */
+  until: number;
+  events: EventSerialized[];
+}
+
+/**
+ * Splits a stream of UTF-8 text into lines
+ * @param stream of text
+ */
+export async function* readLines(
+  stream: ReadableStream<Uint8Array>
+): AsyncGenerator<string> {
+  const reader = stream.getReader();
+  const decoder = new TextDecoder();
+  let rest = '';
+  for (;;) {
+    const { done, value } = await reader.read();
+    if (done) {
+      break;
+    }
+    const lines = (rest + decoder.decode(value, { stream: true })).split('\n');
+    rest = lines.pop() ?? '';
+    for (const line of lines) {
+      if (line) {
+        yield line;
+      }
+    }
+  }
+  rest += decoder.decode();
+  if (rest) {
+    yield rest;
+  }
+}
+
+/**
+ * Plays a simulation written by `write_chunked` while it is loading.
+ * Returns as soon as the header and the first chunk are read, the remaining
+ * chunks are appended to the spooler as they arrive.
+ * @param stream the content of the simulation file, e.g. the body of a
+ * fetch response
+ * @param container to display the simulation in
+ * @param options of the spooler
+ * @returns the spooler, and a promise that settles once all chunks are
+ * loaded
+ */
+export async function loadChunkedSimulation(
+  stream: ReadableStream<Uint8Array>,
+  container: HTMLElement,
+  options: SimulationSpoolerOptions = {}
+): Promise<{ spooler: SimulationSpooler; loaded: Promise<void> }> {
+  const lines = readLines(stream);
+  const first = await lines.next();
+  if (first.done) {
+    throw new Error('The simulation is empty');
+  }
+  const header = JSON.parse(first.value) as ChunkedSimulationHeader;
+  if (header.format !== CHUNKED_FORMAT) {
+    throw new Error(`Expected a ${CHUNKED_FORMAT} simulation`);
+  }
+  const spooler = new SimulationSpooler({ ...header, events: [] }, container, {
+    ...options,
+    loading: true,
+  });
+  const append = (line: string) => {
+    const chunk = JSON.parse(line) as EventChunkSerialized;
+    spooler.appendEvents(chunk.events, chunk.until);
+  };
+  const firstChunk = await lines.next();
+  if (!firstChunk.done) {
+    append(firstChunk.value);
+  }
+  const loaded = (async () => {
+    try {
+      for await (const line of lines) {
+        append(line);
+      }
+    } finally {
+      // playback must not stall forever if loading fails
+      spooler.finishLoading();
+    }
+  })();
+  return { spooler, loaded };
+}
@@ -26,6 +26,16 @@ export interface StoreEntity extends Entity {
   type: 'STORE';
   capacity: number;
   content: string;
+  /**
+   * The JSON text of the items of the store by their key, maintained by
+   * StoreUpdateContentEvents
+   */
+  items?: Map<number, string>;
+  /**
+   * Whether the items changed since the content was rendered, see
+   * renderStoreContent
+   */
+  contentPending?: boolean;
 }
 
 export interface ResourceEntity extends Entity {
@@ -79,21 +89,34 @@ export function getEntityDisplayObjectById(
   return entity;
 }
 
+export function getEntityMetadataById(
+  context: SimplayContext,
+  id: string
+): Entity {
+  const entity = context.entityMetadata.get(id);
+  if (!entity) {
+    throw new Error(`Entity with id ${id} not found`);
+  }
+  return entity;
+}
+
 const verticalOffsetDecoratingText = 15;
 const centerFactor = 2;
 
 export async function createEntities(context: SimplayContext) {
-  for (const entity of context.simulationData.entities) {
-    const frames = context.simulationData.visuals.find(
-      (visual) => visual.id === entity.visual
-    )?.frames;
+  const visuals = new Map(
+    context.simulationData.visuals.map((visual) => [visual.id, visual])
+  );
+  for (const entity of context.entityMetadata.values()) {
+    const frames = visuals.get(entity.visual)?.frames;
     if (!frames) {
       throw new Error(`No visual found for entity ${entity.id}`);
     }
     if (frames.length === 0) {
       throw new Error(`No frames found for visual ${entity.visual}`);
     }
-    const sprite = await createAnimatedSprite(context, entity, frames);
+    const textures = await context.textureCache.getTextures(entity.visual);
+    const sprite = createAnimatedSprite(context, entity, textures);
     const text = createDecoratingText(entity);
 
     const container = new PIXI.Container();
@@ -157,17 +180,12 @@ function createInformationText(entity: Entity): PIXI.Text {
   return text;
 }
 
-async function createAnimatedSprite(
+function createAnimatedSprite(
   context: SimplayContext,
   entity: Entity,
-  frames: string[]
-): Promise<PIXI.AnimatedSprite> {
-  const loadedFrames: PIXI.Texture[] = [];
-  for (const frame of frames) {
-    const loadedFrame = await PIXI.Texture.fromURL(frame);
-    loadedFrames.push(loadedFrame);
-  }
-  const sprite = new PIXI.AnimatedSprite(loadedFrames);
+  textures: PIXI.Texture[]
+): PIXI.AnimatedSprite {
+  const sprite = new PIXI.AnimatedSprite(textures);
   sprite.animationSpeed = 0;
   sprite.loop = false;
   const { width, height } = sprite.getBounds();
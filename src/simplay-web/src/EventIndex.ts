@@ -0,0 +1,123 @@
+import { Event } from './event/Event';
+
+/**
+ * Orders events by the step they are spooled at, in the order they were
+ * recorded within a step. Only needs the timestamps, so it can run in a
+ * worker before the events are created.
+ * @param timestamps of the events, in the order they were recorded
+ * @returns the positions of the events, ordered by step
+ */
+export function stepOrder(timestamps: ArrayLike<number>): Int32Array {
+  const order = new Int32Array(timestamps.length);
+  const steps = new Float64Array(timestamps.length);
+  let ordered = true;
+  for (let index = 0; index < timestamps.length; index++) {
+    order[index] = index;
+    steps[index] = Math.round(timestamps[index]);
+    ordered = ordered && (index === 0 || steps[index] >= steps[index - 1]);
+  }
+  // the events are usually ordered already, then sorting is skipped
+  if (!ordered) {
+    order.sort((a, b) => steps[a] - steps[b] || a - b);
+  }
+  return order;
+}
+
+/**
+ * Index of events by the step they are spooled at, the rounded timestamp.
+ * The events are stored ordered by step, in the order they were recorded
+ * within a step, so the events of a step are a contiguous range.
+ */
+export class EventIndex {
+  private readonly sorted: Event[] = [];
+  private readonly steps: number[] = [];
+  private readonly offsets: number[] = [0];
+  private _maxTimestamp = -Infinity;
+
+  /**
+   * @param events to index, in the order they were recorded
+   * @param order of the events by step, see stepOrder, computed from the
+   * events if not given
+   */
+  constructor(events: Event[], order?: ArrayLike<number>) {
+    order = order ?? stepOrder(events.map((event) => event.timestamp));
+    this.addSorted(Array.from(order, (index) => events[index]));
+  }
+
+  /**
+   * The largest timestamp of all events
+   */
+  get maxTimestamp(): number {
+    return this._maxTimestamp;
+  }
+
+  /**
+   * Adds events that are spooled after the indexed events, e.g. the next
+   * chunk of a simulation that is still loading
+   * @param events in the order they were recorded
+   */
+  append(events: Event[]) {
+    const order = stepOrder(events.map((event) => event.timestamp));
+    const sorted = Array.from(order, (index) => events[index]);
+    if (
+      sorted.length > 0 &&
+      Math.round(sorted[0].timestamp) < this.steps[this.steps.length - 1]
+    ) {
+      throw new Error('Appended events must not precede the indexed events');
+    }
+    this.addSorted(sorted);
+  }
+
+  private addSorted(sorted: Event[]) {
+    // the end of the last step is moved if the first events are of it
+    this.offsets.pop();
+    for (const event of sorted) {
+      const step = Math.round(event.timestamp);
+      if (this.steps[this.steps.length - 1] !== step) {
+        this.steps.push(step);
+        this.offsets.push(this.sorted.length);
+      }
+      this.sorted.push(event);
+      this._maxTimestamp = Math.max(this._maxTimestamp, event.timestamp);
+    }
+    this.offsets.push(this.sorted.length);
+  }
+
+  /**
+   * @param step the rounded timestamp
+   * @returns the events spooled at the given step
+   */
+  eventsAt(step: number): Event[] {
+    return this.eventsBetween(step, step);
+  }
+
+  /**
+   * @param from first step, inclusive
+   * @param to last step, inclusive
+   * @returns the events spooled at the given steps, ordered by step
+   */
+  eventsBetween(from: number, to: number): Event[] {
+    return this.sorted.slice(
+      this.offsets[this.firstStepFrom(from)],
+      this.offsets[this.firstStepFrom(to + 1)]
+    );
+  }
+
+  /**
+   * Binary search for the position of the first step that is not smaller
+   * than the given step
+   */
+  private firstStepFrom(step: number): number {
+    let low = 0;
+    let high = this.steps.length;
+    while (low < high) {
+      const middle = (low + high) >>> 1;
+      if (this.steps[middle] < step) {
+        low = middle + 1;
+      } else {
+        high = middle;
+      }
+    }
+    return low;
+  }
+}
@@ -0,0 +1,123 @@
+import { EventSerialized } from './event/EventSerialized';
+import { SimulationDataSerialized } from './SimulationDataSerialized';
+import {
+  SimulationSpooler,
+  SimulationSpoolerOptions,
+} from './SimulationSpooler';
+
+/**
+ * Sent by `simplay.server` when a player connects, falls behind or the
+ * entities change: everything needed to show the current state
+ */
+export interface LiveStateMessage {
+  type: 'state';
+  header: Omit<SimulationDataSerialized, 'events' | 'eventColumns'>;
+  /**
+   * The events that recreate the current state of all entities
+   */
+  events: EventSerialized[];
+  /**
+   * The first step whose events may still follow
+   */
+  until: number;
+}
+
+/**
+ * Sent by `simplay.server` with the events recorded since the last message
+ */
+export interface LiveEventsMessage {
+  type: 'events';
+  events: EventSerialized[];
+  until: number;
+}
+
+export type LiveMessage = LiveStateMessage | LiveEventsMessage;
+
+/**
+ * The parts of a WebSocket the client uses
+ */
+export interface LiveSocket {
+  addEventListener(
+    type: 'message',
+    listener: (event: { data: unknown }) => void
+  ): void;
+  addEventListener(type: 'close', listener: () => void): void;
+  close(): void;
+}
+
+/**
+ * Plays a simulation served by `simplay.server` while it runs. Playback
+ * follows the events as they arrive. Whenever the server sends the state
+ * again, the spooler is replaced with one that continues from it.
+ */
+export class LiveSimulationClient {
+  /**
+   * The spooler playing the simulation, undefined until the first state
+   * arrived
+   */
+  spooler?: SimulationSpooler;
+  private stateListeners: ((spooler: SimulationSpooler) => void)[] = [];
+
+  /**
+   * @param socket connected to the `/events` endpoint of the server
+   * @param container to display the simulation in
+   * @param options of the spoolers
+   */
+  constructor(
+    private socket: LiveSocket,
+    private container: HTMLElement,
+    private options: SimulationSpoolerOptions = {}
+  ) {
+    socket.addEventListener('message', (event) =>
+      this.receive(JSON.parse(event.data as string) as LiveMessage)
+    );
+    socket.addEventListener('close', () => this.spooler?.finishLoading());
+  }
+
+  /**
+   * Add listener that gets called with the new spooler whenever the state
+   * was loaded, e.g. to connect controls to it
+   */
+  addStateListener(listener: (spooler: SimulationSpooler) => void) {
+    this.stateListeners.push(listener);
+  }
+
+  /**
+   * Disconnects from the server, the spooler keeps the events received so
+   * far
+   */
+  close() {
+    this.socket.close();
+  }
+
+  private receive(message: LiveMessage) {
+    if (message.type === 'state') {
+      this.load(message);
+    } else if (this.spooler) {
+      try {
+        this.spooler.appendEvents(message.events, message.until);
+      } catch {
+        // recorded in the past of the played events, the next state
+        // includes them
+      }
+    }
+  }
+
+  private load(message: LiveStateMessage) {
+    this.spooler?.destroy();
+    const spooler = new SimulationSpooler(
+      { ...message.header, events: message.events },
+      this.container,
+      { ...this.options, loading: true }
+    );
+    spooler.appendEvents([], message.until);
+    this.spooler = spooler;
+    this.stateListeners.forEach((listener) => listener(spooler));
+    // the state is shown at the last complete step
+    spooler.skipTo(Math.max(message.until - 1, 0)).then(() => {
+      if (this.spooler === spooler) {
+        spooler.run();
+      }
+    });
+  }
+}
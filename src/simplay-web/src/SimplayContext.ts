@@ -1,6 +1,7 @@
 import * as PIXI from 'pixi.js';
-import { DisplayEntity } from './Entity';
+import { DisplayEntity, Entity } from './Entity';
 import { SimulationData } from './SimulationData';
+import { TextureCache } from './TextureCache';
 
 export interface SimplayContext {
   tileHeight: number;
@@ -10,12 +11,15 @@ export interface SimplayContext {
   areaContainer: PIXI.Container;
   entityContainer: PIXI.Container;
   entityDictionary: Map<string, DisplayEntity>;
+  entityMetadata: Map<string, Entity>;
   interactionContainer: PIXI.Container;
+  textureCache: TextureCache;
 }
 
 export function createContext(
   app: PIXI.Application,
-  simulationData: SimulationData
+  simulationData: SimulationData,
+  textureAtlasSize = 0
 ): SimplayContext {
   const context: SimplayContext = {
     tileHeight: app.screen.height / simulationData.grid.rows,
@@ -25,7 +29,11 @@ export function createContext(
     areaContainer: new PIXI.Container(),
     entityContainer: new PIXI.Container(),
     entityDictionary: new Map(),
+    entityMetadata: new Map(
+      simulationData.entities.map((entity) => [entity.id, entity])
+    ),
     interactionContainer: new PIXI.Container(),
+    textureCache: new TextureCache(simulationData.visuals, textureAtlasSize),
   };
   context.areaContainer.name = 'areaContainer';
   context.entityContainer.name = 'entityContainer';
@@ -1,39 +1,224 @@
+import { eventsFromBinaryColumns } from './BinaryDecoder';
 import { Entity } from './Entity';
+import { EventIndex } from './EventIndex';
 import { Event } from './event/Event';
+import { EventColumnsSerialized } from './event/EventColumnsSerialized';
 import { eventFactory } from './event/EventFactory';
 import { SimplayGrid } from './SimplayGrid';
 import { SimulationDataSerialized } from './SimulationDataSerialized';
+import { createTimeline, Timeline } from './Timeline';
 import { Visual } from './Visual';
 
+/**
+ * The state of all entities at the start of a step
+ */
+export interface Keyframe {
+  step: number;
+  events: Event[];
+}
+
 export class SimulationData {
-  readonly events: Event[];
+  private _events: Event[] | undefined;
+  private createEvents: (() => Event[]) | undefined;
+  private _index: EventIndex | undefined;
+  private _timeline: Timeline | undefined;
   readonly grid: SimplayGrid;
   readonly entities: Entity[];
   readonly visuals: Visual[];
+  readonly keyframes: Keyframe[];
+  private readonly eventOrder: ArrayLike<number> | undefined;
 
+  /**
+   * @param events the events, or a function that creates them on first
+   * access
+   * @param grid of the simulation
+   * @param entities of the simulation
+   * @param visuals of the simulation
+   * @param keyframes of the simulation, ordered by step
+   * @param eventOrder the order of the events by step, if it was computed
+   * beforehand, see stepOrder
+   */
   constructor(
-    events: Event[],
+    events: Event[] | (() => Event[]),
     grid: SimplayGrid,
     entities: Entity[],
-    visuals: Visual[]
+    visuals: Visual[],
+    keyframes: Keyframe[] = [],
+    eventOrder?: ArrayLike<number>
   ) {
-    this.events = events;
+    if (typeof events === 'function') {
+      this.createEvents = events;
+    } else {
+      this._events = events;
+    }
     this.grid = grid;
     this.entities = entities;
     this.visuals = visuals;
+    this.keyframes = keyframes;
+    this.eventOrder = eventOrder;
+  }
+
+  get events(): Event[] {
+    if (this._events === undefined) {
+      this._events = this.createEvents ? this.createEvents() : [];
+      this.createEvents = undefined;
+    }
+    return this._events;
+  }
+
+  /**
+   * Index of the events by step, created on first access
+   */
+  get index(): EventIndex {
+    if (this._index === undefined) {
+      this._index = new EventIndex(this.events, this.eventOrder);
+    }
+    return this._index;
+  }
+
+  /**
+   * Metadata about the timeline of the events, created on first access
+   */
+  get timeline(): Timeline {
+    if (this._timeline === undefined) {
+      this._timeline = createTimeline(this.index);
+    }
+    return this._timeline;
+  }
+
+  /**
+   * Adds events that are spooled after the existing events, e.g. the next
+   * chunk of a simulation that is still loading
+   * @param events to add
+   */
+  appendEvents(events: Event[]) {
+    this.index.append(events);
+    const all = this.events;
+    // push(...events) exceeds the argument limit for large chunks
+    events.forEach((event) => all.push(event));
+    this._timeline = undefined;
+  }
+
+  /**
+   * Finds the last keyframe at or before the given step
+   * @param step to find the keyframe for
+   * @returns the keyframe, or undefined if there is none
+   */
+  findKeyframe(step: number): Keyframe | undefined {
+    let low = 0;
+    let high = this.keyframes.length;
+    while (low < high) {
+      const middle = (low + high) >>> 1;
+      if (this.keyframes[middle].step <= step) {
+        low = middle + 1;
+      } else {
+        high = middle;
+      }
+    }
+    return low > 0 ? this.keyframes[low - 1] : undefined;
   }
 }
 
+/**
+ * Creates the simulation data from its serialized form
+ * @param serialized simulation data
+ * @param assetBaseUrl URL that assets which are not embedded are relative to
+ * @param eventOrder the order of the events by step, if it was computed
+ * beforehand, see stepOrder
+ * @returns the simulation data
+ */
 export function simulationDataFactory(
-  serialized: SimulationDataSerialized
+  serialized: SimulationDataSerialized,
+  assetBaseUrl = '',
+  eventOrder?: ArrayLike<number>
 ): SimulationData {
-  const events = serialized.events.map((event) => {
-    return eventFactory(event);
-  });
+  const columns = serialized.eventColumns;
+  const binaryColumns = serialized.binaryEventColumns;
+  const events = binaryColumns
+    ? () => eventsFromBinaryColumns(binaryColumns).map(eventFactory)
+    : columns
+    ? () => eventsFromColumns(columns, serialized.entities)
+    : serialized.events.map((event) => {
+        return eventFactory(event);
+      });
   return new SimulationData(
     events,
     serialized.grid,
     serialized.entities,
-    serialized.visuals
+    resolveAssets(serialized.visuals, serialized.assets, assetBaseUrl),
+    (serialized.keyframes ?? []).map((keyframe) => ({
+      step: keyframe.step,
+      events: keyframe.events.map((event) => eventFactory(event)),
+    })),
+    eventOrder
   );
 }
+
+/**
+ * Creates the events from their columnar layout, in the order they were
+ * recorded
+ * @param columns events in the columnar layout
+ * @param entities the forIds of the events are indices into
+ * @returns the events
+ */
+function eventsFromColumns(
+  columns: EventColumnsSerialized,
+  entities: Entity[]
+): Event[] {
+  const groups = columns.groups.map((group) => ({
+    ...group,
+    argNames: Object.keys(group.args),
+    argValues: Object.values(group.args),
+    forIds: group.forIds.map((forId) =>
+      typeof forId === 'number' ? entities[forId].id : forId
+    ),
+  }));
+  const rows = new Array<number>(groups.length).fill(0);
+  return columns.order.map((index) => {
+    const group = groups[index];
+    const row = rows[index]++;
+    const args: Record<string, unknown> = {};
+    group.argNames.forEach((name, arg) => {
+      args[name] = group.argValues[arg][row];
+    });
+    return eventFactory({
+      action: group.action,
+      args: args,
+      forId: group.forIds[row],
+      timestamp: group.timestamps[row],
+    });
+  });
+}
+
+/**
+ * Replaces the asset hashes in the frames of the visuals with the images
+ * they reference. Assets are either embedded as data URLs or are URLs
+ * relative to the assetBaseUrl. Frames that are not found in the assets are
+ * kept as they are, so data without an asset table still works.
+ * Images are loaded through the PIXI texture cache, so every asset is
+ * fetched once, no matter how many frames use it.
+ * @param visuals to resolve
+ * @param assets images by their hash
+ * @param assetBaseUrl URL that assets which are not embedded are relative to
+ * @returns the visuals with the images as frames
+ */
+function resolveAssets(
+  visuals: Visual[],
+  assets: Record<string, string> | undefined,
+  assetBaseUrl: string
+): Visual[] {
+  if (assets === undefined) {
+    return visuals;
+  }
+  const resolveFrame = (frame: string) => {
+    const asset = assets[frame];
+    if (asset === undefined) {
+      return frame;
+    }
+    return asset.startsWith('data:') ? asset : `${assetBaseUrl}${asset}`;
+  };
+  return visuals.map((visual) => ({
+    ...visual,
+    frames: visual.frames.map(resolveFrame),
+  }));
+}
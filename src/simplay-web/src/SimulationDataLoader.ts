@@ -0,0 +1,88 @@
+import {
+  decodeSimulationData,
+  isBinarySimulationData,
+  readSimulationData,
+} from './BinaryDecoder';
+import { SimulationDataSerialized } from './SimulationDataSerialized';
+
+const GZIP_MAGIC = [0x1f, 0x8b];
+const XZ_MAGIC = [0xfd, 0x37, 0x7a, 0x58, 0x5a, 0x00];
+
+function startsWith(buffer: ArrayBuffer, magic: number[]): boolean {
+  if (buffer.byteLength < magic.length) {
+    return false;
+  }
+  const bytes = new Uint8Array(buffer, 0, magic.length);
+  return magic.every((byte, index) => bytes[index] === byte);
+}
+
+/**
+ * Decompresses gzip compressed data with the DecompressionStream of the
+ * browser
+ * @param buffer gzip compressed data
+ * @returns the decompressed data
+ */
+export async function decompressGzip(
+  buffer: ArrayBuffer
+): Promise<ArrayBuffer> {
+  if (typeof DecompressionStream === 'undefined') {
+    throw new Error(
+      'DecompressionStream is not available, decompress the simulation before loading it'
+    );
+  }
+  const stream = new Blob([buffer])
+    .stream()
+    .pipeThrough(new DecompressionStream('gzip'));
+  return new Response(stream).arrayBuffer();
+}
+
+/**
+ * Loads a simulation in any of the formats written by simplay: JSON, gzip
+ * compressed JSON or binary.
+ * The format is detected from the first bytes of the data.
+ * @param buffer the content of a simulation file
+ * @param binaryColumns keep the events of a binary simulation in their typed
+ * columns instead of decoding them, see readSimulationData
+ * @returns the simulation, ready to be passed to the SimulationSpooler
+ */
+export async function loadSimulationData(
+  buffer: ArrayBuffer,
+  binaryColumns = false
+): Promise<SimulationDataSerialized> {
+  if (startsWith(buffer, XZ_MAGIC)) {
+    throw new Error(
+      'xz compressed simulations can not be decompressed in the browser, use gzip instead'
+    );
+  }
+  if (startsWith(buffer, GZIP_MAGIC)) {
+    buffer = await decompressGzip(buffer);
+  }
+  if (isBinarySimulationData(buffer)) {
+    return binaryColumns
+      ? readSimulationData(buffer)
+      : decodeSimulationData(buffer);
+  }
+  return JSON.parse(new TextDecoder().decode(buffer));
+}
+
+/**
+ * Loads a base64 encoded simulation, as embedded in notebooks by
+ * `serialize_for_jupyter` with gzip compression
+ * @param data base64 encoded content of a simulation file
+ * @returns the simulation, ready to be passed to the SimulationSpooler
+ */
+export function loadBase64SimulationData(
+  data: string
+): Promise<SimulationDataSerialized> {
+  return loadSimulationData(decodeBase64(data));
+}
+
+/**
+ * Decodes a base64 encoded simulation file, e.g. to load it in a worker with
+ * loadSimulationDataInWorker
+ * @param data base64 encoded content of a simulation file
+ * @returns the content of the file
+ */
+export function decodeBase64(data: string): ArrayBuffer {
+  return Uint8Array.from(atob(data), (char) => char.charCodeAt(0)).buffer;
+}
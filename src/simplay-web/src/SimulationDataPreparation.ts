@@ -0,0 +1,131 @@
+import { stepOrder } from './EventIndex';
+import { SimulationDataSerialized } from './SimulationDataSerialized';
+import { loadSimulationData } from './SimulationDataLoader';
+
+/**
+ * A simulation that is loaded and whose events are ordered by step, ready to
+ * be passed to the SimulationSpooler with the eventOrder as option.
+ * Events of binary simulations are kept in their typed columns, so they are
+ * transferred from the worker instead of being copied, see transferables.
+ */
+export interface PreparedSimulationData {
+  data: SimulationDataSerialized;
+  eventOrder: Int32Array;
+}
+
+/**
+ * What is being done while a simulation is prepared
+ */
+export type PreparationStage = 'decoding' | 'indexing';
+
+/**
+ * Messages posted by the SimulationDataWorker
+ */
+export type SimulationDataWorkerMessage =
+  | { stage: PreparationStage }
+  | { prepared: PreparedSimulationData }
+  | { error: string };
+
+/**
+ * @param data the simulation
+ * @returns the timestamps of the events, in the order they were recorded
+ */
+export function eventTimestamps(data: SimulationDataSerialized): Float64Array {
+  if (data.binaryEventColumns) {
+    return data.binaryEventColumns.timestamps;
+  }
+  const columns = data.eventColumns;
+  if (!columns) {
+    return Float64Array.from(data.events, (event) => event.timestamp);
+  }
+  const rows = new Array<number>(columns.groups.length).fill(0);
+  return Float64Array.from(
+    columns.order,
+    (group) => columns.groups[group].timestamps[rows[group]++]
+  );
+}
+
+/**
+ * Loads a simulation in any of the formats written by simplay and orders its
+ * events by step
+ * @param buffer the content of a simulation file
+ * @param onProgress called when a stage starts
+ * @returns the prepared simulation
+ */
+export async function prepareSimulationData(
+  buffer: ArrayBuffer,
+  onProgress: (stage: PreparationStage) => void = () => undefined
+): Promise<PreparedSimulationData> {
+  onProgress('decoding');
+  const data = await loadSimulationData(buffer, true);
+  onProgress('indexing');
+  return { data, eventOrder: stepOrder(eventTimestamps(data)) };
+}
+
+/**
+ * @param prepared simulation
+ * @returns the buffers of the prepared simulation that are transferred
+ * instead of copied when it is posted to another thread
+ */
+export function transferables(
+  prepared: PreparedSimulationData
+): ArrayBufferLike[] {
+  const buffers = new Set<ArrayBufferLike>([prepared.eventOrder.buffer]);
+  const columns = prepared.data.binaryEventColumns;
+  if (columns) {
+    // the columns are views into the buffer of the simulation
+    [
+      columns.timestamps,
+      columns.arg0,
+      columns.arg1,
+      columns.forIds,
+      columns.kinds,
+      columns.actionCodes,
+    ].forEach((column) => buffers.add(column.buffer));
+  }
+  return [...buffers];
+}
+
+/**
+ * Prepares a simulation in a Web Worker, so decompressing, parsing and
+ * ordering the events does not block the page. The worker runs
+ * SimulationDataWorker.js of this package, e.g.
+ * `new Worker(new URL('simplay-web/dist/SimulationDataWorker.js', import.meta.url))`
+ * @param buffer the content of a simulation file, it is transferred to the
+ * worker and can not be used afterwards
+ * @param worker to prepare the simulation in, it is not terminated
+ * @param onProgress called when a stage starts
+ * @returns the prepared simulation
+ */
+export function loadSimulationDataInWorker(
+  buffer: ArrayBuffer,
+  worker: Worker,
+  onProgress: (stage: PreparationStage) => void = () => undefined
+): Promise<PreparedSimulationData> {
+  return new Promise((resolve, reject) => {
+    const done = () => {
+      worker.removeEventListener('message', onMessage);
+      worker.removeEventListener('error', onError);
+    };
+    const onMessage = (event: MessageEvent<SimulationDataWorkerMessage>) => {
+      const message = event.data;
+      if ('stage' in message) {
+        onProgress(message.stage);
+        return;
+      }
+      done();
+      if ('error' in message) {
+        reject(new Error(message.error));
+      } else {
+        resolve(message.prepared);
+      }
+    };
+    const onError = (event: ErrorEvent) => {
+      done();
+      reject(new Error(event.message));
+    };
+    worker.addEventListener('message', onMessage);
+    worker.addEventListener('error', onError);
+    worker.postMessage(buffer, [buffer]);
+  });
+}
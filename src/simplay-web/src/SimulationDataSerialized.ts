@@ -1,11 +1,41 @@
 import { Entity } from './Entity';
+import {
+  BinaryEventColumnsSerialized,
+  EventColumnsSerialized,
+} from './event/EventColumnsSerialized';
 import { EventSerialized } from './event/EventSerialized';
 import { SimplayGrid } from './SimplayGrid';
 import { Visual } from './Visual';
 
+/**
+ * The state of all entities at the start of a step, as the events that
+ * recreate it
+ */
+export interface KeyframeSerialized {
+  step: number;
+  events: EventSerialized[];
+}
+
 export interface SimulationDataSerialized {
   entities: Entity[];
   grid: SimplayGrid;
   visuals: Visual[];
+  /**
+   * Images referenced by the frames of the visuals, keyed by their hash
+   */
+  assets?: Record<string, string>;
   events: EventSerialized[];
+  /**
+   * Events in the columnar layout, used instead of the events if present
+   */
+  eventColumns?: EventColumnsSerialized;
+  /**
+   * Events of a binary simulation in its typed columns, used instead of the
+   * events if present, see loadSimulationData
+   */
+  binaryEventColumns?: BinaryEventColumnsSerialized;
+  /**
+   * Keyframes ordered by step, used to seek without replaying from the start
+   */
+  keyframes?: KeyframeSerialized[];
 }
@@ -0,0 +1,29 @@
+/**
+ * Entry point of the Web Worker used by loadSimulationDataInWorker. It
+ * receives the content of a simulation file and posts the progress, then the
+ * prepared simulation with its event order and event columns transferred.
+ */
+import {
+  prepareSimulationData,
+  SimulationDataWorkerMessage,
+  transferables,
+} from './SimulationDataPreparation';
+
+const scope = self as unknown as {
+  onmessage: (event: MessageEvent<ArrayBuffer>) => void;
+  postMessage: (
+    message: SimulationDataWorkerMessage,
+    transfer?: Transferable[]
+  ) => void;
+};
+
+scope.onmessage = async (event) => {
+  try {
+    const prepared = await prepareSimulationData(event.data, (stage) =>
+      scope.postMessage({ stage })
+    );
+    scope.postMessage({ prepared }, transferables(prepared));
+  } catch (error) {
+    scope.postMessage({ error: String((error as Error).message ?? error) });
+  }
+};
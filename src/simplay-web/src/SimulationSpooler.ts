@@ -2,9 +2,42 @@ import { createGrid } from './Grid';
 import { createContext, SimplayContext } from './SimplayContext';
 import { SimulationData, simulationDataFactory } from './SimulationData';
 import { SimulationDataSerialized } from './SimulationDataSerialized';
+import { Timeline } from './Timeline';
 import * as PIXI from 'pixi.js';
 import * as PIXILAYERS from '@pixi/layers';
 import { createEntities, resetDisplayEntity } from './Entity';
+import { EventSerialized } from './event/EventSerialized';
+import { eventFactory } from './event/EventFactory';
+import { destroyInteractionLineRenderer } from './event/InteractionLine';
+
+/**
+ * Options of the SimulationSpooler
+ */
+export interface SimulationSpoolerOptions {
+  /**
+   * URL that assets which are not embedded in the simulation data are
+   * relative to, e.g. the location of the recording. Defaults to the URL of
+   * the document.
+   */
+  assetBaseUrl?: string;
+  /**
+   * Width and height of the texture atlases the frames of all visuals are
+   * packed into, e.g. 2048, so all entities are rendered in a few draw
+   * calls. Defaults to 0, which loads every frame into a texture of its own.
+   */
+  textureAtlasSize?: number;
+  /**
+   * The order of the events by step, if it was computed beforehand, e.g. by
+   * loadSimulationDataInWorker
+   */
+  eventOrder?: ArrayLike<number>;
+  /**
+   * The events are still being loaded. They are added with appendEvents,
+   * playback stalls at the first step that is not loaded yet until
+   * finishLoading is called.
+   */
+  loading?: boolean;
+}
 
 /**
  * Spools and displays a simulation in the given container
@@ -17,15 +50,28 @@ export class SimulationSpooler {
   private stopRequested = false;
   private currentSimTimeStamp = 0;
   private stepChangedEventListeners: ((timestamp: number) => void)[] = [];
+  private loadedUntil: number;
+  private loadingListeners: (() => void)[] = [];
+  private destroyed = false;
 
   constructor(
     simulationData: SimulationDataSerialized,
-    container: HTMLElement
+    container: HTMLElement,
+    options: SimulationSpoolerOptions = {}
   ) {
-    this.simulationData = simulationDataFactory(simulationData);
+    this.simulationData = simulationDataFactory(
+      simulationData,
+      options.assetBaseUrl,
+      options.eventOrder
+    );
+    this.loadedUntil = options.loading ? 0 : Infinity;
     this.DOMContainer = container;
     const app = this.createApp();
-    this.context = createContext(app, this.simulationData);
+    this.context = createContext(
+      app,
+      this.simulationData,
+      options.textureAtlasSize
+    );
     createGrid(this.context);
     createEntities(this.context);
   }
@@ -59,36 +105,98 @@ export class SimulationSpooler {
   }
 
   private spoolTimestamp(timestamp: number) {
-    const events = this.simulationData.events.filter(
-      (event) => Math.round(event.timestamp) === timestamp
-    );
-    events.forEach((event) => {
+    this.spoolTimestamps(timestamp, timestamp);
+  }
+
+  private spoolTimestamps(from: number, to: number) {
+    this.simulationData.index.eventsBetween(from, to).forEach((event) => {
       event.execute(this.context);
     });
   }
 
+  /**
+   * Adds the next chunk of events of a simulation that is still loading
+   * @param events spooled after the events that were added before
+   * @param until the first step that is not loaded yet, all events of the
+   * steps before it are added
+   */
+  appendEvents(events: EventSerialized[], until: number) {
+    this.simulationData.appendEvents(
+      events.map((event) => eventFactory(event))
+    );
+    this.loadedUntil = Math.max(this.loadedUntil, until);
+    this.notifyLoadingListeners();
+  }
+
+  /**
+   * Marks all events as loaded, playback no longer stalls
+   */
+  finishLoading() {
+    this.loadedUntil = Infinity;
+    this.notifyLoadingListeners();
+  }
+
+  /**
+   * @returns whether the events are still being loaded
+   */
+  isLoading(): boolean {
+    return this.loadedUntil !== Infinity;
+  }
+
+  private notifyLoadingListeners() {
+    const listeners = this.loadingListeners;
+    this.loadingListeners = [];
+    listeners.forEach((listener) => listener());
+  }
+
+  /**
+   * Waits until the events of the given step are loaded. Waiting stops
+   * early once the spooler is paused.
+   * @returns whether the step is loaded, never once the spooler is destroyed
+   */
+  private async waitUntilLoaded(step: number): Promise<boolean> {
+    while (step >= this.loadedUntil && !this.stopRequested) {
+      await new Promise<void>((resolve) =>
+        this.loadingListeners.push(resolve)
+      );
+    }
+    return step < this.loadedUntil && !this.destroyed;
+  }
+
   /**
    * @returns step total number of steps
    */
   getTotalSteps(): number {
-    return Math.max(
-      ...this.simulationData.events.map((event) => event.timestamp)
-    );
+    return this.getTimeline().totalSteps;
+  }
+
+  /**
+   * The timeline is computed once, calling this is cheap
+   * @returns metadata about the timeline of the simulation
+   */
+  getTimeline(): Timeline {
+    return this.simulationData.timeline;
   }
 
   /**
    * Starts spooling the events
    */
   async run() {
-    const maxTimestamp = this.getTotalSteps();
     while (!this.stopRequested) {
+      // stalls if playback caught up with the loading events
+      if (!(await this.waitUntilLoaded(this.currentSimTimeStamp))) {
+        break;
+      }
       const frameDuration = 1000 / this.speedFactor;
       const now = Date.now();
 
       this.spoolTimestamp(this.currentSimTimeStamp);
 
       const executionDuration = now - Date.now();
-      if (this.currentSimTimeStamp >= maxTimestamp) {
+      if (
+        this.currentSimTimeStamp >= this.getTotalSteps() &&
+        !this.isLoading()
+      ) {
         this.stopRequested = true;
         break;
       }
@@ -105,6 +213,7 @@ export class SimulationSpooler {
    */
   async pause() {
     this.stopRequested = true;
+    this.notifyLoadingListeners();
     // Wait for the current step to finish
     await new Promise((resolve) =>
       setTimeout(resolve, 1000 / this.speedFactor)
@@ -113,27 +222,43 @@ export class SimulationSpooler {
   }
 
   /**
-   * Pauses the spooler and makes one step forward
+   * Pauses the spooler and makes one step forward, once the step is loaded
    */
   async advanceOneStep() {
     await this.pause();
+    if (!(await this.waitUntilLoaded(this.currentSimTimeStamp))) {
+      return;
+    }
     this.spoolTimestamp(this.currentSimTimeStamp);
     this.setSimulationStep(this.currentSimTimeStamp + 1);
   }
 
   /**
-   * Pauses the spooler and skips to the given timestamp
+   * Pauses the spooler and skips to the given timestamp.
+   * If the simulation has keyframes, the nearest keyframe before the
+   * timestamp is restored and only the steps after it are replayed.
+   * Waits until the timestamp is loaded, unless paused in the meantime.
    * @param timestamp to skip to
    */
   async skipTo(timestamp: number) {
     timestamp = Math.round(timestamp);
     await this.pause();
-    if (timestamp < this.currentSimTimeStamp) {
-      await this.reset();
+    if (!(await this.waitUntilLoaded(timestamp))) {
+      return;
     }
-    for (let i = this.currentSimTimeStamp; i <= timestamp; i++) {
-      this.spoolTimestamp(i);
+    let start = this.currentSimTimeStamp;
+    const keyframe = this.simulationData.findKeyframe(timestamp);
+    if (timestamp < start || (keyframe && keyframe.step > start)) {
+      await this.reset();
+      start = 0;
+      if (keyframe) {
+        keyframe.events.forEach((event) => {
+          event.execute(this.context);
+        });
+        start = keyframe.step;
+      }
     }
+    this.spoolTimestamps(start, timestamp);
     this.setSimulationStep(timestamp);
   }
 
@@ -143,16 +268,26 @@ export class SimulationSpooler {
   async reset() {
     await this.pause();
     this.stopRequested = false;
-    for (const entity of this.context.entityDictionary.values()) {
-      const entityId = entity.container.name;
+    for (const [entityId, entity] of this.context.entityDictionary) {
       const originalTint =
-        this.simulationData.entities.find((entity) => entity.id === entityId)
-          ?.tint ?? 0xffffff;
+        this.context.entityMetadata.get(entityId)?.tint ?? 0xffffff;
       resetDisplayEntity(entity, originalTint);
     }
     this.setSimulationStep(0);
   }
 
+  /**
+   * Stops spooling and removes the simulation from its container. The
+   * spooler cannot be used afterwards.
+   */
+  destroy() {
+    this.destroyed = true;
+    this.stopRequested = true;
+    this.notifyLoadingListeners();
+    destroyInteractionLineRenderer(this.context);
+    this.context.app.destroy(true);
+  }
+
   /**
    * Set the speedFactor of the spooler to the given value
    * @param value speedFactor
@@ -0,0 +1,171 @@
+import * as PIXI from 'pixi.js';
+import { Visual } from './Visual';
+
+/**
+ * Position of a rectangle in a texture atlas
+ */
+export interface AtlasPlacement {
+  /**
+   * Index of the atlas page the rectangle is placed on
+   */
+  page: number;
+  x: number;
+  y: number;
+}
+
+/**
+ * Packs rectangles onto square pages with shelves, tallest rectangles first.
+ * @param sizes width and height of the rectangles
+ * @param pageSize width and height of a page
+ * @param padding space between two rectangles, so sampling a texture does
+ * not bleed into its neighbours
+ * @returns the placement of every rectangle in the order of sizes, or
+ * undefined for rectangles larger than a page
+ */
+export function packRectangles(
+  sizes: { width: number; height: number }[],
+  pageSize: number,
+  padding = 1
+): (AtlasPlacement | undefined)[] {
+  const placements: (AtlasPlacement | undefined)[] = new Array(sizes.length);
+  const order = sizes
+    .map((_, i) => i)
+    .sort((a, b) => sizes[b].height - sizes[a].height);
+  let page = 0;
+  let x = 0;
+  let y = 0;
+  let shelfHeight = 0;
+  for (const i of order) {
+    const { width, height } = sizes[i];
+    if (width > pageSize || height > pageSize) {
+      continue;
+    }
+    if (x + width > pageSize) {
+      x = 0;
+      y += shelfHeight + padding;
+      shelfHeight = 0;
+    }
+    if (y + height > pageSize) {
+      page++;
+      x = 0;
+      y = 0;
+      shelfHeight = 0;
+    }
+    placements[i] = { page, x, y };
+    x += width + padding;
+    shelfHeight = Math.max(shelfHeight, height);
+  }
+  return placements;
+}
+
+function loadImage(url: string): Promise<HTMLImageElement> {
+  return new Promise((resolve, reject) => {
+    const image = new Image();
+    image.crossOrigin = 'anonymous';
+    image.onload = () => resolve(image);
+    image.onerror = () => reject(new Error(`Could not load frame ${url}`));
+    image.src = url;
+  });
+}
+
+/**
+ * Loads the frames of every visual once, no matter how many entities use it.
+ * With an atlas, the frames of all visuals are packed into a few textures,
+ * so the sprites of all entities can be rendered in a few draw calls.
+ */
+export class TextureCache {
+  private readonly textures = new Map<string, Promise<PIXI.Texture[]>>();
+  private packed?: Promise<void>;
+
+  /**
+   * @param visuals of the simulation
+   * @param atlasSize width and height of an atlas page, 0 loads every frame
+   * into its own texture
+   */
+  constructor(
+    private readonly visuals: Visual[],
+    private readonly atlasSize = 0
+  ) {}
+
+  /**
+   * @param visualId id of the visual
+   * @returns the textures of the frames of the visual
+   */
+  async getTextures(visualId: string): Promise<PIXI.Texture[]> {
+    if (this.atlasSize > 0) {
+      this.packed = this.packed ?? this.packAtlas();
+      await this.packed;
+    }
+    let textures = this.textures.get(visualId);
+    if (!textures) {
+      const visual = this.visuals.find((visual) => visual.id === visualId);
+      if (!visual) {
+        throw new Error(`No visual found with id ${visualId}`);
+      }
+      textures = Promise.all(
+        visual.frames.map((frame) => PIXI.Texture.fromURL(frame))
+      );
+      this.textures.set(visualId, textures);
+    }
+    return textures;
+  }
+
+  private async packAtlas() {
+    const frames = [
+      ...new Set(this.visuals.flatMap((visual) => visual.frames)),
+    ];
+    const images = await Promise.all(frames.map(loadImage));
+    const placements = packRectangles(
+      images.map((image) => ({
+        width: image.naturalWidth,
+        height: image.naturalHeight,
+      })),
+      this.atlasSize
+    );
+    const canvases: HTMLCanvasElement[] = [];
+    placements.forEach((placement, i) => {
+      if (!placement) {
+        return;
+      }
+      if (!canvases[placement.page]) {
+        const canvas = document.createElement('canvas');
+        canvas.width = this.atlasSize;
+        canvas.height = this.atlasSize;
+        canvases[placement.page] = canvas;
+      }
+      canvases[placement.page]
+        .getContext('2d')
+        ?.drawImage(images[i], placement.x, placement.y);
+    });
+    const pages = canvases.map((canvas) => PIXI.BaseTexture.from(canvas));
+    const frameTextures = new Map<string, PIXI.Texture>();
+    placements.forEach((placement, i) => {
+      if (!placement) {
+        // larger than a page, gets a texture of its own
+        return;
+      }
+      frameTextures.set(
+        frames[i],
+        new PIXI.Texture(
+          pages[placement.page],
+          new PIXI.Rectangle(
+            placement.x,
+            placement.y,
+            images[i].naturalWidth,
+            images[i].naturalHeight
+          )
+        )
+      );
+    });
+    for (const visual of this.visuals) {
+      this.textures.set(
+        visual.id,
+        Promise.all(
+          visual.frames.map(
+            (frame) => frameTextures.get(frame) ?? PIXI.Texture.fromURL(frame)
+          )
+        )
+      );
+    }
+  }
+}
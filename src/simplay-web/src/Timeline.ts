@@ -0,0 +1,57 @@
+import { EventIndex } from './EventIndex';
+
+/**
+ * Metadata about the timeline of a simulation, computed once at load
+ */
+export interface Timeline {
+  /**
+   * The smallest timestamp of all events, 0 if there are no events
+   */
+  minTimestamp: number;
+  /**
+   * The largest timestamp of all events, 0 if there are no events
+   */
+  maxTimestamp: number;
+  /**
+   * The number of steps the simulation is spooled for, the step of the
+   * latest event, that is its rounded timestamp
+   */
+  totalSteps: number;
+  /**
+   * The number of events spooled at every step that has events
+   */
+  eventsPerStep: Map<number, number>;
+  /**
+   * The number of events of every entity that has events
+   */
+  eventsPerEntity: Map<string, number>;
+}
+
+/**
+ * Creates the timeline of the indexed events in a single pass
+ * @param index of the events
+ * @returns the timeline
+ */
+export function createTimeline(index: EventIndex): Timeline {
+  const events = index.eventsBetween(-Infinity, Infinity);
+  const eventsPerStep = new Map<number, number>();
+  const eventsPerEntity = new Map<string, number>();
+  let minTimestamp = Infinity;
+  for (const event of events) {
+    const step = Math.round(event.timestamp);
+    eventsPerStep.set(step, (eventsPerStep.get(step) ?? 0) + 1);
+    eventsPerEntity.set(
+      event.forId,
+      (eventsPerEntity.get(event.forId) ?? 0) + 1
+    );
+    minTimestamp = Math.min(minTimestamp, event.timestamp);
+  }
+  const maxTimestamp = events.length > 0 ? index.maxTimestamp : 0;
+  return {
+    minTimestamp: events.length > 0 ? minTimestamp : 0,
+    maxTimestamp: maxTimestamp,
+    totalSteps: Math.round(maxTimestamp),
+    eventsPerStep: eventsPerStep,
+    eventsPerEntity: eventsPerEntity,
+  };
+}
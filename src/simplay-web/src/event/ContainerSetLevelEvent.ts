@@ -2,6 +2,7 @@ import {
   ContainerEntity,
   ExtendedDisplayEntity,
   getEntityDisplayObjectById,
+  getEntityMetadataById,
 } from '../Entity';
 import { SimplayContext } from '../SimplayContext';
 import { ContainerSetLevelEventArgs } from './ContainerSetLevelEventArgs';
@@ -21,8 +22,9 @@ export class ContainerSetLevelEvent extends Event {
       context,
       this.forId
     ) as ExtendedDisplayEntity;
-    const entity = context.simulationData.entities.find(
-      (entity) => entity.id === this.forId
+    const entity = getEntityMetadataById(
+      context,
+      this.forId
     ) as ContainerEntity;
     entity.level = this.args.level;
     entityDisplayObject.informationText.text = `${entity.level} / ${entity.capacity}`;
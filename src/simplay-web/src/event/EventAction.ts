@@ -14,4 +14,5 @@ export const enum EventAction {
   CONTAINER_SET_CAPACITY = 'CONTAINER.SET_CAPACITY',
   STORE_SET_CAPACITY = 'STORE.SET_CAPACITY',
   STORE_SET_CONTENT = 'STORE.SET_CONTENT',
+  STORE_UPDATE_CONTENT = 'STORE.UPDATE_CONTENT',
 }
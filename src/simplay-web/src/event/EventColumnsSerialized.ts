@@ -0,0 +1,59 @@
+import { EventAction } from './EventAction';
+
+/**
+ * Events with the same action and argument names, stored in parallel arrays
+ */
+export interface EventGroupSerialized {
+  action: EventAction;
+  /**
+   * Index of the entity of every event, or its id if it is not an entity
+   */
+  forIds: (number | string)[];
+  timestamps: number[];
+  /**
+   * Values of every argument, by argument name
+   */
+  args: Record<string, unknown[]>;
+}
+
+/**
+ * Columnar layout of the events, written by `serialize(columnar=True)`
+ */
+export interface EventColumnsSerialized {
+  /**
+   * Index of the group of every event, in the order of the events
+   */
+  order: number[];
+  groups: EventGroupSerialized[];
+}
+
+/**
+ * The events of a binary simulation in its typed columns, one entry per
+ * event. The columns are views into the buffer of the simulation, so they
+ * are transferred to another thread together with it instead of being
+ * copied.
+ */
+export interface BinaryEventColumnsSerialized {
+  timestamps: Float64Array;
+  arg0: Float64Array;
+  arg1: Float64Array;
+  /**
+   * Index of the id of every event in the strings
+   */
+  forIds: Uint32Array;
+  /**
+   * Kinds of the arguments of every event
+   */
+  kinds: Uint16Array;
+  /**
+   * Index of the action of every event in the actions
+   */
+  actionCodes: Uint8Array;
+  actions: EventAction[];
+  /**
+   * Names of the arguments, by action code
+   */
+  argNames: string[][];
+  strings: string[];
+  objects: unknown[];
+}
@@ -33,6 +33,8 @@ import { StoreSetCapacityEvent } from './StoreSetCapacityEvent';
 import { StoreSetCapacityEventArgs } from './StoreSetCapacityEventArgs';
 import { StoreSetContentEvent } from './StoreSetContentEvent';
 import { StoreSetContentEventArgs } from './StoreSetContentEventArgs';
+import { StoreUpdateContentEvent } from './StoreUpdateContentEvent';
+import { StoreUpdateContentEventArgs } from './StoreUpdateContentEventArgs';
 import { Event } from './Event';
 
 export function eventFactory(serialized: EventSerialized): Event {
@@ -99,6 +101,12 @@ export function eventFactory(serialized: EventSerialized): Event {
         StoreSetContentEventArgs,
         serialized
       );
+    case EventAction.STORE_UPDATE_CONTENT:
+      return factory(
+        StoreUpdateContentEvent,
+        StoreUpdateContentEventArgs,
+        serialized
+      );
     default:
       throw new Error(`Unknown event action: ${serialized.action}`);
   }
@@ -2,44 +2,175 @@ import { DisplayEntity } from '../Entity';
 import * as PIXI from 'pixi.js';
 import { SimplayContext } from '../SimplayContext';
 
-export class InteractionLine {
+const renderers = new WeakMap<SimplayContext, InteractionLineRenderer>();
+
+/**
+ * @param context of the simulation
+ * @returns the renderer that draws all interaction lines of the context
+ */
+export function getInteractionLineRenderer(
+  context: SimplayContext
+): InteractionLineRenderer {
+  let renderer = renderers.get(context);
+  if (!renderer) {
+    renderer = new InteractionLineRenderer(context);
+    renderers.set(context, renderer);
+  }
+  return renderer;
+}
+
+/**
+ * Destroys the renderer of the interaction lines of a context, if it has
+ * one, e.g. before the application of the context is destroyed
+ * @param context of the simulation
+ */
+export function destroyInteractionLineRenderer(context: SimplayContext) {
+  renderers.get(context)?.destroy();
+}
+
+/**
+ * Draws all interaction lines of a simulation into a single graphic, on a
+ * single ticker that only runs while there are lines.
+ * Released lines are kept and reused for the next interaction.
+ */
+export class InteractionLineRenderer {
   public readonly graphic: PIXI.Graphics;
-  private context: SimplayContext;
-  private offsetX = 0;
-  private offsetY = 0;
-  private switch = false;
-  private ticker: PIXI.Ticker;
+  private readonly lines = new Set<InteractionLine>();
+  private readonly pool: InteractionLine[] = [];
+  private readonly ticker: PIXI.Ticker;
   private lastRedraw = 0;
   private frameTime = 1000 / 15;
-  constructor(
-    private sourceEntity: DisplayEntity,
-    private targetEntity: DisplayEntity,
-    context: SimplayContext
-  ) {
+  private dirty = false;
+
+  constructor(private context: SimplayContext) {
     this.graphic = new PIXI.Graphics();
-    this.graphic.name = `${sourceEntity.container.name} -> ${targetEntity.container.name}`;
-    this.context = context;
-    this.redraw();
+    this.graphic.name = 'interactionLines';
     this.context.interactionContainer.addChild(this.graphic);
     this.ticker = new PIXI.Ticker();
     this.ticker.add(() => this.redraw());
     this.ticker.speed = 1;
-    this.ticker.start();
   }
 
-  public destroy() {
-    this.context.interactionContainer.removeChild(this.graphic);
+  /**
+   * The number of lines that are drawn
+   */
+  get size(): number {
+    return this.lines.size;
+  }
+
+  /**
+   * Creates a line between two entities, reusing a released line if there
+   * is one
+   * @param sourceEntity where the line starts
+   * @param targetEntity where the line ends
+   * @returns the line
+   */
+  acquire(
+    sourceEntity: DisplayEntity,
+    targetEntity: DisplayEntity
+  ): InteractionLine {
+    const line = this.pool.pop();
+    if (!line) {
+      return new InteractionLine(sourceEntity, targetEntity, this.context);
+    }
+    line.attach(sourceEntity, targetEntity);
+    this.add(line);
+    return line;
+  }
+
+  add(line: InteractionLine) {
+    this.lines.add(line);
+    this.dirty = true;
+    if (!this.ticker.started) {
+      this.ticker.start();
+    }
+  }
+
+  /**
+   * Stops and destroys the ticker and drops all lines. Lines that are
+   * acquired afterwards get a new renderer.
+   */
+  destroy() {
+    this.ticker.stop();
     this.ticker.destroy();
-    this.graphic.destroy();
+    this.lines.clear();
+    this.pool.length = 0;
+    renderers.delete(this.context);
+  }
+
+  release(line: InteractionLine) {
+    if (!this.lines.delete(line)) {
+      return;
+    }
+    this.pool.push(line);
+    this.dirty = true;
+    if (this.lines.size === 0) {
+      this.graphic.clear();
+      this.ticker.stop();
+    }
   }
 
+  /**
+   * Draws all lines, at most 15 times a second unless lines were added or
+   * released since the last redraw. The animation of the lines only
+   * advances on the 15 frames a second, so it keeps its speed however often
+   * lines change.
+   */
   redraw() {
-    if (Date.now() - this.lastRedraw < this.frameTime) {
+    const frameDue = Date.now() - this.lastRedraw >= this.frameTime;
+    if (!this.dirty && !frameDue) {
       return;
     }
-    const interactionLineSegments = 11;
     this.graphic.clear();
+    this.lines.forEach((line) => line.draw(this.graphic, frameDue));
+    if (frameDue) {
+      this.lastRedraw = Date.now();
+    }
+    this.dirty = false;
+  }
+}
+
+export class InteractionLine {
+  private renderer: InteractionLineRenderer;
+  private offsetX = 0;
+  private offsetY = 0;
+  private switch = false;
+  constructor(
+    private sourceEntity: DisplayEntity,
+    private targetEntity: DisplayEntity,
+    context: SimplayContext
+  ) {
+    this.renderer = getInteractionLineRenderer(context);
+    this.renderer.add(this);
+  }
+
+  /**
+   * Connects a released line to new entities
+   */
+  attach(sourceEntity: DisplayEntity, targetEntity: DisplayEntity) {
+    this.sourceEntity = sourceEntity;
+    this.targetEntity = targetEntity;
+    this.offsetX = 0;
+    this.offsetY = 0;
+    this.switch = false;
+  }
+
+  /**
+   * Stops drawing the line and releases it for reuse
+   */
+  public destroy() {
+    this.renderer.release(this);
+  }
+
+  /**
+   * @param graphic to draw the line into
+   * @param advance whether the animation moves on by one frame, otherwise
+   * the line is repainted as it was
+   */
+  draw(graphic: PIXI.Graphics, advance = true) {
+    const interactionLineSegments = 11;
     this.createGradientLine(
+      graphic,
       this.sourceEntity.container.x +
         this.sourceEntity.animatedSprite.width / 2,
       this.sourceEntity.container.y +
@@ -50,26 +181,28 @@ export class InteractionLine {
         this.targetEntity.animatedSprite.height / 2,
       interactionLineSegments,
       0x000000,
-      0xffffff
+      0xffffff,
+      advance
     );
-    this.lastRedraw = Date.now();
   }
 
   createStartingSegment(
+    graphic: PIXI.Graphics,
     fromX: number,
     fromY: number,
     color1: number,
     color2: number
   ) {
-    this.graphic.lineStyle(2, color2, 1);
+    graphic.lineStyle(2, color2, 1);
     if (this.switch) {
-      this.graphic.lineStyle(2, color1, 1);
+      graphic.lineStyle(2, color1, 1);
     }
-    this.graphic.moveTo(fromX, fromY);
-    this.graphic.lineTo(fromX + this.offsetX, fromY + this.offsetY);
+    graphic.moveTo(fromX, fromY);
+    graphic.lineTo(fromX + this.offsetX, fromY + this.offsetY);
   }
 
   createInnerSegment(
+    graphic: PIXI.Graphics,
     color1: number,
     color2: number,
     deltaX: number,
@@ -82,18 +215,19 @@ export class InteractionLine {
     if (this.switch) {
       color = i % 2 === 0 ? color2 : color1;
     }
-    this.graphic.lineStyle(2, color, 1);
-    this.graphic.moveTo(
+    graphic.lineStyle(2, color, 1);
+    graphic.moveTo(
       fromX + this.offsetX + deltaX * i,
       fromY + this.offsetY + deltaY * i
     );
-    this.graphic.lineTo(
+    graphic.lineTo(
       this.offsetX + fromX + deltaX * (i + 1),
       this.offsetY + fromY + deltaY * (i + 1)
     );
   }
 
   createEndSegment(
+    graphic: PIXI.Graphics,
     toX: number,
     toY: number,
     deltaX: number,
@@ -112,37 +246,59 @@ export class InteractionLine {
     }
 
     if (this.switch) {
-      this.graphic.lineStyle(2, color2, 1);
+      graphic.lineStyle(2, color2, 1);
     } else {
-      this.graphic.lineStyle(2, color1, 1);
+      graphic.lineStyle(2, color1, 1);
     }
 
-    this.graphic.moveTo(
+    graphic.moveTo(
       toX - (deltaX - this.offsetX),
       toY - (deltaY - this.offsetY)
     );
-    this.graphic.lineTo(toX, toY);
+    graphic.lineTo(toX, toY);
   }
 
   createGradientLine(
+    graphic: PIXI.Graphics,
     fromX: number,
     fromY: number,
     toX: number,
     toY: number,
     stops: number,
     color1: number,
-    color2: number
+    color2: number,
+    advance = true
   ) {
     const lineMovementSpeedFactor = 5;
     const deltaX = (toX - fromX) / stops;
     const deltaY = (toY - fromY) / stops;
-    this.offsetX += deltaX / lineMovementSpeedFactor;
-    this.offsetY += deltaY / lineMovementSpeedFactor;
+    if (advance) {
+      this.offsetX += deltaX / lineMovementSpeedFactor;
+      this.offsetY += deltaY / lineMovementSpeedFactor;
+    }
 
-    this.createStartingSegment(fromX, fromY, color1, color2);
+    this.createStartingSegment(graphic, fromX, fromY, color1, color2);
     for (let i = 0; i < stops; i++) {
-      this.createInnerSegment(color1, color2, deltaX, deltaY, fromX, fromY, i);
+      this.createInnerSegment(
+        graphic,
+        color1,
+        color2,
+        deltaX,
+        deltaY,
+        fromX,
+        fromY,
+        i
+      );
     }
-    this.createEndSegment(toX, toY, deltaX, deltaY, stops, color1, color2);
+    this.createEndSegment(
+      graphic,
+      toX,
+      toY,
+      deltaX,
+      deltaY,
+      stops,
+      color1,
+      color2
+    );
   }
 }
@@ -5,6 +5,7 @@ import { SimplayContext } from '../SimplayContext';
 import {
   ExtendedDisplayEntity,
   getEntityDisplayObjectById,
+  getEntityMetadataById,
   ResourceEntity,
 } from '../Entity';
 
@@ -21,9 +22,7 @@ export class ResourceSetUtilizationEvent extends Event {
       context,
       this.forId
     ) as ExtendedDisplayEntity;
-    const entity = context.simulationData.entities.find(
-      (entity) => entity.id === this.forId
-    ) as ResourceEntity;
+    const entity = getEntityMetadataById(context, this.forId) as ResourceEntity;
     entity.utilization = this.args.utilization;
     entityDisplayObject.informationText.text = `${entity.utilization} / ${entity.capacity}`;
   }
@@ -3,7 +3,7 @@ import { Event } from './Event';
 import { EventAction } from './EventAction';
 import { SimplayContext } from '../SimplayContext';
 import { getEntityDisplayObjectById } from '../Entity';
-import { InteractionLine } from './InteractionLine';
+import { getInteractionLineRenderer } from './InteractionLine';
 
 export class SetInteractingEvent extends Event {
   constructor(
@@ -19,10 +19,9 @@ export class SetInteractingEvent extends Event {
     if (sourceEntity.outgoingInteractions.get(this.args.withId)) {
       return;
     }
-    const interaction = new InteractionLine(
+    const interaction = getInteractionLineRenderer(context).acquire(
       sourceEntity,
-      targetEntity,
-      context
+      targetEntity
     );
     sourceEntity.outgoingInteractions.set(this.args.withId, interaction);
     targetEntity.incomingInteractions.set(this.forId, interaction);
@@ -5,6 +5,7 @@ import { SimplayContext } from '../SimplayContext';
 import {
   ExtendedDisplayEntity,
   getEntityDisplayObjectById,
+  getEntityMetadataById,
   StoreEntity,
 } from '../Entity';
 
@@ -21,9 +22,7 @@ export class StoreSetCapacityEvent extends Event {
       context,
       this.forId
     ) as ExtendedDisplayEntity;
-    const entity = context.simulationData.entities.find(
-      (entity) => entity.id === this.forId
-    ) as StoreEntity;
+    const entity = getEntityMetadataById(context, this.forId) as StoreEntity;
     entity.capacity = this.args.capacity;
     entityDisplayObject.informationText.text = `capacity: ${
       entity.capacity ?? 0
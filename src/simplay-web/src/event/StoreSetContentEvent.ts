@@ -5,6 +5,7 @@ import { SimplayContext } from '../SimplayContext';
 import {
   ExtendedDisplayEntity,
   getEntityDisplayObjectById,
+  getEntityMetadataById,
   StoreEntity,
 } from '../Entity';
 
@@ -21,10 +22,11 @@ export class StoreSetContentEvent extends Event {
       context,
       this.forId
     ) as ExtendedDisplayEntity;
-    const entity = context.simulationData.entities.find(
-      (entity) => entity.id === this.forId
-    ) as StoreEntity;
+    const entity = getEntityMetadataById(context, this.forId) as StoreEntity;
     entity.content = this.args.content;
+    // replaces the items of earlier StoreUpdateContentEvents
+    entity.items = undefined;
+    entity.contentPending = false;
     entityDisplayObject.informationText.text = `capacity: ${
       entity.capacity ?? 0
     }`;
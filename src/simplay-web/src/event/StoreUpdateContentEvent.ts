@@ -0,0 +1,128 @@
+import { StoreUpdateContentEventArgs } from './StoreUpdateContentEventArgs';
+import { Event } from './Event';
+import { EventAction } from './EventAction';
+import { SimplayContext } from '../SimplayContext';
+import {
+  ExtendedDisplayEntity,
+  getEntityDisplayObjectById,
+  getEntityMetadataById,
+  StoreEntity,
+} from '../Entity';
+
+/**
+ * Value of `removed` that removes all items, which turns the event into a
+ * snapshot of the whole content
+ */
+export const REMOVE_ALL = '*';
+
+export class StoreUpdateContentEvent extends Event {
+  constructor(
+    forId: string,
+    timestamp: number,
+    public readonly args: StoreUpdateContentEventArgs
+  ) {
+    super(forId, timestamp, EventAction.STORE_UPDATE_CONTENT, args);
+  }
+  execute(context: SimplayContext) {
+    const entity = getEntityMetadataById(context, this.forId) as StoreEntity;
+    // items keep the JSON text they were recorded with, so an event only
+    // parses the items it changes
+    const items = entity.items ?? new Map<number, string>();
+    entity.items = items;
+    if (this.args.removed === REMOVE_ALL) {
+      items.clear();
+    } else {
+      for (const key of JSON.parse(this.args.removed) as number[]) {
+        items.delete(key);
+      }
+    }
+    for (const [key, item] of parseAddedItems(this.args.added)) {
+      items.set(key, item);
+    }
+    // the content is joined once per frame, not once per event, as seeking
+    // executes many events before the next frame is rendered
+    if (!entity.contentPending) {
+      entity.contentPending = true;
+      context.app.ticker.addOnce(() => renderStoreContent(context, this.forId));
+    }
+  }
+}
+
+/**
+ * Shows the items of a store that were changed by StoreUpdateContentEvents
+ * since it was last rendered. Called before the next frame is rendered.
+ * @param context of the simulation
+ * @param forId id of the store
+ */
+export function renderStoreContent(context: SimplayContext, forId: string) {
+  const entity = getEntityMetadataById(context, forId) as StoreEntity;
+  if (!entity.contentPending) {
+    return;
+  }
+  entity.contentPending = false;
+  entity.content = `[${[...(entity.items?.values() ?? [])].join(', ')}]`;
+  const entityDisplayObject = getEntityDisplayObjectById(
+    context,
+    forId
+  ) as ExtendedDisplayEntity;
+  entityDisplayObject.informationText.text = `capacity: ${
+    entity.capacity ?? 0
+  }`;
+  entityDisplayObject.informationText.text += `\n${entity.content}`;
+  entityDisplayObject.informationText.text = entityDisplayObject.informationText.text.trim();
+}
+
+/**
+ * Splits the added items of a StoreUpdateContentEvent into their keys and
+ * their JSON text as written by the simplay python package. The text is not
+ * parsed and formatted again, so the content reads exactly like the content
+ * of a StoreSetContentEvent, e.g. `1.0` stays `1.0`.
+ * @param added JSON array of `[key, item]` pairs
+ * @returns the keys and the JSON text of the items
+ */
+export function parseAddedItems(added: string): [number, string][] {
+  const items: [number, string][] = [];
+  let depth = 0;
+  let inString = false;
+  let start = 0;
+  let key: number | undefined;
+  for (let index = 0; index < added.length; index++) {
+    const char = added[index];
+    if (inString) {
+      if (char === '\\') {
+        index++;
+      } else if (char === '"') {
+        inString = false;
+      }
+      continue;
+    }
+    switch (char) {
+      case '"':
+        inString = true;
+        break;
+      case '[':
+      case '{':
+        depth++;
+        if (depth === 2) {
+          start = index + 1;
+          key = undefined;
+        }
+        break;
+      case ',':
+        // the key is a number, so the first comma of a pair follows it
+        if (depth === 2 && key === undefined) {
+          key = Number(added.slice(start, index));
+          start = index + 1;
+        }
+        break;
+      case ']':
+      case '}':
+        if (depth === 2) {
+          items.push([key as number, added.slice(start, index).trim()]);
+        }
+        depth--;
+        break;
+    }
+  }
+  return items;
+}
@@ -0,0 +1,16 @@
+import { EventArgs } from './EventArgs';
+
+export class StoreUpdateContentEventArgs extends EventArgs {
+  readonly added: string;
+  readonly removed: string;
+
+  constructor(args: { added: string; removed: string }) {
+    super(args);
+    this.added = args.added;
+    this.removed = args.removed;
+  }
+
+  getPropertyNames(): string[] {
+    return ['added', 'removed'];
+  }
+}
@@ -1,2 +1,9 @@
 export * from './SimulationSpooler';
 export * from './SimulationDataSerialized';
+export * from './BinaryDecoder';
+export * from './SimulationDataLoader';
+export * from './Timeline';
+export * from './TextureCache';
+export * from './SimulationDataPreparation';
+export * from './ChunkedSimulationLoader';
+export * from './LiveSimulationClient';
@@ -0,0 +1,76 @@
+import {
+  decodeSimulationData,
+  eventsFromBinaryColumns,
+  isBinarySimulationData,
+  readSimulationData,
+} from '../src/BinaryDecoder';
+import { expect } from 'chai';
+import { BinaryEventColumnsSerialized } from '../src/event/EventColumnsSerialized';
+import { sample } from './binarySample';
+
+describe('BinaryDecoder tests', function () {
+  it('should recognize binary simulations', () => {
+    expect(isBinarySimulationData(sample())).to.be.true;
+    const json = new TextEncoder().encode('{"events": []}');
+    expect(isBinarySimulationData(json.buffer)).to.be.false;
+  });
+
+  it('should decode the events', () => {
+    const data = decodeSimulationData(sample());
+    expect(data.events).to.deep.equal([
+      {
+        action: 'SET_POSITION',
+        args: { x: 1, y: 2 },
+        forId: 'a',
+        timestamp: 0,
+      },
+      {
+        action: 'SET_VISIBLE',
+        args: { visible: true },
+        forId: 'a',
+        timestamp: 0,
+      },
+      {
+        action: 'SET_INTERACTING',
+        args: { withId: 'a' },
+        forId: 'a',
+        timestamp: 0.5,
+      },
+      {
+        action: 'MOVE_NEAR',
+        args: { someArg: [1] },
+        forId: 'a',
+        timestamp: 1,
+      },
+    ]);
+  });
+
+  it('should decode the header', () => {
+    const data = decodeSimulationData(sample());
+    expect(data.entities).to.deep.equal([
+      { id: 'a', type: 'CUSTOM', visual: '', tint: 0 },
+    ]);
+    expect(data.visuals).to.deep.equal([]);
+    expect(data.assets).to.deep.equal({});
+    expect(data.grid).to.be.null;
+  });
+
+  it('should keep the events in columns of the buffer', () => {
+    const buffer = sample();
+    const data = readSimulationData(buffer);
+    const columns = data.binaryEventColumns as BinaryEventColumnsSerialized;
+    expect(data.events).to.deep.equal([]);
+    expect(columns.timestamps.buffer).to.equal(buffer);
+    expect(columns.actionCodes.buffer).to.equal(buffer);
+    expect(Array.from(columns.timestamps)).to.deep.equal([0, 0, 0.5, 1]);
+    expect(eventsFromBinaryColumns(columns)).to.deep.equal(
+      decodeSimulationData(sample()).events
+    );
+  });
+
+  it('should reject other data', () => {
+    expect(() => decodeSimulationData(new ArrayBuffer(4))).to.throw(
+      'Data is not a binary SimPlay simulation'
+    );
+  });
+});
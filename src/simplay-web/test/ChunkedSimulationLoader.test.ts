@@ -0,0 +1,82 @@
+import { expect } from 'chai';
+import { instance, mock } from 'ts-mockito';
+import {
+  loadChunkedSimulation,
+  readLines,
+} from '../src/ChunkedSimulationLoader';
+import { getTestGrid } from './event/getTestGrid';
+import { EMOJI, TRANSPARENT_PIXEL } from './event/testImages';
+
+function streamOf(...parts: string[]): ReadableStream<Uint8Array> {
+  const encoder = new TextEncoder();
+  return new ReadableStream({
+    start(controller) {
+      parts.forEach((part) => controller.enqueue(encoder.encode(part)));
+      controller.close();
+    },
+  });
+}
+
+async function collect(lines: AsyncGenerator<string>): Promise<string[]> {
+  const collected: string[] = [];
+  for await (const line of lines) {
+    collected.push(line);
+  }
+  return collected;
+}
+
+const header = {
+  format: 'simplay-chunked',
+  chunkSteps: 2,
+  visuals: [{ id: 'visual1', frames: [TRANSPARENT_PIXEL, EMOJI] }],
+  entities: [
+    { id: 'entity1', tint: 0xffffff, type: 'CUSTOM', visual: 'visual1' },
+  ],
+  grid: getTestGrid(),
+};
+
+const chunk = (until: number, ...timestamps: number[]) =>
+  JSON.stringify({
+    until,
+    events: timestamps.map((timestamp) => ({
+      action: 'SET_VISIBLE',
+      forId: 'entity1',
+      args: { visible: true },
+      timestamp,
+    })),
+  });
+
+describe('ChunkedSimulationLoader tests', function () {
+  it('should split a stream into lines', async () => {
+    const lines = await collect(readLines(streamOf('a\nb', 'c\n', '\nd')));
+    expect(lines).to.deep.equal(['a', 'bc', 'd']);
+  });
+
+  it('should return the spooler after the first chunk', async () => {
+    const containerMock = mock(HTMLDivElement);
+    const container = instance(containerMock);
+    const { spooler, loaded } = await loadChunkedSimulation(
+      streamOf(
+        JSON.stringify(header) + '\n',
+        chunk(2, 0, 1) + '\n',
+        chunk(6, 5) + '\n'
+      ),
+      container
+    );
+    await loaded;
+    expect(spooler.isLoading()).to.be.false;
+    expect(spooler.getTotalSteps()).to.equal(5);
+  });
+
+  it('should reject data that is not chunked', async () => {
+    const containerMock = mock(HTMLDivElement);
+    const container = instance(containerMock);
+    let error: Error | undefined;
+    try {
+      await loadChunkedSimulation(streamOf('{"events": []}\n'), container);
+    } catch (e) {
+      error = e as Error;
+    }
+    expect(error?.message).to.equal('Expected a simplay-chunked simulation');
+  });
+});
@@ -1,6 +1,7 @@
 import {
   createEntities,
   getEntityDisplayObjectById,
+  getEntityMetadataById,
   resetDisplayEntity,
 } from '../src/Entity';
 import * as PIXI from 'pixi.js';
@@ -37,7 +38,7 @@ describe('Entity tests', async function () {
     entities,
     grid: getTestGrid(),
     events: [],
-  } as SimulationData;
+  } as unknown as SimulationData;
 
   it('should initialize correctly', async () => {
     const app = new PIXI.Application({
@@ -82,7 +83,7 @@ describe('Entity tests', async function () {
           visual: 'visual1',
         },
       ],
-    };
+    } as unknown as SimulationData;
     const context = createContext(app, simData);
     await createEntities(context);
     expect(context.entityContainer.children.length).to.equal(1);
@@ -130,7 +131,7 @@ describe('Entity tests', async function () {
     const simData = {
       ...simulationData,
       visuals: [],
-    };
+    } as unknown as SimulationData;
     const context = createContext(app, simData);
 
     await expect(createEntities(context)).to.eventually.be.rejectedWith(
@@ -169,7 +170,7 @@ describe('Entity tests', async function () {
           visual: 'visual1',
         },
       ],
-    };
+    } as unknown as SimulationData;
     const context = createContext(app, simData);
     await createEntities(context);
     expect(context.entityContainer.children.length).to.equal(3);
@@ -209,7 +210,7 @@ describe('getEntityDisplayObjectById tests', async function () {
     entities,
     grid: getTestGrid(),
     events: [],
-  } as SimulationData;
+  } as unknown as SimulationData;
 
   it('should return the correct entity', async () => {
     const app = new PIXI.Application({
@@ -272,3 +273,45 @@ describe('getEntityDisplayObjectById tests', async function () {
     expect(displayEntity.outgoingInteractions.size).to.equal(0);
   });
 });
+
+describe('getEntityMetadataById tests', function () {
+  const simulationData = {
+    visuals: [],
+    entities: [
+      {
+        id: 'entity1',
+        tint: 0x4512fa,
+        type: 'CUSTOM',
+        visual: 'visual1',
+      },
+    ],
+    grid: getTestGrid(),
+    events: [],
+  } as unknown as SimulationData;
+
+  it('should return the correct entity', () => {
+    const app = new PIXI.Application({
+      width: 500,
+      height: 500,
+    });
+    app.stage = new PIXILAYERS.Stage();
+    const context = createContext(app, simulationData);
+
+    expect(getEntityMetadataById(context, 'entity1')).to.equal(
+      simulationData.entities[0]
+    );
+  });
+
+  it('should throw if the entity does not exist', () => {
+    const app = new PIXI.Application({
+      width: 500,
+      height: 500,
+    });
+    app.stage = new PIXILAYERS.Stage();
+    const context = createContext(app, simulationData);
+
+    expect(() => getEntityMetadataById(context, 'entity2')).to.throw(
+      'Entity with id entity2 not found'
+    );
+  });
+});
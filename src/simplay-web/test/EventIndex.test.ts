@@ -0,0 +1,75 @@
+import { expect } from 'chai';
+import { EventIndex, stepOrder } from '../src/EventIndex';
+import { Event } from '../src/event/Event';
+
+function events(...timestamps: number[]): Event[] {
+  return timestamps.map((timestamp) => ({ timestamp } as Event));
+}
+
+describe('EventIndex tests', function () {
+  it('should return the events of a step', () => {
+    const all = events(0, 0.4, 0.6, 1, 3);
+    const index = new EventIndex(all);
+    expect(index.eventsAt(0)).to.deep.equal([all[0], all[1]]);
+    expect(index.eventsAt(1)).to.deep.equal([all[2], all[3]]);
+    expect(index.eventsAt(2)).to.deep.equal([]);
+    expect(index.eventsAt(3)).to.deep.equal([all[4]]);
+    expect(index.eventsAt(4)).to.deep.equal([]);
+  });
+
+  it('should return the events of a range of steps', () => {
+    const all = events(0, 1, 2, 2, 5);
+    const index = new EventIndex(all);
+    expect(index.eventsBetween(1, 4)).to.deep.equal([all[1], all[2], all[3]]);
+    expect(index.eventsBetween(-1, 10)).to.deep.equal(all);
+  });
+
+  it('should order unordered events by step', () => {
+    const all = events(2, 0, 2.2, 1);
+    const index = new EventIndex(all);
+    expect(index.eventsBetween(0, 2)).to.deep.equal([
+      all[1],
+      all[3],
+      all[0],
+      all[2],
+    ]);
+  });
+
+  it('should return the largest timestamp', () => {
+    expect(new EventIndex(events(0, 4.4, 2)).maxTimestamp).to.equal(4.4);
+    expect(new EventIndex([]).maxTimestamp).to.equal(-Infinity);
+  });
+});
+
+describe('stepOrder tests', function () {
+  it('should order timestamps by step, stable within a step', () => {
+    expect(Array.from(stepOrder([2, 0, 2.2, 1, 0.4]))).to.deep.equal([
+      1, 4, 3, 0, 2,
+    ]);
+  });
+
+  it('should be used by the index when given', () => {
+    const all = events(1, 0);
+    const index = new EventIndex(all, Int32Array.from([1, 0]));
+    expect(index.eventsBetween(0, 1)).to.deep.equal([all[1], all[0]]);
+  });
+});
+
+describe('EventIndex append tests', function () {
+  it('should index appended events', () => {
+    const first = events(0, 1);
+    const second = events(2, 1, 3);
+    const index = new EventIndex(first);
+    index.append(second);
+    expect(index.eventsAt(1)).to.deep.equal([first[1], second[1]]);
+    expect(index.eventsBetween(2, 3)).to.deep.equal([second[0], second[2]]);
+    expect(index.maxTimestamp).to.equal(3);
+  });
+
+  it('should reject events before the indexed events', () => {
+    const index = new EventIndex(events(0, 2));
+    expect(() => index.append(events(1))).to.throw(
+      'Appended events must not precede the indexed events'
+    );
+  });
+});
@@ -31,7 +31,7 @@ describe('Grid tests', function () {
     entities: [],
     visuals: [],
     events: [],
-  } as SimulationData;
+  } as unknown as SimulationData;
 
   describe('area tests', () => {
     it('should create an area', () => {
@@ -103,7 +103,7 @@ describe('Grid tests', function () {
         entities: [],
         visuals: [],
         events: [],
-      } as SimulationData;
+      } as unknown as SimulationData;
       const context = createContext(app, data);
       expect(() => createGrid(context)).to.throw(
         'Area area51 is out of bounds: x + width > cols'
@@ -143,7 +143,7 @@ describe('Grid tests', function () {
         entities: [],
         visuals: [],
         events: [],
-      } as SimulationData;
+      } as unknown as SimulationData;
       const context = createContext(app, data);
       expect(() => createGrid(context)).to.throw(
         'Area area51 is out of bounds: y + height > rows'
@@ -0,0 +1,108 @@
+import { expect } from 'chai';
+import { instance, mock } from 'ts-mockito';
+import {
+  LiveMessage,
+  LiveSimulationClient,
+  LiveSocket,
+} from '../src/LiveSimulationClient';
+import { SimulationSpooler } from '../src/SimulationSpooler';
+import { EventAction } from '../src/event/EventAction';
+import { getTestGrid } from './event/getTestGrid';
+import { EMOJI, TRANSPARENT_PIXEL } from './event/testImages';
+
+class FakeSocket implements LiveSocket {
+  private messageListeners: ((event: { data: unknown }) => void)[] = [];
+  private closeListeners: (() => void)[] = [];
+  closed = false;
+
+  addEventListener(
+    type: 'message' | 'close',
+    listener: ((event: { data: unknown }) => void) | (() => void)
+  ) {
+    if (type === 'message') {
+      this.messageListeners.push(listener);
+    } else {
+      this.closeListeners.push(listener as () => void);
+    }
+  }
+
+  send(message: LiveMessage) {
+    const data = JSON.stringify(message);
+    this.messageListeners.forEach((listener) => listener({ data }));
+  }
+
+  close() {
+    this.closed = true;
+    this.closeListeners.forEach((listener) => listener());
+  }
+}
+
+const header = {
+  visuals: [{ id: 'visual1', frames: [TRANSPARENT_PIXEL, EMOJI] }],
+  entities: [
+    { id: 'entity1', tint: 0xffffff, type: 'CUSTOM', visual: 'visual1' },
+  ],
+  grid: getTestGrid(),
+};
+
+const events = (...timestamps: number[]) =>
+  timestamps.map((timestamp) => ({
+    action: EventAction.SET_VISIBLE,
+    forId: 'entity1',
+    args: { visible: true },
+    timestamp,
+  }));
+
+function createClient() {
+  const socket = new FakeSocket();
+  const containerMock = mock(HTMLDivElement);
+  const client = new LiveSimulationClient(socket, instance(containerMock));
+  return { socket, client };
+}
+
+describe('LiveSimulationClient tests', function () {
+  it('should create a spooler from the state', () => {
+    const { socket, client } = createClient();
+    const spoolers: SimulationSpooler[] = [];
+    client.addStateListener((spooler) => spoolers.push(spooler));
+    socket.send({ type: 'state', header, events: events(3), until: 4 });
+    expect(spoolers).to.have.length(1);
+    expect(client.spooler).to.equal(spoolers[0]);
+    expect(client.spooler?.isLoading()).to.be.true;
+    expect(client.spooler?.getTotalSteps()).to.equal(3);
+    client.close();
+  });
+
+  it('should append the events of every batch', () => {
+    const { socket, client } = createClient();
+    socket.send({ type: 'state', header, events: [], until: 0 });
+    socket.send({ type: 'events', events: events(1, 2), until: 2 });
+    socket.send({ type: 'events', events: events(5), until: 5 });
+    expect(client.spooler?.getTotalSteps()).to.equal(5);
+    client.close();
+  });
+
+  it('should ignore events before the state', () => {
+    const { socket, client } = createClient();
+    socket.send({ type: 'events', events: events(1), until: 1 });
+    expect(client.spooler).to.be.undefined;
+  });
+
+  it('should replace the spooler on a new state', () => {
+    const { socket, client } = createClient();
+    socket.send({ type: 'state', header, events: events(1), until: 1 });
+    const first = client.spooler;
+    socket.send({ type: 'state', header, events: events(7), until: 8 });
+    expect(client.spooler).not.to.equal(first);
+    expect(client.spooler?.getTotalSteps()).to.equal(7);
+    client.close();
+  });
+
+  it('should finish loading once the connection is closed', () => {
+    const { socket, client } = createClient();
+    socket.send({ type: 'state', header, events: [], until: 0 });
+    client.close();
+    expect(socket.closed).to.be.true;
+    expect(client.spooler?.isLoading()).to.be.false;
+  });
+});
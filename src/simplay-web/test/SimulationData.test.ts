@@ -43,4 +43,125 @@ describe('SimulationData tests', function () {
     expect(data.entities).to.deep.equal(serialized.entities);
     expect(data.grid).to.deep.equal(serialized.grid);
   });
+
+  it('should resolve the frames from the assets', () => {
+    const serialized = {
+      events: [],
+      visuals: [
+        {
+          id: 'leet',
+          frames: ['hash', 'hash', 'other.png'],
+        },
+      ],
+      assets: {
+        hash: 'data:image/png;base64,AAAA',
+      },
+      entities: [],
+      grid: {
+        width: 0,
+        height: 0,
+        rows: 0,
+        cols: 0,
+        areas: [],
+      },
+    } as SimulationDataSerialized;
+    const data = simulationDataFactory(serialized);
+    expect(data.visuals).to.deep.equal([
+      {
+        id: 'leet',
+        frames: [
+          'data:image/png;base64,AAAA',
+          'data:image/png;base64,AAAA',
+          'other.png',
+        ],
+      },
+    ]);
+  });
+
+  it('should resolve external assets relative to the base url', () => {
+    const serialized = {
+      events: [],
+      visuals: [
+        {
+          id: 'leet',
+          frames: ['hash'],
+        },
+      ],
+      assets: {
+        hash: 'assets/hash.png',
+      },
+      entities: [],
+      grid: {
+        width: 0,
+        height: 0,
+        rows: 0,
+        cols: 0,
+        areas: [],
+      },
+    } as SimulationDataSerialized;
+    const data = simulationDataFactory(serialized, 'https://example.com/');
+    expect(data.visuals[0].frames).to.deep.equal([
+      'https://example.com/assets/hash.png',
+    ]);
+  });
+
+  it('should create the events from the columnar layout', () => {
+    const serialized = {
+      events: [],
+      eventColumns: {
+        order: [0, 1, 0],
+        groups: [
+          {
+            action: 'SET_POSITION',
+            forIds: [0, 'other'],
+            timestamps: [0, 2],
+            args: { x: [1, 3], y: [2, 4] },
+          },
+          {
+            action: 'SET_VISIBLE',
+            forIds: [0],
+            timestamps: [1],
+            args: { visible: [true] },
+          },
+        ],
+      },
+      visuals: [],
+      entities: [
+        {
+          id: 'leetentity',
+          visual: 'leetsprite',
+          type: 'CUSTOM',
+          tint: 0x000000,
+        },
+      ],
+      grid: {
+        width: 0,
+        height: 0,
+        rows: 0,
+        cols: 0,
+        areas: [],
+      },
+    } as SimulationDataSerialized;
+    const data = simulationDataFactory(serialized);
+    expect(data.events).to.deep.equal([
+      {
+        forId: 'leetentity',
+        timestamp: 0,
+        action: 'SET_POSITION',
+        args: { x: 1, y: 2 },
+      },
+      {
+        forId: 'leetentity',
+        timestamp: 1,
+        action: 'SET_VISIBLE',
+        args: { visible: true },
+      },
+      {
+        forId: 'other',
+        timestamp: 2,
+        action: 'SET_POSITION',
+        args: { x: 3, y: 4 },
+      },
+    ]);
+  });
 });
@@ -0,0 +1,51 @@
+import {
+  loadBase64SimulationData,
+  loadSimulationData,
+} from '../src/SimulationDataLoader';
+import { expect } from 'chai';
+
+// written by serialize_for_jupyter with gzip compression
+const GZIP_SAMPLE =
+  'H4sIAAAAAAAA/0yOwQ7CIAyGX2Xp2YN69Go8cFBMwJMxhmhdSBhbgC0uhHe3ZcZ4gfbj70' +
+  'cz4IQ+Rdg11wzmkWzvqQZ10PezVEILeYJVAya0nMnwpnNDYKZ7W6h49UE8ecRwLtkOYzLd' +
+  'QGRdbkTIbpPF7w/2LzoPyM3+orQ8MplsHI1jtqh8+lmWpyrh1sSIdenMK7Shav3oXPkAAA' +
+  'D//wMANHcoctEAAAA=';
+
+const EXPECTED = {
+  events: [
+    {
+      action: 'SET_POSITION',
+      args: { x: 1, y: 2 },
+      forId: 'a',
+      timestamp: 0,
+    },
+  ],
+  entities: [{ id: 'a', type: 'CUSTOM', visual: '', tint: 0 }],
+  visuals: [],
+  assets: {},
+  grid: null,
+};
+
+describe('SimulationDataLoader tests', function () {
+  it('should load JSON', async () => {
+    const json = new TextEncoder().encode(JSON.stringify(EXPECTED));
+    expect(await loadSimulationData(json.buffer)).to.deep.equal(EXPECTED);
+  });
+
+  it('should decompress gzip compressed JSON', async () => {
+    expect(await loadBase64SimulationData(GZIP_SAMPLE)).to.deep.equal(
+      EXPECTED
+    );
+  });
+
+  it('should reject xz compressed data', async () => {
+    const xz = new Uint8Array([0xfd, 0x37, 0x7a, 0x58, 0x5a, 0x00, 0x00]);
+    let error: Error | undefined;
+    try {
+      await loadSimulationData(xz.buffer);
+    } catch (e) {
+      error = e as Error;
+    }
+    expect(error?.message).to.contain('xz');
+  });
+});
@@ -0,0 +1,123 @@
+import { expect } from 'chai';
+import {
+  eventTimestamps,
+  loadSimulationDataInWorker,
+  prepareSimulationData,
+  PreparationStage,
+  SimulationDataWorkerMessage,
+  transferables,
+} from '../src/SimulationDataPreparation';
+import { SimulationDataSerialized } from '../src/SimulationDataSerialized';
+import { EventAction } from '../src/event/EventAction';
+import { sample } from './binarySample';
+
+const DATA = {
+  events: [
+    { action: 'SET_VISIBLE', args: { visible: true }, forId: 'a', timestamp: 1 },
+    { action: 'SET_VISIBLE', args: { visible: true }, forId: 'b', timestamp: 0 },
+  ],
+  entities: [],
+  visuals: [],
+  grid: null,
+} as unknown as SimulationDataSerialized;
+
+/**
+ * Answers like the SimulationDataWorker, without a separate thread
+ */
+class FakeWorker extends EventTarget {
+  postMessage(buffer: ArrayBuffer) {
+    const post = (data: SimulationDataWorkerMessage) =>
+      this.dispatchEvent(new MessageEvent('message', { data }));
+    prepareSimulationData(buffer, (stage) => post({ stage }))
+      .then((prepared) => post({ prepared }))
+      .catch((error) => post({ error: error.message }));
+  }
+}
+
+function encode(data: unknown): ArrayBuffer {
+  return new TextEncoder().encode(JSON.stringify(data)).buffer;
+}
+
+describe('SimulationDataPreparation tests', function () {
+  it('should return the timestamps of the events', () => {
+    expect(Array.from(eventTimestamps(DATA))).to.deep.equal([1, 0]);
+  });
+
+  it('should return the timestamps of columnar events', () => {
+    const data: SimulationDataSerialized = {
+      ...DATA,
+      events: [],
+      eventColumns: {
+        order: [0, 1, 0],
+        groups: [
+          {
+            action: EventAction.SET_VISIBLE,
+            forIds: ['a', 'a'],
+            timestamps: [0, 2],
+            args: { visible: [true, false] },
+          },
+          {
+            action: EventAction.SET_TINT_COLOR,
+            forIds: ['a'],
+            timestamps: [1],
+            args: { tint: [0] },
+          },
+        ],
+      },
+    };
+    expect(Array.from(eventTimestamps(data))).to.deep.equal([0, 1, 2]);
+  });
+
+  it('should load the data and order the events', async () => {
+    const stages: PreparationStage[] = [];
+    const prepared = await prepareSimulationData(encode(DATA), (stage) =>
+      stages.push(stage)
+    );
+    expect(prepared.data).to.deep.equal(DATA);
+    expect(Array.from(prepared.eventOrder)).to.deep.equal([1, 0]);
+    expect(stages).to.deep.equal(['decoding', 'indexing']);
+  });
+
+  it('should transfer the event order of JSON data', async () => {
+    const prepared = await prepareSimulationData(encode(DATA));
+    expect(transferables(prepared)).to.deep.equal([
+      prepared.eventOrder.buffer,
+    ]);
+  });
+
+  it('should keep binary events in transferable columns', async () => {
+    const buffer = sample();
+    const prepared = await prepareSimulationData(buffer);
+    expect(prepared.data.events).to.deep.equal([]);
+    expect(Array.from(prepared.eventOrder)).to.deep.equal([0, 1, 2, 3]);
+    expect(transferables(prepared)).to.deep.equal([
+      prepared.eventOrder.buffer,
+      buffer,
+    ]);
+  });
+
+  it('should prepare the data in a worker', async () => {
+    const stages: PreparationStage[] = [];
+    const prepared = await loadSimulationDataInWorker(
+      encode(DATA),
+      new FakeWorker() as unknown as Worker,
+      (stage) => stages.push(stage)
+    );
+    expect(prepared.data).to.deep.equal(DATA);
+    expect(Array.from(prepared.eventOrder)).to.deep.equal([1, 0]);
+    expect(stages).to.deep.equal(['decoding', 'indexing']);
+  });
+
+  it('should reject if the worker fails', async () => {
+    let error: Error | undefined;
+    try {
+      await loadSimulationDataInWorker(
+        new TextEncoder().encode('{').buffer,
+        new FakeWorker() as unknown as Worker
+      );
+    } catch (e) {
+      error = e as Error;
+    }
+    expect(error).to.be.instanceOf(Error);
+  });
+});
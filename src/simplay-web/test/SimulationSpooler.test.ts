@@ -3,6 +3,7 @@ import { instance, mock } from 'ts-mockito';
 import { SimulationDataSerialized } from '../src/SimulationDataSerialized';
 import { SimulationSpooler } from '../src/SimulationSpooler';
 import { SimplayContext } from '../src/SimplayContext';
+import { EventSerialized } from '../src/event/EventSerialized';
 import { EMOJI, TRANSPARENT_PIXEL } from './event/testImages';
 
 const simulationDataSerialized = {
@@ -149,6 +150,18 @@ describe('SimulationSpooler tests', async function () {
       spooler.setSpeedFactor(100);
       expect(spooler.getTotalSteps()).to.equal(10);
     });
+
+    it('should compute the timeline once', async () => {
+      const containerMock = mock(HTMLDivElement);
+      const container = instance(containerMock);
+      const spooler = new SimulationSpooler(
+        simulationDataSerialized,
+        container
+      );
+      const timeline = spooler.getTimeline();
+      expect(spooler.getTimeline()).to.equal(timeline);
+      expect(timeline.eventsPerEntity.get('entity1')).to.equal(1);
+    });
   });
 
   describe('play tests', async function () {
@@ -480,6 +493,47 @@ describe('SimulationSpooler tests', async function () {
       expect(resetCalled).to.equal(1);
     });
 
+    it('should restore the nearest keyframe when skipping', async () => {
+      const setVisible = (visible: boolean, timestamp: number) => ({
+        action: 'SET_VISIBLE',
+        forId: 'entity1',
+        args: {
+          visible: visible,
+        },
+        timestamp: timestamp,
+      });
+      const simData = {
+        ...simulationDataSerialized,
+        events: [0, 1, 2, 3, 4].map((timestamp) =>
+          setVisible(timestamp % 2 === 0, timestamp)
+        ),
+        keyframes: [
+          { step: 2, events: [setVisible(false, 1)] },
+          { step: 4, events: [setVisible(true, 3)] },
+        ],
+      } as SimulationDataSerialized;
+      const containerMock = mock(HTMLDivElement);
+      const container = instance(containerMock);
+      const spooler = new SimulationSpooler(simData, container);
+      await new Promise((resolve) => setTimeout(resolve, 10));
+      spooler.setSpeedFactor(100);
+      const executed: string[] = [];
+      const data = spooler.context.simulationData;
+      data.events.forEach((event, index) => {
+        event.execute = () => executed.push(`event ${index}`);
+      });
+      data.keyframes.forEach((keyframe) => {
+        keyframe.events[0].execute = () =>
+          executed.push(`keyframe ${keyframe.step}`);
+      });
+
+      await spooler.skipTo(3);
+      expect(executed).to.deep.equal(['keyframe 2', 'event 2', 'event 3']);
+      executed.length = 0;
+      await spooler.skipTo(1);
+      expect(executed).to.deep.equal(['event 0', 'event 1']);
+    });
+
     it('should wait for the current step to finish when resetting', async () => {
       const events = [
         {
@@ -722,4 +776,57 @@ describe('SimulationSpooler tests', async function () {
       expect(secondTimestampTold).to.equal(1);
     });
   });
+
+  describe('loading tests', async function () {
+    const visible = (timestamp: number, visible: boolean) =>
+      ({
+        action: 'SET_VISIBLE',
+        forId: 'entity1',
+        args: { visible },
+        timestamp,
+      } as EventSerialized);
+
+    it('should stall until the next chunk is appended', async () => {
+      const containerMock = mock(HTMLDivElement);
+      const container = instance(containerMock);
+      const spooler = new SimulationSpooler(
+        { ...simulationDataSerialized, events: [] },
+        container,
+        { loading: true }
+      );
+      await new Promise((resolve) => setTimeout(resolve, 10));
+      spooler.setSpeedFactor(100);
+      spooler.appendEvents([visible(0, true), visible(1, false)], 2);
+      let lastExecutedStep = 0;
+      spooler.addStepChangedEventListener((step) => {
+        lastExecutedStep = step;
+      });
+      const running = spooler.run();
+      await new Promise((resolve) => setTimeout(resolve, 100));
+      expect(lastExecutedStep).to.equal(2);
+      expect(spooler.isLoading()).to.be.true;
+
+      spooler.appendEvents([visible(3, true)], 4);
+      spooler.finishLoading();
+      await running;
+      expect(lastExecutedStep).to.equal(3);
+      expect(spooler.getTotalSteps()).to.equal(3);
+    });
+
+    it('should stop waiting when paused', async () => {
+      const containerMock = mock(HTMLDivElement);
+      const container = instance(containerMock);
+      const spooler = new SimulationSpooler(
+        { ...simulationDataSerialized, events: [] },
+        container,
+        { loading: true }
+      );
+      await new Promise((resolve) => setTimeout(resolve, 10));
+      spooler.setSpeedFactor(100);
+      const running = spooler.run();
+      await spooler.pause();
+      await running;
+      expect(spooler.isLoading()).to.be.true;
+    });
+  });
 });
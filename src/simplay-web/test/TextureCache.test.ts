@@ -0,0 +1,75 @@
+import { expect } from 'chai';
+import { packRectangles, TextureCache } from '../src/TextureCache';
+import { EMOJI, TRANSPARENT_PIXEL } from './event/testImages';
+
+describe('packRectangles tests', () => {
+  it('should place rectangles on shelves, tallest first', () => {
+    const placements = packRectangles(
+      [
+        { width: 10, height: 5 },
+        { width: 10, height: 10 },
+        { width: 10, height: 10 },
+      ],
+      25,
+      1
+    );
+    expect(placements).to.deep.equal([
+      { page: 0, x: 0, y: 11 },
+      { page: 0, x: 0, y: 0 },
+      { page: 0, x: 11, y: 0 },
+    ]);
+  });
+
+  it('should start a new page once a page is full', () => {
+    const placements = packRectangles(
+      [
+        { width: 20, height: 20 },
+        { width: 20, height: 20 },
+      ],
+      32
+    );
+    expect(placements).to.deep.equal([
+      { page: 0, x: 0, y: 0 },
+      { page: 1, x: 0, y: 0 },
+    ]);
+  });
+
+  it('should not place rectangles larger than a page', () => {
+    const placements = packRectangles([{ width: 40, height: 10 }], 32);
+    expect(placements).to.deep.equal([undefined]);
+  });
+});
+
+describe('TextureCache tests', () => {
+  const visuals = [
+    { id: 'CAR', frames: [TRANSPARENT_PIXEL, EMOJI] },
+    { id: 'TRUCK', frames: [EMOJI] },
+  ];
+
+  it('should load the textures of a visual once', async () => {
+    const cache = new TextureCache(visuals);
+    const first = await cache.getTextures('CAR');
+    const second = await cache.getTextures('CAR');
+    expect(first).to.have.length(2);
+    expect(second).to.equal(first);
+  });
+
+  it('should pack all frames into one atlas', async () => {
+    const cache = new TextureCache(visuals, 2048);
+    const car = await cache.getTextures('CAR');
+    const truck = await cache.getTextures('TRUCK');
+    expect(car[0].baseTexture).to.equal(car[1].baseTexture);
+    expect(truck[0]).to.equal(car[1]);
+  });
+
+  it('should throw if the visual does not exist', async () => {
+    const cache = new TextureCache(visuals);
+    let error: Error | undefined;
+    try {
+      await cache.getTextures('BIKE');
+    } catch (e) {
+      error = e as Error;
+    }
+    expect(error?.message).to.equal('No visual found with id BIKE');
+  });
+});
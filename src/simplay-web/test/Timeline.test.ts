@@ -0,0 +1,56 @@
+import { expect } from 'chai';
+import { EventIndex } from '../src/EventIndex';
+import { Event } from '../src/event/Event';
+import { createTimeline } from '../src/Timeline';
+
+function event(forId: string, timestamp: number): Event {
+  return { forId, timestamp } as Event;
+}
+
+describe('Timeline tests', function () {
+  it('should compute the timeline of the events', () => {
+    const timeline = createTimeline(
+      new EventIndex([
+        event('a', 0.5),
+        event('b', 1.2),
+        event('a', 1),
+        event('a', 4.4),
+      ])
+    );
+    expect(timeline.minTimestamp).to.equal(0.5);
+    expect(timeline.maxTimestamp).to.equal(4.4);
+    expect(timeline.totalSteps).to.equal(4);
+    expect([...timeline.eventsPerStep]).to.deep.equal([
+      [1, 3],
+      [4, 1],
+    ]);
+    expect([...timeline.eventsPerEntity]).to.deep.equal([
+      ['a', 3],
+      ['b', 1],
+    ]);
+  });
+
+  it('should handle simulations without events', () => {
+    const timeline = createTimeline(new EventIndex([]));
+    expect(timeline.minTimestamp).to.equal(0);
+    expect(timeline.maxTimestamp).to.equal(0);
+    expect(timeline.totalSteps).to.equal(0);
+    expect(timeline.eventsPerStep.size).to.equal(0);
+  });
+
+  it('should round the steps like the recording', () => {
+    // a half step belongs to the next step, see step_of in keyframes.py
+    const timeline = createTimeline(new EventIndex([event('a', 2.5)]));
+    expect(timeline.totalSteps).to.equal(3);
+    expect([...timeline.eventsPerStep]).to.deep.equal([[3, 1]]);
+  });
+
+  it('should handle large simulations', () => {
+    const events = Array.from({ length: 500000 }, (_, index) =>
+      event('a', index / 10)
+    );
+    expect(createTimeline(new EventIndex(events)).maxTimestamp).to.equal(
+      49999.9
+    );
+  });
+});
@@ -0,0 +1,71 @@
+import { expect } from 'chai';
+import {
+  DisplayEntity,
+  ExtendedDisplayEntity,
+  StoreEntity,
+} from '../../src/Entity';
+import { SimplayContext } from '../../src/SimplayContext';
+import { StoreSetContentEvent } from '../../src/event/StoreSetContentEvent';
+import { StoreSetContentEventArgs } from '../../src/event/StoreSetContentEventArgs';
+
+const eventsPerRun = 100000;
+
+function createStoreContext(entityCount: number): SimplayContext {
+  const entities: StoreEntity[] = [];
+  const entityDictionary = new Map<string, DisplayEntity>();
+  for (let i = 0; i < entityCount; i++) {
+    entities.push({
+      id: `store${i}`,
+      type: 'STORE',
+      visual: 'STORE',
+      tint: 0xffffff,
+      capacity: 10,
+      content: '[]',
+    });
+    entityDictionary.set(`store${i}`, {
+      informationText: { text: '' },
+    } as ExtendedDisplayEntity);
+  }
+  return {
+    entityDictionary,
+    entityMetadata: new Map(entities.map((entity) => [entity.id, entity])),
+    simulationData: { entities },
+  } as unknown as SimplayContext;
+}
+
+function timeStoreEvents(entityCount: number): number {
+  const context = createStoreContext(entityCount);
+  const events: StoreSetContentEvent[] = [];
+  for (let i = 0; i < eventsPerRun; i++) {
+    events.push(
+      new StoreSetContentEvent(
+        // spread the events over all stores, the last ones are the slowest
+        // to find by scanning the entities
+        `store${(i * 7919) % entityCount}`,
+        i,
+        new StoreSetContentEventArgs({ content: `[${i}]` })
+      )
+    );
+  }
+  const start = performance.now();
+  events.forEach((event) => event.execute(context));
+  return performance.now() - start;
+}
+
+describe('entity metadata lookup benchmark', function () {
+  this.timeout(60000);
+
+  it('should not slow down store events as the entity count grows', () => {
+    const timings = [100, 1000, 10000].map((entityCount) => {
+      const duration = timeStoreEvents(entityCount);
+      console.log(
+        `${eventsPerRun} store events over ${entityCount} entities: ` +
+          `${duration.toFixed(1)} ms`
+      );
+      return duration;
+    });
+    // a lookup that scans the entities takes about 100 times longer for
+    // 10000 entities than for 100, a map lookup about as long
+    expect(timings[2]).to.be.lessThan(timings[0] * 10);
+  });
+});
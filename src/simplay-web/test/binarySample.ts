@@ -0,0 +1,24 @@
+// written by write_binary for an entity 'a' with four events
+const SAMPLE =
+  'U0lNUExBWQHfAgAABAAAAHsiZW50aXRpZXMiOiBbeyJpZCI6ICJhIiwgInR5cGUiOiAiQ1' +
+  'VTVE9NIiwgInZpc3VhbCI6ICIiLCAidGludCI6IDB9XSwgInZpc3VhbHMiOiBbXSwgImFz' +
+  'c2V0cyI6IHt9LCAiZ3JpZCI6IG51bGwsICJvYmplY3RzIjogW3sic29tZUFyZyI6IFsxXX' +
+  '1dLCAiYWN0aW9ucyI6IFsiU0VUX1ZJU0lCTEUiLCAiU0VUX1BPU0lUSU9OIiwgIlNFVF9J' +
+  'TlRFUkFDVElORyIsICJTRVRfTk9UX0lOVEVSQUNUSU5HIiwgIk1PVkVfTkVBUiIsICJNT1' +
+  'ZFX05FQVJfQ0VMTCIsICJTRVRfVElOVF9DT0xPUiIsICJTRVRfREVDT1JBVElOR19URVhU' +
+  'IiwgIlNFVF9TUFJJVEVfRlJBTUUiLCAiUkVTT1VSQ0UuU0VUX0NBUEFDSVRZIiwgIlJFU0' +
+  '9VUkNFLlNFVF9VVElMSVpBVElPTiIsICJDT05UQUlORVIuU0VUX0NBUEFDSVRZIiwgIlNU' +
+  'T1JFLlNFVF9DT05URU5UIiwgIlNUT1JFLlNFVF9DQVBBQ0lUWSIsICJDT05UQUlORVIuU0' +
+  'VUX0xFVkVMIiwgIlNUT1JFLlVQREFURV9DT05URU5UIl0sICJhcmdOYW1lcyI6IFtbInZp' +
+  'c2libGUiXSwgWyJ4IiwgInkiXSwgWyJ3aXRoSWQiXSwgWyJ3aXRoSWQiXSwgWyJ0YXJnZX' +
+  'RJZCJdLCBbIngiLCAieSJdLCBbImNvbG9yIl0sIFsidGV4dCJdLCBbImZyYW1lIl0sIFsi' +
+  'Y2FwYWNpdHkiXSwgWyJ1dGlsaXphdGlvbiJdLCBbImNhcGFjaXR5Il0sIFsiY29udGVudC' +
+  'JdLCBbImNhcGFjaXR5Il0sIFsibGV2ZWwiXSwgWyJhZGRlZCIsICJyZW1vdmVkIl1dLCAi' +
+  'c3RyaW5ncyI6IFsiYSJdfQAAAAAAAAAAAAAAAAAAAAAAAAAAAAAA4D8AAAAAAADwPwAAAA' +
+  'AAAPA/AAAAAAAA8D8AAAAAAAAAAAAAAAAAAAAAAAAAAAAAAEAAAAAAAAAAAAAAAAAAAAAA' +
+  'AAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAASQAZACIAAYABAAIEAAAAAA==';
+
+export function sample(): ArrayBuffer {
+  const bytes = Uint8Array.from(atob(SAMPLE), (char) => char.charCodeAt(0));
+  return bytes.buffer;
+}
@@ -17,6 +17,7 @@ import { ContainerSetCapacityEvent } from '../../src/event/ContainerSetCapacityE
 import { ContainerSetLevelEvent } from '../../src/event/ContainerSetLevelEvent';
 import { StoreSetCapacityEvent } from '../../src/event/StoreSetCapacityEvent';
 import { StoreSetContentEvent } from '../../src/event/StoreSetContentEvent';
+import { StoreUpdateContentEvent } from '../../src/event/StoreUpdateContentEvent';
 
 const forId = 'leet';
 const timestamp = 1337;
@@ -172,6 +173,16 @@ describe('EventFactory tests', function () {
     expect(event).to.be.an.instanceOf(StoreSetContentEvent);
   });
 
+  it('should initialize StoreUpdateContentEvent', () => {
+    const event = eventFactory({
+      action: EventAction.STORE_UPDATE_CONTENT,
+      forId: forId,
+      timestamp: timestamp,
+      args: { added: '[[0, "item"]]', removed: '[]' },
+    } as EventSerialized);
+    expect(event).to.be.an.instanceOf(StoreUpdateContentEvent);
+  });
+
   it('should also work from plain JSON', () => {
     const jsonEvent =
       '{"action":"SET_VISIBLE","forId":"leet","timestamp":1337,"args":{"visible":true}}';
@@ -3,7 +3,11 @@ import * as PIXI from 'pixi.js';
 import { getTestGrid } from './getTestGrid';
 import { DisplayEntity } from '../../src/Entity';
 import * as PIXILAYERS from '@pixi/layers';
-import { InteractionLine } from '../../src/event/InteractionLine';
+import {
+  destroyInteractionLineRenderer,
+  getInteractionLineRenderer,
+  InteractionLine,
+} from '../../src/event/InteractionLine';
 import { SimplayContext } from '../../src/SimplayContext';
 import { SimulationData } from '../../src/SimulationData';
 
@@ -24,7 +28,7 @@ describe('InteractionLine tests', async function () {
     incomingInteractions: new Map(),
   } as DisplayEntity;
 
-  it('should create a line between two entities', async () => {
+  function createContext(): SimplayContext {
     const pixiApp = new PIXI.Application();
     pixiApp.stage = new PIXILAYERS.Stage();
 
@@ -39,7 +43,7 @@ describe('InteractionLine tests', async function () {
 
     const interactionContainer = new PIXI.Container();
 
-    const context = {
+    return {
       app: pixiApp,
       areaContainer: new PIXI.Container(),
       interactionContainer: interactionContainer,
@@ -54,13 +58,64 @@ describe('InteractionLine tests', async function () {
       tileHeight: 10,
       tileWidth: 10,
     } as SimplayContext;
+  }
+
+  it('should create a line between two entities', async () => {
+    const context = createContext();
+    new InteractionLine(displayEntity1, displayEntity2, context);
+    const renderer = getInteractionLineRenderer(context);
+    renderer.redraw();
+    expect(renderer.size).to.equal(1);
+    expect(renderer.graphic.parent).to.equal(context.interactionContainer);
+    expect(renderer.graphic.x).to.equal(0);
+    expect(renderer.graphic.y).to.equal(0);
+    expect(renderer.graphic.width).to.equal(2);
+    expect(Math.round(renderer.graphic.height)).to.equal(100);
+  });
+
+  it('should draw all lines into one graphic', async () => {
+    const context = createContext();
+    const renderer = getInteractionLineRenderer(context);
+    renderer.acquire(displayEntity1, displayEntity2);
+    renderer.acquire(displayEntity2, displayEntity1);
+    expect(renderer.size).to.equal(2);
+    expect(context.interactionContainer.children).to.deep.equal([
+      renderer.graphic,
+    ]);
+  });
+
+  it('should reuse released lines', async () => {
+    const context = createContext();
+    const renderer = getInteractionLineRenderer(context);
+    const line = renderer.acquire(displayEntity1, displayEntity2);
+    line.destroy();
+    expect(renderer.size).to.equal(0);
+    expect(renderer.acquire(displayEntity2, displayEntity1)).to.equal(line);
+    expect(renderer.size).to.equal(1);
+  });
+
+  it('should stop redrawing once destroyed', async () => {
+    const context = createContext();
+    const renderer = getInteractionLineRenderer(context);
+    renderer.acquire(displayEntity1, displayEntity2);
+    destroyInteractionLineRenderer(context);
+    expect(renderer.size).to.equal(0);
+    expect(getInteractionLineRenderer(context)).not.to.equal(renderer);
+  });
 
-    const line = new InteractionLine(displayEntity1, displayEntity2, context);
-    expect(line.graphic.name).to.equal('foo -> bar');
-    expect(line.graphic.parent).to.equal(interactionContainer);
-    expect(line.graphic.x).to.equal(0);
-    expect(line.graphic.y).to.equal(0);
-    expect(line.graphic.width).to.equal(2);
-    expect(Math.round(line.graphic.height)).to.equal(100);
+  it('should not advance the animation on dirty redraws', async () => {
+    const context = createContext();
+    const renderer = getInteractionLineRenderer(context);
+    renderer.acquire(displayEntity1, displayEntity2);
+    renderer.redraw();
+    const drawn: boolean[] = [];
+    const line = renderer.acquire(displayEntity2, displayEntity1);
+    const draw = line.draw.bind(line);
+    line.draw = (graphic, advance) => {
+      drawn.push(advance ?? true);
+      draw(graphic, advance);
+    };
+    renderer.redraw();
+    expect(drawn).to.deep.equal([false]);
   });
 });
@@ -0,0 +1,166 @@
+import {
+  parseAddedItems,
+  REMOVE_ALL,
+  renderStoreContent,
+  StoreUpdateContentEvent,
+} from '../../src/event/StoreUpdateContentEvent';
+import { expect } from 'chai';
+import { StoreUpdateContentEventArgs } from '../../src/event/StoreUpdateContentEventArgs';
+import { EventAction } from '../../src/event/EventAction';
+import { instance, mock } from 'ts-mockito';
+import { getTestGrid } from './getTestGrid';
+import { SimulationDataSerialized } from '../../src/SimulationDataSerialized';
+import { SimulationSpooler } from '../../src/SimulationSpooler';
+import {
+  ExtendedDisplayEntity,
+  getEntityDisplayObjectById,
+  StoreEntity,
+} from '../../src/Entity';
+import { EMOJI, TRANSPARENT_PIXEL } from './testImages';
+
+const forId = 'leet';
+const timestamp = 1337;
+
+const simData = {
+  entities: [
+    {
+      id: 'leet',
+      visual: 'STORE',
+      type: 'STORE',
+      tint: 0xffffff,
+    },
+  ],
+  visuals: [
+    {
+      id: 'STORE',
+      frames: [TRANSPARENT_PIXEL, EMOJI],
+    },
+  ],
+  events: [],
+  grid: getTestGrid(),
+} as SimulationDataSerialized;
+
+function createEvent(added: string, removed: string) {
+  const args = new StoreUpdateContentEventArgs({ added, removed });
+  return new StoreUpdateContentEvent(forId, timestamp, args);
+}
+
+async function createSpooler() {
+  const containerMock = mock(HTMLDivElement);
+  const container = instance(containerMock);
+  const spooler = new SimulationSpooler(simData, container);
+  await new Promise((resolve) => setTimeout(resolve, 10));
+  return spooler;
+}
+
+function execute(spooler: SimulationSpooler, added: string, removed: string) {
+  createEvent(added, removed).execute(spooler.context);
+}
+
+function getEntity(spooler: SimulationSpooler) {
+  return spooler.context.simulationData.entities.find(
+    (entity) => entity.id === forId
+  ) as StoreEntity;
+}
+
+describe('StoreUpdateContentEvent tests', function () {
+  it('should initialize correctly', () => {
+    const event = createEvent('[[0, 1]]', '[]');
+    expect(event.forId).to.equal(forId);
+    expect(event.timestamp).to.equal(timestamp);
+    expect(event.action).to.equal(EventAction.STORE_UPDATE_CONTENT);
+    expect(event.args.added).to.equal('[[0, 1]]');
+    expect(event.args.removed).to.equal('[]');
+  });
+
+  it('should add and remove items', async () => {
+    const spooler = await createSpooler();
+
+    execute(spooler, '[[0, "a"], [1, "b"], [2, "c"]]', REMOVE_ALL);
+    execute(spooler, '[]', '[1]');
+    execute(spooler, '[[3, {"resourceId": "foo"}]]', '[]');
+    renderStoreContent(spooler.context, forId);
+
+    expect(getEntity(spooler).content).to.equal(
+      '["a", "c", {"resourceId": "foo"}]'
+    );
+  });
+
+  it('should only parse the changed items', async () => {
+    const spooler = await createSpooler();
+
+    execute(spooler, '[[0, "a"], [1, "b"]]', REMOVE_ALL);
+    const items = getEntity(spooler).items;
+    execute(spooler, '[[2, {"n": 1}]]', '[1]');
+
+    expect(items?.get(0)).to.equal('"a"');
+    expect(items?.get(2)).to.equal('{"n": 1}');
+    expect([...(items?.keys() ?? [])]).to.deep.equal([0, 2]);
+  });
+
+  it('should render the content once per frame', async () => {
+    const spooler = await createSpooler();
+
+    execute(spooler, '[[0, "a"]]', REMOVE_ALL);
+    renderStoreContent(spooler.context, forId);
+    execute(spooler, '[[1, "b"]]', '[]');
+    execute(spooler, '[[2, "c"]]', '[0]');
+
+    expect(getEntity(spooler).content).to.equal('["a"]');
+    expect(getEntity(spooler).contentPending).to.be.true;
+    // rendered by the ticker of the app before the next frame
+    await new Promise((resolve) => setTimeout(resolve, 100));
+    expect(getEntity(spooler).content).to.equal('["b", "c"]');
+    expect(getEntity(spooler).contentPending).to.be.false;
+  });
+
+  it('should keep the formatting of the python package', async () => {
+    const spooler = await createSpooler();
+
+    execute(spooler, '[[0, 1.0], [1, {"x": 2.50}]]', REMOVE_ALL);
+    renderStoreContent(spooler.context, forId);
+
+    expect(getEntity(spooler).content).to.equal('[1.0, {"x": 2.50}]');
+  });
+
+  it('should replace the content on a snapshot', async () => {
+    const spooler = await createSpooler();
+
+    execute(spooler, '[[0, "a"]]', '[]');
+    execute(spooler, '[[4, "e"]]', REMOVE_ALL);
+    renderStoreContent(spooler.context, forId);
+
+    expect(getEntity(spooler).content).to.equal('["e"]');
+  });
+
+  it('should update the text correctly', async () => {
+    const spooler = await createSpooler();
+
+    // set the capacity to 0 so the text is predictable
+    getEntity(spooler).capacity = 0;
+
+    execute(spooler, '[[0, [1, 2]]]', REMOVE_ALL);
+    renderStoreContent(spooler.context, forId);
+    const displayObject = getEntityDisplayObjectById(
+      spooler.context,
+      forId
+    ) as ExtendedDisplayEntity;
+    expect(displayObject.informationText.text).to.equal(
+      'capacity: 0\n[[1, 2]]'
+    );
+  });
+
+  it('should split the added items', () => {
+    expect(
+      parseAddedItems(
+        '[[0, 1.0], [12, "a, \\"]"], [3, {"b": [1, {"c": null}]}], [4, []]]'
+      )
+    ).to.deep.equal([
+      [0, '1.0'],
+      [12, '"a, \\"]"'],
+      [3, '{"b": [1, {"c": null}]}'],
+      [4, '[]'],
+    ]);
+    expect(parseAddedItems('[]')).to.deep.equal([]);
+  });
+});
@@ -0,0 +1,19 @@
+import { StoreUpdateContentEventArgs } from '../../src/event/StoreUpdateContentEventArgs';
+import { expect } from 'chai';
+
+const added = '[[0, "item"]]';
+const removed = '[1]';
+
+describe('StoreUpdateContentEventArgs tests', function () {
+  it('should initialize correctly', () => {
+    const args = new StoreUpdateContentEventArgs({ added, removed });
+    expect(args.added).to.equal(added);
+    expect(args.removed).to.equal(removed);
+  });
+  it('should raise an error when initializing with wrong args', () => {
+    expect(() => {
+      // eslint-disable-next-line @typescript-eslint/no-explicit-any
+      new StoreUpdateContentEventArgs({ added: added } as any);
+    }).to.throw();
+  });
+});
@@ -0,0 +1,95 @@
+"""
+Compares a queueing model run with plain simpy with the same model run in a
+:class:`VisualEnvironment` that records events and in one that is disabled,
+as for the replications of a Monte Carlo study that are not visualized.
+
+Run from ``src/simplay``::
+
+    python -m benchmarks.headless --customers 200000
+"""
+import argparse
+import random
+import statistics
+import time
+
+import simpy
+
+import src.simplay as simplay
+
+
+def customer(env, counter, shelf, tank, service_time):
+    with counter.request() as req:
+        yield req
+        yield env.timeout(service_time)
+    yield shelf.put("item")
+    yield shelf.get()
+    yield tank.put(1)
+    yield tank.get(1)
+
+
+def source(env, counter, shelf, tank, customers, seed):
+    rng = random.Random(seed)
+    for _ in range(customers):
+        env.process(customer(env, counter, shelf, tank, rng.random()))
+        yield env.timeout(rng.expovariate(2.0))
+
+
+def run_simpy(customers: int, seed: int):
+    env = simpy.Environment()
+    counter = simpy.Resource(env, 2)
+    shelf = simpy.Store(env, 10)
+    tank = simpy.Container(env, 10**9)
+    env.process(source(env, counter, shelf, tank, customers, seed))
+    env.run()
+
+
+def run_visual(customers: int, seed: int, enabled: bool):
+    env = simplay.VisualEnvironment(enabled=enabled)
+    counter = simplay.VisualResource(env, "counter", 2, "")
+    shelf = simplay.VisualStore(env, "shelf", "", capacity=10)
+    tank = simplay.VisualContainer(env, "tank", "", capacity=10**9)
+    env.process(source(env, counter, shelf, tank, customers, seed))
+    env.run()
+
+
+def measure(function, *args):
+    start = time.perf_counter()
+    function(*args)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--customers", type=int, default=50000)
+    parser.add_argument("--repeat", type=int, default=9)
+    options = parser.parse_args()
+
+    variants = {
+        "simpy": (run_simpy,),
+        "disabled": (run_visual, False),
+        "recording": (run_visual, True),
+    }
+    # one run of each variant warms up imports and caches
+    for function, *args in variants.values():
+        function(options.customers // 10, 0, *args)
+    # runs are interleaved, so drift of the machine affects all variants
+    # alike, and every variant runs the same seeds
+    times = {name: [] for name in variants}
+    for seed in range(options.repeat):
+        for name, (function, *args) in variants.items():
+            times[name].append(measure(
+                function, options.customers, seed, *args))
+
+    reference = statistics.median(times["simpy"])
+    print(f"customers: {options.customers}, median of {options.repeat} runs")
+    for name in variants:
+        median = statistics.median(times[name])
+        # the ratio of each run to the simpy run with the same seed
+        ratio = statistics.median(
+            run / simpy_run
+            for run, simpy_run in zip(times[name], times["simpy"]))
+        print(f"{name + ':':10} {median:.3f}s ({(ratio - 1) * 100:+.1f}%)")
+
+
+if __name__ == "__main__":
+    main()
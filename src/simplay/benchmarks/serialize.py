@@ -0,0 +1,75 @@
+"""
+Compares the time :meth:`VisualizationManager.serialize` takes with the
+generic :mod:`jsons` encoding it used to rely on.
+
+Run from ``src/simplay``::
+
+    python -m benchmarks.serialize --events 500000
+"""
+import argparse
+import time
+
+import jsons
+
+import src.simplay as simplay
+
+
+def record(events: int) -> simplay.VisualizationManager:
+    env = simplay.VisualEnvironment()
+    component = simplay.VisualComponent.create_custom_component(env, "c", "")
+    container = simplay.VisualContainer(env, "container", "", 0, 10**9, 0)
+    for i in range(events // 4):
+        env.run(until=i * 0.5 + 0.5)
+        component.is_at(i % 100, i % 50)
+        component.has_decorating_text(f"step {i}")
+        component.has_frame(i % 8)
+        container.put(1)
+    return env.visualization_manager
+
+
+def serialize_with_jsons(manager: simplay.VisualizationManager) -> str:
+    return jsons.dumps(
+        {
+            "events": [
+                {
+                    "action": action,
+                    "args": args,
+                    "for_id": for_id,
+                    "timestamp": timestamp,
+                }
+                for for_id, timestamp, action, args in manager.sink.records()
+            ],
+            "entities": manager.entities,
+            "visuals": manager.visuals,
+            "assets": manager.assets,
+            "grid": manager.grid,
+        },
+        strip_privates=True,
+        key_transformer=jsons.KEY_TRANSFORMER_CAMELCASE,
+    )
+
+
+def measure(function, *args):
+    start = time.perf_counter()
+    result = function(*args)
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--events", type=int, default=100000)
+    options = parser.parse_args()
+
+    manager = record(options.events)
+    expected, reference = measure(serialize_with_jsons, manager)
+    output, encoder = measure(manager.serialize)
+    assert output == expected
+
+    print(f"events:   {len(manager.events)}")
+    print(f"jsons:    {reference:.3f}s")
+    print(f"encoder:  {encoder:.3f}s")
+    print(f"speedup:  {reference / encoder:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -17,6 +17,7 @@ from typing import List, Tuple, Type
 from .core import (
     VisualComponent,
     VisualEnvironment,
+    VisualRealtimeEnvironment,
     VisualizationManager,
 )
 
@@ -32,11 +33,22 @@ from .components import (
 
 from .primitives import (
     ComponentType,
+    Compression,
     EventAction
 )
 
 from .visualization import VisualGrid
 
+from .cache import DiskCache
+
+from .live import LiveDisplay
+
+from .server import VisualizationServer
+
+from .runner import Replication, grid, run_replications, sweep
+
+from .eventlog import EventSink, EventLog, FileSink
+
 from .events import (
     VisualEvent,
     SetVisible,
@@ -54,10 +66,12 @@ from .events import (
     ContainerSetLevel,
     StoreSetCapacity,
     StoreSetContent,
+    StoreUpdateContent,
 )
 
 __all__ = [
     "VisualEnvironment",
+    "VisualRealtimeEnvironment",
     "VisualComponent",
     "VisualProcess",
     "VisualResource",
@@ -68,6 +82,16 @@ __all__ = [
     "VisualFilterStore",
     "VisualizationManager",
     "VisualGrid",
+    "DiskCache",
+    "LiveDisplay",
+    "VisualizationServer",
+    "Replication",
+    "run_replications",
+    "sweep",
+    "grid",
+    "EventSink",
+    "EventLog",
+    "FileSink",
     "VisualEvent",
     "SetVisible",
     "SetPosition",
@@ -84,7 +108,9 @@ __all__ = [
     "ContainerSetLevel",
     "StoreSetCapacity",
     "StoreSetContent",
+    "StoreUpdateContent",
     "ComponentType",
+    "Compression",
     "EventAction",
 ]
 
@@ -108,6 +134,7 @@ _toc = (
     ("Core",
      (
          VisualEnvironment,
+         VisualRealtimeEnvironment,
          VisualComponent,
          VisualizationManager,
      )
@@ -128,6 +155,31 @@ _toc = (
         "Visualization",
         (VisualGrid,),
     ),
+    (
+        "Caching",
+        (DiskCache,),
+    ),
+    (
+        "Live Visualization",
+        (LiveDisplay, VisualizationServer),
+    ),
+    (
+        "Replications",
+        (
+            Replication,
+            run_replications,
+            sweep,
+            grid,
+        )
+    ),
+    (
+        "Event Sinks",
+        (
+            EventSink,
+            EventLog,
+            FileSink,
+        )
+    ),
     (
         "Events",
         (
@@ -147,12 +199,14 @@ _toc = (
             ContainerSetLevel,
             StoreSetCapacity,
             StoreSetContent,
+            StoreUpdateContent,
         )
     ),
     (
         "Primitives",
         (
             ComponentType,
+            Compression,
             EventAction,
         )
     ),
@@ -0,0 +1,147 @@
+"""
+A compact, binary representation of a visualization.
+
+The format consists of a fixed size preamble, a JSON header and the columns
+of the :class:`~simplay.eventlog.EventLog`:
+
+* 8 bytes: :data:`MAGIC`, the last byte is the version of the format.
+* 4 bytes: the length of the header in bytes, little endian.
+* 4 bytes: the number of events, little endian.
+* The header, UTF-8 encoded JSON. It holds the ``entities``, ``visuals``,
+  ``assets`` and ``grid`` of the visualization exactly as the JSON output
+  of :meth:`~simplay.core.VisualizationManager.serialize`. It also holds the
+  ``actions`` and ``argNames`` by action code, the ``strings`` table and
+  the side table of ``objects`` and, if there are any, the ``keyframes``.
+* The columns, little endian, each padded to a multiple of eight bytes:
+  ``timestamps``, ``arg0`` and ``arg1`` as 64-bit floats, ``forIds`` as
+  32-bit unsigned integers, ``kinds`` as 16-bit unsigned integers and
+  ``actions`` as 8-bit unsigned integers. See
+  :meth:`~simplay.eventlog.EventLog.columns` for their meaning.
+"""
+import json
+import struct
+import sys
+from array import array
+from typing import Any, BinaryIO, Dict
+
+import jsons
+
+from .eventlog import (_ARG0_SHIFT, _ARG1_SHIFT, _CAMEL_ARG_NAMES,
+                       _KIND_MASK, _RAW_ARGS, ACTIONS, KIND_BOOL, KIND_FLOAT,
+                       KIND_INT, KIND_OBJECT, KIND_STR, EventLog)
+from .primitives import ErrorText
+
+MAGIC = b"SIMPLAY\x01"
+"""
+The first bytes of every binary visualization.
+"""
+_PREAMBLE = struct.Struct("<8sII")
+_ALIGNMENT = 8
+_COLUMN_TYPES = (("timestamps", "d"), ("arg0", "d"), ("arg1", "d"),
+                 ("forIds", "I"), ("kinds", "H"), ("actions", "B"))
+
+
+def _padding(length: int) -> bytes:
+    return b"\0" * (-length % _ALIGNMENT)
+
+
+def dump(
+        log: EventLog,
+        header: Dict[str, Any],
+        file: BinaryIO,
+        extras: Dict[str, Any] = None):
+    """
+    Write a visualization in the binary format.
+
+    :param log: The events of the visualization.
+    :param header: The ``entities``, ``visuals``, ``assets`` and ``grid`` of
+        the visualization.
+    :param file: The binary file to write to.
+    :param extras: Further entries of the header, such as the
+        ``keyframes``, which are already plain JSON values.
+    """
+    for_ids, actions, timestamps, kinds, arg0, arg1 = log.columns()
+    meta = jsons.dump(
+        {**header, "objects": log.objects},
+        strip_privates=True,
+        key_transformer=jsons.KEY_TRANSFORMER_CAMELCASE,
+    )
+    meta["actions"] = [action.value for action in ACTIONS]
+    meta["argNames"] = [list(names) for names in _CAMEL_ARG_NAMES]
+    meta["strings"] = log.strings
+    meta.update(extras or {})
+    encoded = json.dumps(meta).encode("utf-8")
+    file.write(_PREAMBLE.pack(MAGIC, len(encoded), len(log)))
+    file.write(encoded)
+    file.write(_padding(_PREAMBLE.size + len(encoded)))
+    for column in (timestamps, arg0, arg1, for_ids, kinds, actions):
+        if sys.byteorder == "big":
+            column = array(column.typecode, column)
+            column.byteswap()
+        data = column.tobytes()
+        file.write(data)
+        file.write(_padding(len(data)))
+
+
+def load(data: bytes) -> Dict[str, Any]:
+    """
+    Read a visualization in the binary format.
+
+    :param data: The binary visualization.
+    :return: The visualization, in the same structure as the JSON output
+        of :meth:`~simplay.core.VisualizationManager.serialize`.
+    :raises ValueError: If the data is not a binary visualization.
+    """
+    magic, header_length, count = _PREAMBLE.unpack_from(data)
+    if magic != MAGIC:
+        raise ValueError(ErrorText.INVALID_BINARY_FORMAT)
+    offset = _PREAMBLE.size
+    meta = json.loads(data[offset:offset + header_length].decode("utf-8"))
+    offset += header_length
+    offset += -offset % _ALIGNMENT
+    columns = {}
+    for name, typecode in _COLUMN_TYPES:
+        column = array(typecode)
+        length = count * column.itemsize
+        column.frombytes(data[offset:offset + length])
+        if sys.byteorder == "big":
+            column.byteswap()
+        columns[name] = column
+        offset += length + (-length % _ALIGNMENT)
+
+    strings = meta.pop("strings")
+    objects = meta.pop("objects")
+    actions = meta.pop("actions")
+    arg_names = meta.pop("argNames")
+
+    def decode(kind, value):
+        if kind == KIND_INT:
+            return int(value)
+        if kind == KIND_FLOAT:
+            return value
+        if kind == KIND_BOOL:
+            return value != 0
+        if kind == KIND_STR:
+            return strings[int(value)]
+        if kind == KIND_OBJECT:
+            return objects[int(value)]
+        return None
+
+    events = []
+    for for_id, code, timestamp, kinds, value0, value1 in zip(
+            columns["forIds"], columns["actions"], columns["timestamps"],
+            columns["kinds"], columns["arg0"], columns["arg1"]):
+        if kinds & _RAW_ARGS:
+            args = objects[int(value0)]
+        else:
+            names = arg_names[code]
+            values = (decode((kinds >> _ARG0_SHIFT) & _KIND_MASK, value0),
+                      decode((kinds >> _ARG1_SHIFT) & _KIND_MASK, value1))
+            args = dict(zip(names, values))
+        events.append({
+            "action": actions[code],
+            "args": args,
+            "forId": strings[for_id],
+            "timestamp": decode(kinds & _KIND_MASK, timestamp),
+        })
+    return {"events": events, **meta}
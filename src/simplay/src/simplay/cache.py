@@ -0,0 +1,105 @@
+import hashlib
+import os
+from typing import Optional
+
+from .primitives import ErrorText
+
+
+class DiskCache:
+    """
+    A persistent cache that stores values as files in a directory.
+
+    Values are bytes, keys are arbitrary strings. Every access marks an
+    entry as recently used. When the total size of the entries exceeds
+    ``max_size``, the least recently used entries are removed.
+
+    The cache can be shared between runs and processes. Entries are written
+    atomically, so a reader never sees a partially written value.
+
+    :param directory: The directory the entries are stored in. It is created
+        if it does not exist.
+    :param max_size: The maximum total size of all entries in bytes.
+    :raises TypeError: If the directory is not a string.
+    :raises ValueError: If max_size is not a positive integer.
+    """
+
+    def __init__(self, directory: str, max_size: int = 256 * 1024 * 1024):
+        if not isinstance(directory, str):
+            raise TypeError(ErrorText.DIRECTORY_MUST_BE_STRING)
+        if not isinstance(max_size, int) or max_size <= 0:
+            raise ValueError(ErrorText.MAX_SIZE_MUST_BE_POSITIVE_INT)
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        """
+        The directory the entries are stored in.
+        """
+        self.max_size = max_size
+        """
+        The maximum total size of all entries in bytes.
+        """
+        self._size = sum(entry.stat().st_size for entry in self.__entries())
+
+    def __entries(self):
+        return (entry for entry in os.scandir(self.directory)
+                if entry.is_file() and not entry.name.endswith(".tmp"))
+
+    def __path(self, key: str) -> str:
+        name = hashlib.sha256(key.encode("utf-8")).hexdigest()
+        return os.path.join(self.directory, name)
+
+    def get(self, key: str) -> Optional[bytes]:
+        """
+        Get the value stored for the given key.
+
+        :param key: The key of the entry.
+        :return: The value, or ``None`` if there is no entry for the key.
+        """
+        path = self.__path(key)
+        try:
+            with open(path, "rb") as file:
+                value = file.read()
+        except FileNotFoundError:
+            return None
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            # evicted by another process after it was read
+            pass
+        return value
+
+    def put(self, key: str, value: bytes):
+        """
+        Store a value for the given key, replacing any previous value.
+
+        :param key: The key of the entry.
+        :param value: The value to store.
+        """
+        path = self.__path(key)
+        try:
+            # the replaced entry no longer counts
+            self._size -= os.stat(path).st_size
+        except FileNotFoundError:
+            pass
+        temporary = f"{path}.{os.getpid()}.tmp"
+        with open(temporary, "wb") as file:
+            file.write(value)
+        os.replace(temporary, path)
+        self._size += len(value)
+        if self._size > self.max_size:
+            self.__evict()
+
+    def __evict(self):
+        # the modification time of an entry is the time it was last used
+        entries = sorted(((entry.stat(), entry.path)
+                          for entry in self.__entries()),
+                         key=lambda item: item[0].st_mtime_ns)
+        self._size = sum(stat.st_size for stat, _ in entries)
+        for stat, path in entries:
+            if self._size <= self.max_size:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                # already removed by another process
+                pass
+            self._size -= stat.st_size
@@ -0,0 +1,111 @@
+"""
+A line oriented layout of a visualization, which the player can start to
+play before it is loaded completely.
+
+Every line is a JSON document:
+
+* The first line is the header. It holds the :data:`FORMAT`, the
+  ``chunkSteps`` and the ``entities``, ``visuals``, ``assets`` and ``grid``
+  of the visualization exactly as the JSON output of
+  :meth:`~simplay.core.VisualizationManager.serialize` and, if there are
+  any, the ``keyframes``.
+* Every following line is a chunk of ``chunkSteps`` steps, ordered by step:
+  ``{"until": step, "events": [...]}``. The events of all steps before
+  ``until`` are in this or an earlier chunk. Chunks without events are
+  left out.
+"""
+import json
+from typing import Any, Dict, Iterator, List, TextIO, Tuple
+
+import jsons
+
+from .eventlog import EventSink
+from .keyframes import step_of
+
+FORMAT = "simplay-chunked"
+"""
+The ``format`` of the header of every chunked visualization.
+"""
+
+
+def chunks(
+        sink: EventSink,
+        chunk_steps: int) -> Iterator[Tuple[int, List[str]]]:
+    """
+    Split the events of a sink into chunks of consecutive steps.
+
+    :param sink: The events of the visualization.
+    :param chunk_steps: The number of steps of a chunk.
+    :return: An iterator of the first step after every chunk and the events
+        of the chunk, serialized to JSON and ordered by step.
+    """
+    steps = [step_of(timestamp) for timestamp in sink.timestamps()]
+    events = sink.json_records()
+    if any(a > b for a, b in zip(steps, steps[1:])):
+        # simulations record in time order, unless events were added with
+        # past timestamps, then the events are sorted in memory
+        ordered = sorted(zip(steps, events), key=lambda item: item[0])
+        steps = [step for step, _ in ordered]
+        events = iter([event for _, event in ordered])
+    chunk: List[str] = []
+    until = None
+    for step, event in zip(steps, events):
+        if until is not None and step >= until:
+            yield until, chunk
+            chunk = []
+        until = (step // chunk_steps + 1) * chunk_steps
+        chunk.append(event)
+    if chunk:
+        yield until, chunk
+
+
+def dump(
+        sink: EventSink,
+        header: Dict[str, Any],
+        file: TextIO,
+        chunk_steps: int,
+        extras: Dict[str, Any] = None):
+    """
+    Write a visualization in the chunked layout.
+
+    :param sink: The events of the visualization.
+    :param header: The ``entities``, ``visuals``, ``assets`` and ``grid`` of
+        the visualization.
+    :param file: The text file to write to.
+    :param chunk_steps: The number of steps of a chunk.
+    :param extras: Further entries of the header, such as the
+        ``keyframes``, which are already plain JSON values.
+    """
+    meta = {
+        "format": FORMAT,
+        "chunkSteps": chunk_steps,
+        **jsons.dump(
+            header,
+            strip_privates=True,
+            key_transformer=jsons.KEY_TRANSFORMER_CAMELCASE,
+        ),
+        **(extras or {}),
+    }
+    file.write(json.dumps(meta))
+    file.write("\n")
+    for until, events in chunks(sink, chunk_steps):
+        file.write(f'{{"until": {until}, "events": [')
+        file.write(", ".join(events))
+        file.write("]}\n")
+
+
+def load(text: str) -> Dict[str, Any]:
+    """
+    Read a visualization written in the chunked layout.
+
+    :param text: The content of the file.
+    :return: The visualization in the structure of the JSON output of
+        :meth:`~simplay.core.VisualizationManager.serialize`.
+    """
+    lines = text.splitlines()
+    data = json.loads(lines[0])
+    data.pop("format")
+    data.pop("chunkSteps")
+    data["events"] = [event for line in lines[1:]
+                      for event in json.loads(line)["events"]]
+    return data
@@ -1,5 +1,7 @@
-from typing import Any, Callable, Union
+from types import MethodType
+from typing import Union
 
+import jsons
 from simpy import (Container, FilterStore, PreemptiveResource,
                    PriorityResource, Resource, Store)
 from simpy.resources.container import (ContainerAmount, ContainerGet,
@@ -9,12 +11,25 @@ from simpy.resources.store import FilterStoreGet, StoreGet, StorePut
 
 from .events import (ContainerSetCapacity, ContainerSetLevel,
                      ResourceSetCapacity, ResourceSetUtilization,
-                     StoreSetCapacity, StoreSetContent)
+                     StoreSetCapacity, StoreUpdateContent)
 
 from .core import VisualComponent, VisualEnvironment
 from .primitives import ComponentType, ErrorText
 
 
+def _bind_plain(component: VisualComponent, base: type, *names: str):
+    """
+    Bind the methods ``names`` of the simpy class ``base`` to a component
+    whose visualization is disabled, so calls skip the overrides that
+    record events, as if the component was a plain simpy resource.
+    """
+    if component.visualization_manager.enabled:
+        return
+    for name in names:
+        # like BoundClass.bind_early, which simpy uses for its resources
+        setattr(component, name, MethodType(getattr(base, name), component))
+
+
 class VisualProcess(VisualComponent):
     """
     Shorthand for creating an entity of type
@@ -80,6 +95,7 @@ class VisualResource(VisualComponent, Resource):
         Resource.__init__(self, env, capacity)
         self.__update_capacity()
         self.__update_utilization()
+        _bind_plain(self, Resource, "request", "release")
 
     @property
     def capacity(self) -> ContainerAmount:
@@ -91,14 +107,12 @@ class VisualResource(VisualComponent, Resource):
         self.__update_capacity()
 
     def __update_capacity(self):
-        self.visualization_manager.add_event(
-            ResourceSetCapacity(self.id, self.env.now, self.capacity)
-        )
+        self.visualization_manager.record_if_changed(
+            ResourceSetCapacity, self.id, self.env.now, self.capacity)
 
     def __update_utilization(self, _=None):
-        self.visualization_manager.add_event(
-            ResourceSetUtilization(
-                self.id, self.env.now, self.count))
+        self.visualization_manager.record_if_changed(
+            ResourceSetUtilization, self.id, self.env.now, self.count)
 
     def request(self) -> Request:
         req = super().request()
@@ -150,6 +164,7 @@ class VisualPreemptiveResource(VisualComponent, PreemptiveResource):
         PreemptiveResource.__init__(self, env, capacity)
         self.__update_capacity()
         self.__update_utilization()
+        _bind_plain(self, PreemptiveResource, "request", "release")
 
     @property
     def capacity(self) -> ContainerAmount:
@@ -161,14 +176,12 @@ class VisualPreemptiveResource(VisualComponent, PreemptiveResource):
         self.__update_capacity()
 
     def __update_capacity(self):
-        self.visualization_manager.add_event(
-            ResourceSetCapacity(self.id, self.env.now, self.capacity)
-        )
+        self.visualization_manager.record_if_changed(
+            ResourceSetCapacity, self.id, self.env.now, self.capacity)
 
     def __update_utilization(self, _=None):
-        self.visualization_manager.add_event(
-            ResourceSetUtilization(
-                self.id, self.env.now, self.count))
+        self.visualization_manager.record_if_changed(
+            ResourceSetUtilization, self.id, self.env.now, self.count)
 
     def request(
             self,
@@ -223,6 +236,7 @@ class VisualPriorityResource(VisualComponent, PriorityResource):
         PriorityResource.__init__(self, env, capacity)
         self.__update_capacity()
         self.__update_utilization()
+        _bind_plain(self, PriorityResource, "request", "release")
 
     @property
     def capacity(self) -> ContainerAmount:
@@ -234,14 +248,12 @@ class VisualPriorityResource(VisualComponent, PriorityResource):
         self.__update_capacity()
 
     def __update_capacity(self):
-        self.visualization_manager.add_event(
-            ResourceSetCapacity(self.id, self.env.now, self.capacity)
-        )
+        self.visualization_manager.record_if_changed(
+            ResourceSetCapacity, self.id, self.env.now, self.capacity)
 
     def __update_utilization(self, _=None):
-        self.visualization_manager.add_event(
-            ResourceSetUtilization(
-                self.id, self.env.now, self.count))
+        self.visualization_manager.record_if_changed(
+            ResourceSetUtilization, self.id, self.env.now, self.count)
 
     def request(
             self,
@@ -300,6 +312,7 @@ class VisualContainer(VisualComponent, Container):
         Container.__init__(self, env, capacity, init)
         self.__update_capacity()
         self.__update_level()
+        _bind_plain(self, Container, "put", "get")
 
     @property
     def capacity(self) -> ContainerAmount:
@@ -311,14 +324,12 @@ class VisualContainer(VisualComponent, Container):
         self.__update_capacity()
 
     def __update_capacity(self):
-        self.visualization_manager.add_event(
-            ContainerSetCapacity(self.id, self.env.now, self.capacity)
-        )
+        self.visualization_manager.record_if_changed(
+            ContainerSetCapacity, self.id, self.env.now, self.capacity)
 
     def __update_level(self, _=None):
-        self.visualization_manager.add_event(
-            ContainerSetLevel(self.id, self.env.now, self.level)
-        )
+        self.visualization_manager.record_if_changed(
+            ContainerSetLevel, self.id, self.env.now, self.level)
 
     def put(self, amount: ContainerAmount) -> ContainerPut:
         put = super().put(amount)
@@ -333,6 +344,73 @@ class VisualContainer(VisualComponent, Container):
         return get
 
 
+class _StoreContent:
+    """
+    Records the content of a store as
+    :class:`~simplay.events.StoreUpdateContent` events.
+
+    Every item gets a key when it is put into the store and is serialized
+    to JSON once. Puts and gets are recorded as deltas, so recording costs
+    the same regardless of the number of items in the store. A snapshot of
+    the whole content is recorded when the store is created and after
+    :attr:`SNAPSHOT_INTERVAL` changes, or as many changes as there are items
+    in the store, whichever is more, so snapshots add constant cost per
+    change as well.
+
+    :param store: The store whose content is recorded.
+    """
+
+    SNAPSHOT_INTERVAL = 1000
+
+    def __init__(self, store: Store):
+        self.store = store
+        self.keys = []
+        self.items = {}
+        self.next_key = 0
+        self.changes = 0
+
+    def added(self):
+        """
+        Record the item that was appended to the store.
+        """
+        key = self.next_key
+        self.next_key += 1
+        item = jsons.dumps(self.store.items[-1], strip_privates=True,
+                           key_transformer=jsons.KEY_TRANSFORMER_CAMELCASE)
+        self.keys.append(key)
+        self.items[key] = item
+        self.__record(f"[[{key}, {item}]]", "[]")
+
+    def removed(self, index: int):
+        """
+        Record the removal of an item from the store.
+
+        :param index: The position the item had in the store.
+        """
+        key = self.keys.pop(index)
+        del self.items[key]
+        self.__record("[]", f"[{key}]")
+
+    def snapshot(self):
+        """
+        Record the whole content of the store.
+        """
+        self.changes = 0
+        added = ", ".join(f"[{key}, {self.items[key]}]" for key in self.keys)
+        self.store.visualization_manager.record(
+            StoreUpdateContent, self.store.id, self.store.env.now,
+            f"[{added}]", StoreUpdateContent.REMOVE_ALL)
+
+    def __record(self, added: str, removed: str):
+        self.changes += 1
+        if self.changes >= max(self.SNAPSHOT_INTERVAL, len(self.keys)):
+            self.snapshot()
+            return
+        self.store.visualization_manager.record(
+            StoreUpdateContent, self.store.id, self.store.env.now,
+            added, removed)
+
+
 class VisualStore(VisualComponent, Store):
     """
     Extends the :class:`~simpy.resources.store.Store` class with visualization.
@@ -371,8 +449,10 @@ class VisualStore(VisualComponent, Store):
         Store.__init__(self, env, capacity)
         VisualComponent.__init__(
             self, env, id, ComponentType.STORE, visual, tint)
+        self.__content = _StoreContent(self)
         self.__update_capacity()
-        self.__update_content()
+        self.__content.snapshot()
+        _bind_plain(self, Store, "put", "get", "_do_put", "_do_get")
 
     @property
     def capacity(self) -> Union[float, int]:
@@ -384,26 +464,22 @@ class VisualStore(VisualComponent, Store):
         self.__update_capacity()
 
     def __update_capacity(self):
-        self.visualization_manager.add_event(
-            StoreSetCapacity(self.id, self.env.now, self.capacity)
-        )
-
-    def __update_content(self, _=None):
-        self.visualization_manager.add_event(
-            StoreSetContent(self.id, self.env.now, self.items)
-        )
-
-    def put(self, item) -> StorePut:
-        put = super().put(item)
-        self.__update_content()
-        put.callbacks.append(self.__update_content)
-        return put
+        self.visualization_manager.record_if_changed(
+            StoreSetCapacity, self.id, self.env.now, self.capacity)
 
-    def get(self) -> StoreGet:
-        get = super().get()
-        self.__update_content()
-        get.callbacks.append(self.__update_content)
-        return get
+    def _do_put(self, event: StorePut):
+        count = len(self.items)
+        result = super()._do_put(event)
+        if len(self.items) > count:
+            self.__content.added()
+        return result
+
+    def _do_get(self, event: StoreGet):
+        count = len(self.items)
+        result = super()._do_get(event)
+        if len(self.items) < count:
+            self.__content.removed(0)
+        return result
 
 
 class VisualFilterStore(VisualComponent, FilterStore):
@@ -442,8 +518,10 @@ class VisualFilterStore(VisualComponent, FilterStore):
         FilterStore.__init__(self, env, capacity)
         VisualComponent.__init__(
             self, env, id, ComponentType.STORE, visual, tint)
+        self.__content = _StoreContent(self)
         self.__update_capacity()
-        self.__update_content()
+        self.__content.snapshot()
+        _bind_plain(self, FilterStore, "put", "get", "_do_put", "_do_get")
 
     @property
     def capacity(self) -> int:
@@ -455,24 +533,24 @@ class VisualFilterStore(VisualComponent, FilterStore):
         self.__update_capacity()
 
     def __update_capacity(self):
-        self.visualization_manager.add_event(
-            StoreSetCapacity(self.id, self.env.now, self.capacity)
-        )
-
-    def __update_content(self, _=None):
-        self.visualization_manager.add_event(
-            StoreSetContent(self.id, self.env.now, self.items)
-        )
-
-    def put(self, item) -> StorePut:
-        put = super().put(item)
-        self.__update_content()
-        put.callbacks.append(self.__update_content)
-        return put
-
-    def get(self, filter: Callable[[Any], bool]
-            = lambda item: True) -> FilterStoreGet:
-        get = super().get(filter)
-        self.__update_content()
-        get.callbacks.append(self.__update_content)
-        return get
+        self.visualization_manager.record_if_changed(
+            StoreSetCapacity, self.id, self.env.now, self.capacity)
+
+    def _do_put(self, event: StorePut):
+        count = len(self.items)
+        result = super()._do_put(event)
+        if len(self.items) > count:
+            self.__content.added()
+        return result
+
+    def _do_get(self, event: FilterStoreGet):
+        # takes the first item that matches the filter, like
+        # FilterStore._do_get, but records the very item it removes, calling
+        # the filter only once per item
+        for index, item in enumerate(self.items):
+            if event.filter(item):
+                del self.items[index]
+                event.succeed(item)
+                self.__content.removed(index)
+                break
+        return True
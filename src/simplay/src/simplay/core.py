@@ -2,13 +2,24 @@
 from __future__ import annotations
 
 import base64
-from typing import List
+import gzip
+import hashlib
+import io
+import lzma
+import os
+from typing import List, TextIO, Type
 import jsons
 import json
 from simpy.core import SimTime, Environment
+from simpy.rt import RealtimeEnvironment
 
-from .primitives import ComponentType, ErrorText, SimplayConsts
+from . import binary, chunked
+from .cache import DiskCache
+from .primitives import ComponentType, Compression, ErrorText, SimplayConsts
 from .visualization import VisualGrid
+from .eventlog import EventLog, EventLogView, EventSink, columnar_events
+from .keyframes import keyframes
+from .live import LiveDisplay
 from .events import (MoveNear, MoveNearCell, SetDecoratingText, SetInteracting,
                      SetNotInteracting, SetPosition,
                      SetSpriteFrame, SetTintColor, SetVisible,
@@ -18,11 +29,70 @@ from .events import (MoveNear, MoveNearCell, SetDecoratingText, SetInteracting,
 class VisualEnvironment(Environment):
     """
     Extends the :class:`~simpy.core.Environment` class with visualization.
+
+    :param initial_time: The initial time of the simulation.
+    :param validate: Whether events are validated when they are recorded.
+        If ``False``, events are recorded without any type checks and the
+        whole event log is validated once, when it is serialized. See
+        :meth:`~simplay.core.VisualizationManager.validate`.
+    :param sink: The sink events are recorded to, see
+        :class:`~simplay.core.VisualizationManager`.
+    :param enabled: Whether events are recorded. Disable it for runs that
+        are not visualized, e.g. all but one replication of a Monte Carlo
+        study, see :class:`~simplay.core.VisualizationManager`.
     """
 
-    def __init__(self, initial_time: SimTime = 0):
+    def __init__(
+            self,
+            initial_time: SimTime = 0,
+            validate: bool = True,
+            sink: EventSink = None,
+            enabled: bool = True):
         super().__init__(initial_time)
-        self.visualization_manager = VisualizationManager()
+        self.visualization_manager = VisualizationManager(
+            validate, sink, enabled)
+
+
+class VisualRealtimeEnvironment(VisualEnvironment, RealtimeEnvironment):
+    """
+    Extends the :class:`~simpy.rt.RealtimeEnvironment` class with
+    visualization, for models that run in sync with the wall clock, such as
+    digital twins. Serve the visualization with a
+    :class:`~simplay.server.VisualizationServer` to watch it while it runs.
+
+    Before waiting for the next event, the events recorded so far are sent
+    to the streams of the visualization, so they are shown without delay.
+
+    :param initial_time: The initial time of the simulation.
+    :param factor: The number of seconds a unit of simulation time takes.
+    :param strict: Whether a :class:`RuntimeError` is raised if the
+        simulation falls behind the wall clock, see
+        :class:`~simpy.rt.RealtimeEnvironment`.
+    :param validate: Whether events are validated when they are recorded,
+        see :class:`VisualEnvironment`.
+    :param sink: The sink events are recorded to, see
+        :class:`~simplay.core.VisualizationManager`.
+    :param enabled: Whether events are recorded, see
+        :class:`VisualEnvironment`.
+    """
+
+    def __init__(
+            self,
+            initial_time: SimTime = 0,
+            factor: float = 1.0,
+            strict: bool = True,
+            validate: bool = True,
+            sink: EventSink = None,
+            enabled: bool = True):
+        RealtimeEnvironment.__init__(self, initial_time, factor, strict)
+        self.visualization_manager = VisualizationManager(
+            validate, sink, enabled)
+
+    def step(self):
+        if self.peek() > self.now:
+            # the next step waits for the wall clock
+            self.visualization_manager.flush_streams()
+        super().step()
 
 
 class VisualComponent:
@@ -81,18 +151,16 @@ class VisualComponent:
         Adds an ``SetVisible`` event for the given component to the EventQueue,
         making it visible.
         """
-        self.visualization_manager.add_event(
-            SetVisible(self.id, self.env.now, True)
-        )
+        self.visualization_manager.record(
+            SetVisible, self.id, self.env.now, True)
 
     def is_invisible(self):
         """
         Adds an ``SetVisible`` event for the given component to the EventQueue,
         making it invisible.
         """
-        self.visualization_manager.add_event(
-            SetVisible(self.id, self.env.now, False)
-        )
+        self.visualization_manager.record(
+            SetVisible, self.id, self.env.now, False)
 
     def is_at(self, x: int, y: int):
         """
@@ -102,9 +170,8 @@ class VisualComponent:
         :param x: The x coordinate of the component.
         :param y: The y coordinate of the component.
         """
-        self.visualization_manager.add_event(
-            SetPosition(self.id, self.env.now, x, y)
-        )
+        self.visualization_manager.record(
+            SetPosition, self.id, self.env.now, x, y)
 
     def is_near(self, target: VisualComponent):
         """
@@ -116,9 +183,8 @@ class VisualComponent:
         """
         if not isinstance(target, VisualComponent):
             raise TypeError(ErrorText.TARGET_MUST_BE_VISUAL_COMPONENT)
-        self.visualization_manager.add_event(
-            MoveNear(self.id, self.env.now, target.id)
-        )
+        self.visualization_manager.record(
+            MoveNear, self.id, self.env.now, target.id)
 
     def is_near_cell(self, x: int, y: int):
         """
@@ -128,9 +194,8 @@ class VisualComponent:
         :param x: The x coordinate of the target cell.
         :param y: The y coordinate of the target cell.
         """
-        self.visualization_manager.add_event(
-            MoveNearCell(self.id, self.env.now, x, y)
-        )
+        self.visualization_manager.record(
+            MoveNearCell, self.id, self.env.now, x, y)
 
     def is_interacting_with(self, target: VisualComponent):
         """
@@ -144,9 +209,8 @@ class VisualComponent:
 
         if not isinstance(target, VisualComponent):
             raise TypeError(ErrorText.TARGET_MUST_BE_VISUAL_COMPONENT)
-        self.visualization_manager.add_event(
-            SetInteracting(self.id, self.env.now, target.id)
-        )
+        self.visualization_manager.record(
+            SetInteracting, self.id, self.env.now, target.id)
 
     def is_no_longer_interacting_with(self, target: VisualComponent):
         """
@@ -160,9 +224,8 @@ class VisualComponent:
         """
         if not isinstance(target, VisualComponent):
             raise TypeError(ErrorText.TARGET_MUST_BE_VISUAL_COMPONENT)
-        self.visualization_manager.add_event(
-            SetNotInteracting(self.id, self.env.now, target.id)
-        )
+        self.visualization_manager.record(
+            SetNotInteracting, self.id, self.env.now, target.id)
 
     def has_tint(self, color: int):
         """
@@ -173,9 +236,8 @@ class VisualComponent:
             To use HEX values, write them as 0xRRGGBB.
             For example: 0xFF0000 is red, 0x00FF00 is green, 0x0000FF is blue.
         """
-        self.visualization_manager.add_event(
-            SetTintColor(self.id, self.env.now, color)
-        )
+        self.visualization_manager.record(
+            SetTintColor, self.id, self.env.now, color)
 
     def has_original_tint(self):
         """
@@ -183,9 +245,8 @@ class VisualComponent:
         EventQueue, resetting the tint color to its initial value.
 
         """
-        self.visualization_manager.add_event(
-            SetTintColor(self.id, self.env.now, self.tint)
-        )
+        self.visualization_manager.record(
+            SetTintColor, self.id, self.env.now, self.tint)
 
     def has_decorating_text(self, text: str):
         """
@@ -194,9 +255,8 @@ class VisualComponent:
 
         :param text: The text to display.
         """
-        self.visualization_manager.add_event(
-            SetDecoratingText(self.id, self.env.now, text)
-        )
+        self.visualization_manager.record(
+            SetDecoratingText, self.id, self.env.now, text)
 
     def has_frame(self, frame: int):
         """
@@ -205,9 +265,8 @@ class VisualComponent:
 
         :param frame: The index of the frame to display.
         """
-        self.visualization_manager.add_event(
-            SetSpriteFrame(self.id, self.env.now, frame)
-        )
+        self.visualization_manager.record(
+            SetSpriteFrame, self.id, self.env.now, frame)
 
     @staticmethod
     def create_custom_component(env: VisualEnvironment, id: str, visual: str,
@@ -244,12 +303,45 @@ class VisualizationManager:
     """
     This class acts as a central point for all entities, visuals and
     events.
+
+    :param validate: Whether events are validated when they are recorded.
+        If ``False``, :meth:`record` skips the per event type checks and the
+        log is validated in bulk by :meth:`validate`, which
+        :meth:`serialize` calls before exporting.
+    :param sink: The sink events are recorded to. Defaults to an in-memory
+        :class:`~simplay.eventlog.EventLog`. Use a
+        :class:`~simplay.eventlog.FileSink` to write events to disk while the
+        simulation runs, so memory use does not grow with its length.
+    :param enabled: Whether events are recorded. If ``False``, recording an
+        event returns at once and the components of :mod:`simplay.components`
+        call the methods of their simpy classes directly, so the simulation
+        runs as fast as with plain simpy. Entities and visuals are still
+        registered.
     """
 
-    def __init__(self):
-        self.events = []
+    def __init__(
+            self,
+            validate: bool = True,
+            sink: EventSink = None,
+            enabled: bool = True):
+        self.sink = sink if sink is not None else EventLog()
         """
-        The events that happened in the simulation.
+        The sink events are recorded to.
+        """
+        self.enabled = enabled
+        """
+        Whether events are recorded.
+        """
+        self._validated = 0
+        self.validate_on_record = validate
+        """
+        Whether events are validated when they are recorded.
+        """
+        self._states = {}
+        self.suppressed_events = 0
+        """
+        The number of state events that were not recorded, because they
+        did not change the state of their component.
         """
         self.entities = []
         """
@@ -257,12 +349,39 @@ class VisualizationManager:
         """
         self.visuals = []
         """
-        The visuals that have been registered with the manager.
+        The visuals that have been registered with the manager. The frames
+        of a visual reference images in :attr:`assets` by their hash.
+        """
+        self.assets = {}
+        """
+        The images of all visuals, as base64 data URLs keyed by the SHA-256
+        hash of their content. Every image is stored once, no matter how
+        many frames use it.
+        """
+        self._asset_hashes = {}
+        self.asset_cache = None
+        """
+        The cache for encoded images, see :meth:`set_asset_cache`.
+        """
+        self.keyframe_interval = None
+        """
+        The number of steps between two keyframes, see
+        :meth:`set_keyframe_interval`.
         """
         self.grid = None
         """
         The grid that is used for the visualization.
         """
+        self._streams = []
+
+    @property
+    def events(self) -> EventLogView:
+        """
+        The events that happened in the simulation, as a read-only view of
+        the :class:`~simplay.eventlog.EventLog`. Events are materialized
+        lazily, when they are accessed.
+        """
+        return EventLogView(self.sink)
 
     def add_entity(self, entity: VisualComponent, type: ComponentType):
         """
@@ -296,7 +415,90 @@ class VisualizationManager:
 
         :param event: The event to add.
         """
-        self.events.append(event)
+        if not self.enabled:
+            return
+        self.sink.append_event(event)
+        for stream in self._streams:
+            stream.poll()
+
+    def record(self, event_type: Type[VisualEvent], for_id: str,
+               timestamp: SimTime, *values):
+        """
+        Record an event of the given type.
+
+        If :attr:`validate_on_record` is ``False``, the event is written to
+        the log without constructing an event object and without any type
+        checks. The values are stored as given, unless the event type
+        converts them, see :attr:`~simplay.events.VisualEvent.CONVERTS_ARGS`.
+
+        :param event_type: The type of the event, a subclass of
+            :class:`~simplay.events.VisualEvent`.
+        :param for_id: The id of the component the event is for.
+        :param timestamp: The timestamp of the event.
+        :param values: The arguments of the event, in constructor order.
+        """
+        if not self.enabled:
+            return
+        if self.validate_on_record or event_type.CONVERTS_ARGS:
+            values = tuple(
+                event_type(for_id, timestamp, *values).args.values())
+        self.sink.append(for_id, timestamp, event_type.ACTION, values)
+        for stream in self._streams:
+            stream.poll()
+
+    def record_if_changed(self, event_type: Type[VisualEvent], for_id: str,
+                          timestamp: SimTime, *values):
+        """
+        Record an event of the given type, unless the last event of this type
+        for the same component had the same values. Suppressed events are
+        counted in :attr:`suppressed_events`.
+
+        :param event_type: The type of the event, a subclass of
+            :class:`~simplay.events.VisualEvent`.
+        :param for_id: The id of the component the event is for.
+        :param timestamp: The timestamp of the event.
+        :param values: The arguments of the event, in constructor order.
+        """
+        if not self.enabled or self.__is_unchanged(
+                for_id, event_type, values):
+            return
+        self.record(event_type, for_id, timestamp, *values)
+
+    def add_event_if_changed(self, event: VisualEvent):
+        """
+        Add an event to the visualization, unless the last event of this
+        type for the same component had the same arguments. Suppressed events
+        are counted in :attr:`suppressed_events`.
+
+        :param event: The event to add.
+        """
+        if not self.enabled or self.__is_unchanged(
+                event.for_id, type(event), tuple(event.args.values())):
+            return
+        self.add_event(event)
+
+    def __is_unchanged(self, for_id: str, event_type: Type[VisualEvent],
+                       values: tuple) -> bool:
+        key = (for_id, event_type)
+        if self._states.get(key) == values:
+            self.suppressed_events += 1
+            return True
+        self._states[key] = values
+        return False
+
+    def validate(self):
+        """
+        Validate all events that have been recorded since the last
+        validation.
+
+        Events that share an action and the same value types are checked
+        only once, so the cost of a validation pass is governed by the
+        number of distinct event shapes rather than the number of events.
+
+        :raises TypeError: If an event has arguments of the wrong type.
+        """
+        self.sink.validate(self._validated)
+        self._validated = len(self.sink)
 
     def register_visual(self, id: str, path: str):
         """
@@ -314,21 +516,86 @@ class VisualizationManager:
         """
         self.register_sprites(id, [path])
 
-    def __getBase64FromImg(self, path: str):
+    def __add_asset(self, path: str) -> str:
         """
-        Get the base64 representation of an image.
+        Add an image to the asset table, unless it has been added before.
 
         :param path: The path to the image.
-        :return: The base64 representation of the image.
+        :return: The hash of the image.
+        """
+        digest = self._asset_hashes.get(path)
+        if digest is None:
+            digest, data_url = self.__encode_image(path)
+            self.assets.setdefault(digest, data_url)
+            self._asset_hashes[path] = digest
+        return digest
+
+    def __encode_image(self, path: str):
         """
+        Hash an image and encode it as a base64 data URL, using the
+        :attr:`asset_cache` if one is set.
+
+        :param path: The path to the image.
+        :return: A tuple of the hash and the data URL of the image.
+        """
+        key = None
+        if self.asset_cache is not None:
+            stat = os.stat(path)
+            key = (f"asset:{os.path.abspath(path)}:{stat.st_mtime_ns}"
+                   f":{stat.st_size}")
+            cached = self.asset_cache.get(key)
+            if cached is not None:
+                digest, data_url = cached.decode("utf-8").split("\n", 1)
+                return digest, data_url
         with open(path, "rb") as image_file:
-            encoded_string = base64.b64encode(image_file.read())
-            return f"data:image/png;base64,{encoded_string.decode('utf-8')}"
+            content = image_file.read()
+        digest = hashlib.sha256(content).hexdigest()
+        encoded_string = base64.b64encode(content).decode("utf-8")
+        data_url = f"data:image/png;base64,{encoded_string}"
+        if key is not None:
+            self.asset_cache.put(key, f"{digest}\n{data_url}".encode("utf-8"))
+        return digest, data_url
+
+    def set_asset_cache(self, cache: DiskCache):
+        """
+        Set a persistent cache for the encoded images of visuals.
+
+        Images are cached by their path, modification time and size, so
+        registering an image that is in the cache costs a ``stat`` call
+        instead of reading and encoding the file. Set the cache before
+        registering visuals.
+
+        :param cache: The cache to use.
+        :raises TypeError: If the cache is not a
+            :class:`~simplay.cache.DiskCache`.
+        """
+        if not isinstance(cache, DiskCache):
+            raise TypeError(ErrorText.CACHE_MUST_BE_DISK_CACHE)
+        self.asset_cache = cache
+
+    def set_keyframe_interval(self, interval: int):
+        """
+        Add keyframes to the output, every ``interval`` steps.
+
+        A keyframe holds the state of all entities, see
+        :mod:`simplay.keyframes`. The player restores the nearest keyframe
+        when it seeks, instead of replaying the visualization from the
+        start. Smaller intervals make seeking faster and the output larger.
+
+        :param interval: The number of steps between two keyframes.
+        :raises ValueError: If the interval is not a positive integer.
+        """
+        if not isinstance(interval, int) or interval <= 0:
+            raise ValueError(ErrorText.KEYFRAME_INTERVAL_MUST_BE_POSITIVE_INT)
+        self.keyframe_interval = interval
 
     def register_sprites(self, id: str, frames: List[str]):
         """
         Register sprites with the manager.
 
+        The frames are added to :attr:`assets`. Every file is read and
+        encoded once, frames with the same content share one asset.
+
         :param id: The id of the visual, it must be unique and can be used to
             reference the visual in components.
         :param frames: A list of paths to the frames of the sprite.
@@ -351,7 +618,7 @@ class VisualizationManager:
         if not isinstance(id, str):
             raise TypeError(ErrorText.ID_MUST_BE_STRING)
 
-        frames = [self.__getBase64FromImg(f) for f in frames]
+        frames = [self.__add_asset(f) for f in frames]
 
         self.visuals.append({"id": id, "frames": frames})
 
@@ -370,34 +637,296 @@ class VisualizationManager:
             raise TypeError(ErrorText.GRID_MUST_BE_VISUAL_GRID)
         self.grid = grid
 
-    def serialize(self) -> str:
+    def export_assets(self, directory: str):
         """
-        Serialize the visualization to a JSON string.
+        Write every image of :attr:`assets` to the given directory, as a file
+        named after its hash. Images that already exist in the directory are
+        not written again, so recordings of the same model can share one
+        asset directory.
+
+        :param directory: The directory to write the images to. It is
+            created if it does not exist.
+        """
+        os.makedirs(directory, exist_ok=True)
+        for digest, data_url in self.assets.items():
+            path = os.path.join(directory, f"{digest}.png")
+            if os.path.exists(path):
+                continue
+            temporary = f"{path}.{os.getpid()}.tmp"
+            with open(temporary, "wb") as image_file:
+                image_file.write(base64.b64decode(data_url.split(",", 1)[1]))
+            os.replace(temporary, path)
+
+    def __asset_table(self, asset_dir: str, asset_url: str) -> dict:
+        """
+        Get the asset table for the output. If an asset directory is given,
+        the images are exported to it and referenced by URL.
+
+        :param asset_dir: The directory to export the images to, or ``None``
+            to embed them.
+        :param asset_url: The URL of the asset directory, relative to the
+            output.
+        :return: The asset table.
+        """
+        if asset_dir is None:
+            return self.assets
+        self.export_assets(asset_dir)
+        prefix = asset_url.rstrip("/") + "/" if asset_url else ""
+        return {digest: f"{prefix}{digest}.png" for digest in self.assets}
+
+    def serialize(
+            self,
+            asset_dir: str = None,
+            asset_url: str = None,
+            columnar: bool = False) -> str:
         """
-        return jsons.dumps(
+        Serialize the visualization to a JSON string.
+
+        By default, the images of the visuals are embedded as base64 data
+        URLs. If an asset directory is given, the images are written to it
+        once and the output references them by URL instead.
+
+        In the columnar layout, ``events`` is empty and ``eventColumns``
+        holds the events grouped by action in parallel arrays, see
+        :func:`~simplay.eventlog.columnar_events`. The key names are not
+        repeated for every event, which makes the output considerably
+        smaller and faster to parse.
+
+        :param asset_dir: The directory to write the images to, see
+            :meth:`export_assets`.
+        :param asset_url: The URL the player loads the images from, defaults
+            to ``asset_dir``.
+        :param columnar: Whether the events are written in the columnar
+            layout.
+        :raises TypeError: If an event has arguments of the wrong type.
+        """
+        output = io.StringIO()
+        self.__write(output, self.__asset_table(
+            asset_dir, asset_url if asset_url is not None else asset_dir),
+            columnar)
+        return output.getvalue()
+
+    def __write(self, file: TextIO, assets: dict, columnar: bool = False):
+        self.validate()
+        header = jsons.dumps(
             {
-                "events": self.events,
+                "events": [],
                 "entities": self.entities,
                 "visuals": self.visuals,
+                "assets": assets,
                 "grid": self.grid,
             },
             strip_privates=True,
             key_transformer=jsons.KEY_TRANSFORMER_CAMELCASE,
         )
-
-    def serialize_for_jupyter(self) -> dict:
+        extras = {}
+        if columnar:
+            entity_ids = {entity["id"]: index
+                          for index, entity in enumerate(self.entities)}
+            extras["eventColumns"] = columnar_events(
+                self.sink.records(), entity_ids)
+        if self.keyframe_interval is not None:
+            extras["keyframes"] = keyframes(
+                self.sink.records(), self.keyframe_interval)
+        # the events are streamed from the sink into the empty events array
+        split = header.index("[") + 1
+        file.write(header[:split])
+        if not columnar:
+            self.sink.write_events(file)
+        file.write(header[split:-1])
+        for key, value in extras.items():
+            file.write(f", {json.dumps(key)}: ")
+            file.write(json.dumps(value))
+        file.write("}")
+
+    def flush_streams(self):
+        """
+        Send the events recorded so far to all streams of the visualization,
+        such as a :class:`~simplay.live.LiveDisplay`, instead of waiting for
+        their next batch.
+        """
+        for stream in self._streams:
+            stream.flush()
+
+    def live(self, interval: float = 0.5) -> LiveDisplay:
+        """
+        Stream the visualization to the Jupyter player while the simulation
+        runs, so a long simulation can be watched and scrubbed before it
+        ends:
+
+        .. code-block:: python
+
+            with env.visualization_manager.live():
+                env.run(until=10000)
+
+        The events are sent in batches at most every ``interval`` seconds.
+        When the block ends, the output is replaced with the complete
+        visualization. See :mod:`simplay.live`.
+
+        :param interval: The minimum number of seconds between two batches.
+        :return: The stream, a context manager.
+        """
+        return LiveDisplay(self, interval)
+
+    def serialize_for_jupyter(
+            self,
+            asset_dir: str = None,
+            asset_url: str = None,
+            compression: Compression = None,
+            columnar: bool = False) -> dict:
         """
         Serialize the visualization for use with Jupyter.
-        """
+
+        :param asset_dir: The directory to write the images to, see
+            :meth:`serialize`.
+        :param asset_url: The URL the player loads the images from, see
+            :meth:`serialize`.
+        :param compression: If :attr:`~simplay.primitives.Compression.GZIP`,
+            the output is compressed and embedded base64 encoded, which keeps
+            notebooks with long visualizations small.
+        :param columnar: Whether the events are written in the columnar
+            layout, see :meth:`serialize`.
+        :raises ValueError: If the compression is not GZIP.
+        """
+        if compression is None:
+            return {
+                SimplayConsts.JUPYTERLAB_MIMETYPE: json.loads(
+                    self.serialize(asset_dir, asset_url, columnar))
+            }
+        if compression is not Compression.GZIP:
+            raise ValueError(ErrorText.JUPYTER_COMPRESSION_MUST_BE_GZIP)
+        assets = self.__asset_table(
+            asset_dir, asset_url if asset_url is not None else asset_dir)
+        output = io.BytesIO()
+        with self.__open_compressed(output, compression) as f:
+            self.__write(f, assets, columnar)
         return {
-            SimplayConsts.JUPYTERLAB_MIMETYPE: json.loads(self.serialize())
+            SimplayConsts.JUPYTERLAB_GZIP_MIMETYPE: base64.b64encode(
+                output.getvalue()).decode("ascii")
         }
 
-    def write_to_file(self, filename: str):
+    def write_to_file(
+            self,
+            filename: str,
+            asset_dir: str = None,
+            compression: Compression = None,
+            columnar: bool = False):
         """
         Write the visualization to a file.
 
+        The events are streamed from the sink into the file, they are never
+        held in memory as a whole.
+
         :param filename: The name of the file to write to.
+        :param asset_dir: The directory to write the images to, see
+            :meth:`export_assets`. The file references the images by their
+            path relative to the file.
+        :param compression: The compression of the file, if any. The events
+            are compressed while they are streamed into the file.
+            ``simplay-web`` decompresses GZIP files transparently.
+        :param columnar: Whether the events are written in the columnar
+            layout, see :meth:`serialize`.
+        :raises TypeError: If an event has arguments of the wrong type or the
+            compression is not of type
+            :class:`~simplay.primitives.Compression`.
+        """
+        assets = self.__asset_table(
+            asset_dir, self.__relative_asset_url(filename, asset_dir))
+        if compression is None:
+            with open(filename, "w") as f:
+                self.__write(f, assets, columnar)
+            return
+        with self.__open_compressed(filename, compression) as f:
+            self.__write(f, assets, columnar)
+
+    def __open_compressed(self, file, compression: Compression) -> TextIO:
+        """
+        Open a file or binary stream for writing compressed text.
+        """
+        if not isinstance(compression, Compression):
+            raise TypeError(ErrorText.INVALID_COMPRESSION)
+        if compression is Compression.GZIP:
+            # the default level of the gzip tool is several times faster than
+            # the maximum and barely larger, a fixed mtime keeps the output
+            # of identical runs identical
+            target = ({"filename": file} if isinstance(file, str)
+                      else {"fileobj": file})
+            return io.TextIOWrapper(
+                gzip.GzipFile(mode="wb", compresslevel=6, mtime=0, **target),
+                encoding="utf-8")
+        return lzma.open(file, "wt", encoding="utf-8")
+
+    def __relative_asset_url(self, filename: str, asset_dir: str) -> str:
+        """
+        Get the URL of an asset directory, relative to the given file.
+        """
+        if asset_dir is None:
+            return None
+        asset_url = os.path.relpath(
+            asset_dir, os.path.dirname(os.path.abspath(filename)))
+        return asset_url.replace(os.sep, "/")
+
+    def write_binary(self, filename: str, asset_dir: str = None):
+        """
+        Write the visualization to a file in the binary format of
+        :mod:`simplay.binary`, which is smaller and much faster to load than
+        JSON.
+
+        The events of a sink other than an
+        :class:`~simplay.eventlog.EventLog` are read into memory first.
+
+        :param filename: The name of the file to write to.
+        :param asset_dir: The directory to write the images to, see
+            :meth:`write_to_file`.
+        :raises TypeError: If an event has arguments of the wrong type.
+        """
+        self.validate()
+        log = self.sink
+        if not isinstance(log, EventLog):
+            log = EventLog.from_events(self.sink.events())
+        extras = {}
+        if self.keyframe_interval is not None:
+            extras["keyframes"] = keyframes(
+                log.records(), self.keyframe_interval)
+        with open(filename, "wb") as f:
+            binary.dump(log, {
+                "entities": self.entities,
+                "visuals": self.visuals,
+                "assets": self.__asset_table(
+                    asset_dir, self.__relative_asset_url(filename, asset_dir)),
+                "grid": self.grid,
+            }, f, extras)
+
+    def write_chunked(
+            self,
+            filename: str,
+            chunk_steps: int = 100,
+            asset_dir: str = None):
         """
+        Write the visualization to a file in the chunked layout of
+        :mod:`simplay.chunked`. The player starts to play it as soon as the
+        header and the first chunk are loaded, while the remaining chunks
+        are still loading.
+
+        :param filename: The name of the file to write to.
+        :param chunk_steps: The number of steps of a chunk.
+        :param asset_dir: The directory to write the images to, see
+            :meth:`write_to_file`.
+        :raises ValueError: If the number of steps is not a positive integer.
+        :raises TypeError: If an event has arguments of the wrong type.
+        """
+        if not isinstance(chunk_steps, int) or chunk_steps <= 0:
+            raise ValueError(ErrorText.CHUNK_STEPS_MUST_BE_POSITIVE_INT)
+        self.validate()
+        extras = {}
+        if self.keyframe_interval is not None:
+            extras["keyframes"] = keyframes(
+                self.sink.records(), self.keyframe_interval)
         with open(filename, "w") as f:
-            f.write(self.serialize())
+            chunked.dump(self.sink, {
+                "entities": self.entities,
+                "visuals": self.visuals,
+                "assets": self.__asset_table(
+                    asset_dir, self.__relative_asset_url(filename, asset_dir)),
+                "grid": self.grid,
+            }, f, chunk_steps, extras)
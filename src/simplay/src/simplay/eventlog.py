@@ -0,0 +1,801 @@
+import json
+from abc import ABC, abstractmethod
+from array import array
+from json.encoder import encode_basestring_ascii
+from collections.abc import Sequence
+from itertools import islice
+from typing import Any, Dict, Iterable, Iterator, List, TextIO, Tuple
+
+import jsons
+from simpy.core import SimTime
+
+from .events import EVENT_TYPES, VisualEvent
+from .primitives import ErrorText, EventAction
+
+Record = Tuple[str, SimTime, str, Dict[str, Any]]
+"""
+An event as a tuple of id, timestamp, action value and arguments.
+"""
+
+KIND_NONE = 0
+KIND_INT = 1
+KIND_FLOAT = 2
+KIND_BOOL = 3
+KIND_STR = 4
+KIND_OBJECT = 5
+
+# layout of the per event ``kinds`` bit field
+_KIND_BITS = 3
+_KIND_MASK = (1 << _KIND_BITS) - 1
+_ARG0_SHIFT = _KIND_BITS
+_ARG1_SHIFT = 2 * _KIND_BITS
+_RAW_ARGS = 1 << 15
+
+# largest integer that survives the round trip through a double
+_MAX_EXACT_INT = 2 ** 53
+
+ACTIONS: Tuple[EventAction, ...] = tuple(EventAction)
+"""
+All event actions, the position of an action is its code in the log.
+"""
+ACTION_CODES: Dict[EventAction, int] = {
+    action: code for code, action in enumerate(ACTIONS)}
+"""
+Maps every event action to its code in the log.
+"""
+_VALUE_CODES = {action.value: code for code, action in enumerate(ACTIONS)}
+ARG_NAMES: Tuple[Tuple[str, ...], ...] = tuple(
+    EVENT_TYPES[action].ARG_NAMES if action in EVENT_TYPES else ()
+    for action in ACTIONS)
+"""
+The argument names of every action, indexed by action code.
+"""
+_CAMEL_ARG_NAMES = tuple(
+    tuple(jsons.KEY_TRANSFORMER_CAMELCASE(name) for name in names)
+    for names in ARG_NAMES)
+
+
+def _record_templates(code: int) -> Tuple[str, str, str]:
+    # the JSON text around the values of an event, up to the ``forId`` value
+    keys = [encode_basestring_ascii(name) + ": "
+            for name in _CAMEL_ARG_NAMES[code]]
+    keys += ["", ""]
+    head = (f'{{"action": {encode_basestring_ascii(ACTIONS[code].value)}, '
+            f'"args": {{{keys[0]}')
+    middle = f", {keys[1]}" if keys[1] else ""
+    return head, middle, '}, "forId": '
+
+
+_RECORD_TEMPLATES = tuple(_record_templates(code)
+                          for code in range(len(ACTIONS)))
+
+
+def _float_json(value: float) -> str:
+    # same output as the float encoding of the json module
+    if value != value:
+        return "NaN"
+    if value == float("inf"):
+        return "Infinity"
+    if value == -float("inf"):
+        return "-Infinity"
+    return float.__repr__(value)
+
+
+def dumps_record(
+        for_id: str,
+        timestamp: SimTime,
+        action: str,
+        args: Dict[str, Any]) -> str:
+    """
+    Serialize a single event to the JSON representation used in the output
+    of :meth:`~simplay.core.VisualizationManager.serialize`.
+
+    This is the generic, reflection based encoding of :mod:`jsons`, which
+    also handles arbitrary objects. :meth:`EventLog.json_records` produces
+    the same output much faster for events with plain values.
+
+    :param for_id: The id of the component the event is for.
+    :param timestamp: The timestamp of the event.
+    :param action: The value of the action of the event.
+    :param args: The arguments of the event.
+    :return: The event as a JSON string.
+    """
+    return jsons.dumps(
+        {
+            "action": action,
+            "args": args,
+            "for_id": for_id,
+            "timestamp": timestamp,
+        },
+        strip_privates=True,
+        key_transformer=jsons.KEY_TRANSFORMER_CAMELCASE,
+    )
+
+
+_PLAIN_TYPES = (int, float, bool, str, type(None))
+
+
+def _dump_value(value: Any) -> Any:
+    if type(value) in _PLAIN_TYPES:
+        return value
+    return jsons.dump(value, strip_privates=True,
+                      key_transformer=jsons.KEY_TRANSFORMER_CAMELCASE)
+
+
+def columnar_events(
+        records: Iterable[Tuple[str, SimTime, str, Dict[str, Any]]],
+        entity_ids: Dict[str, int]) -> Dict[str, Any]:
+    """
+    Group events into the columnar layout of
+    :meth:`~simplay.core.VisualizationManager.serialize`.
+
+    Events with the same action and argument names form a group, which
+    holds the ids, timestamps and every argument in parallel arrays. Ids of
+    entities are replaced by their index in the entities. ``order`` holds
+    the group of every event, so the events can be restored in the order
+    they were recorded.
+
+    :param records: The events as tuples of id, timestamp, action value and
+        arguments, see :meth:`EventSink.records`.
+    :param entity_ids: The index of every entity by its id.
+    :return: The ``order`` and the ``groups`` of the events, ready to be
+        encoded as JSON.
+    """
+    order = []
+    groups = []
+    group_indices = {}
+    for for_id, timestamp, action, args in records:
+        key = (action, *args)
+        index = group_indices.get(key)
+        if index is None:
+            index = len(groups)
+            group_indices[key] = index
+            groups.append({
+                "action": action,
+                "forIds": [],
+                "timestamps": [],
+                "args": {jsons.KEY_TRANSFORMER_CAMELCASE(name): []
+                         for name in args},
+            })
+        group = groups[index]
+        order.append(index)
+        group["forIds"].append(entity_ids.get(for_id, for_id))
+        group["timestamps"].append(timestamp)
+        for column, value in zip(group["args"].values(), args.values()):
+            column.append(_dump_value(value))
+    return {"order": order, "groups": groups}
+
+
+def _materialize(
+        event_type: type,
+        for_id: str,
+        timestamp: SimTime,
+        action: str,
+        args: Dict[str, Any]) -> VisualEvent:
+    event = event_type.__new__(event_type)
+    event.for_id = for_id
+    event.timestamp = timestamp
+    event.action = action
+    event.args = args
+    return event
+
+
+def _holds_objects(kinds: int) -> bool:
+    return bool(kinds & _RAW_ARGS
+                or (kinds >> _ARG0_SHIFT) & _KIND_MASK == KIND_OBJECT
+                or (kinds >> _ARG1_SHIFT) & _KIND_MASK == KIND_OBJECT)
+
+
+class EventSink(ABC):
+    """
+    Base class for the destinations events are recorded to.
+
+    The :class:`~simplay.core.VisualizationManager` writes every event to a
+    sink. :class:`EventLog` keeps the events in memory, :class:`FileSink`
+    writes them to disk while the simulation runs. Subclasses implement the
+    abstract methods, the others are derived from them.
+    """
+
+    @abstractmethod
+    def __len__(self) -> int:
+        """
+        Get the number of events in the sink.
+        """
+
+    @abstractmethod
+    def append(
+            self,
+            for_id: str,
+            timestamp: SimTime,
+            action: EventAction,
+            values: Tuple[Any, ...]):
+        """
+        Append an event to the sink.
+
+        :param for_id: The id of the component the event is for.
+        :param timestamp: The timestamp of the event.
+        :param action: The action of the event.
+        :param values: The argument values of the event, in the order of the
+            argument names of the action.
+        :raises TypeError: If the number of values does not match the number
+            of argument names of the action.
+        """
+
+    @abstractmethod
+    def append_event(self, event: VisualEvent):
+        """
+        Append an event object to the sink.
+
+        :param event: The event to append.
+        """
+
+    @abstractmethod
+    def validate(self, start: int = 0):
+        """
+        Validate the events of the sink, starting at the given position.
+
+        :param start: The position of the first event to validate.
+        :raises TypeError: If an event has arguments of the wrong type.
+        """
+
+    @abstractmethod
+    def event(self, index: int) -> VisualEvent:
+        """
+        Get a single event of the sink as a
+        :class:`~simplay.events.VisualEvent`.
+
+        :param index: The position of the event in the sink.
+        :return: The event.
+        """
+
+    def events(self) -> Iterator[VisualEvent]:
+        """
+        Iterate over all events of the sink.
+
+        :return: An iterator of :class:`~simplay.events.VisualEvent`.
+        """
+        for index in range(len(self)):
+            yield self.event(index)
+
+    def records(self, start: int = 0) -> Iterator[Record]:
+        """
+        Iterate over the events of the sink as tuples.
+
+        :param start: The position of the first event.
+        :return: An iterator of tuples of id, timestamp, action value and
+            arguments.
+        """
+        for event in islice(self.events(), start, None):
+            yield event.for_id, event.timestamp, event.action, event.args
+
+    def timestamps(self) -> Iterator[SimTime]:
+        """
+        Iterate over the timestamps of all events of the sink.
+
+        :return: An iterator of timestamps.
+        """
+        for record in self.records():
+            yield record[1]
+
+    def json_records(self, start: int = 0) -> Iterator[str]:
+        """
+        Iterate over the events of the sink, serialized to JSON as by
+        :func:`dumps_record`.
+
+        :param start: The position of the first event.
+        :return: An iterator of JSON strings, one per event.
+        """
+        for record in islice(self.records(), start, None):
+            yield dumps_record(*record)
+
+    @abstractmethod
+    def write_events(self, file: TextIO):
+        """
+        Write all events of the sink to the given file, as the comma
+        separated items of a JSON array.
+
+        :param file: The file to write to.
+        """
+
+    def close(self):
+        """
+        Release the resources held by the sink.
+        """
+
+
+class EventLog(EventSink):
+    """
+    Columnar, array-backed storage for the events of a simulation.
+
+    Every event is stored as a row spread across typed columns: the interned
+    id of the component, the action code, the timestamp, a bit field holding
+    the type of each value and up to two argument values. Strings are stored
+    once in a string table and referenced by their index, values that cannot
+    be represented in a column are kept in a side table. Events whose
+    arguments do not match the argument names of their action keep their
+    arguments as a dictionary in the side table.
+
+    Recording an event costs a few dozen bytes, regardless of the type of
+    the event.
+    """
+
+    def __init__(self):
+        self._for_ids = array("I")
+        self._actions = array("B")
+        self._timestamps = array("d")
+        self._kinds = array("H")
+        self._arg0 = array("d")
+        self._arg1 = array("d")
+        self.strings: List[str] = []
+        """
+        The string table, holds every distinct id and text exactly once.
+        """
+        self._string_indices: Dict[str, int] = {}
+        self._encoded_strings: List[str] = []
+        self._objects: List[Any] = []
+
+    @classmethod
+    def from_events(cls, events: Iterable[VisualEvent]) -> "EventLog":
+        """
+        Create a log that holds the given events.
+
+        :param events: The events to add to the log.
+        :return: The log.
+        """
+        log = cls()
+        for event in events:
+            log.append_event(event)
+        return log
+
+    def __len__(self) -> int:
+        return len(self._actions)
+
+    @property
+    def objects(self) -> List[Any]:
+        """
+        The side table, holds the values that cannot be stored in a column
+        and the arguments of events that are stored as a dictionary.
+        """
+        return self._objects
+
+    def columns(self) -> Tuple[array, ...]:
+        """
+        Get the columns of the log.
+
+        The kinds column is a bit field: the lowest three bits hold the kind
+        of the timestamp, the next two groups of three bits the kinds of the
+        two argument values, see the ``KIND_*`` constants. If the highest
+        bit is set, the arguments of the event are the dictionary in the
+        side table at the position given by the first argument value.
+
+        :return: The columns of ids, action codes, timestamps, kinds and the
+            first and second argument values.
+        """
+        return (self._for_ids, self._actions, self._timestamps, self._kinds,
+                self._arg0, self._arg1)
+
+    def intern(self, value: str) -> int:
+        """
+        Get the index of the given string in the string table, adding it if
+        it is not present yet.
+
+        :param value: The string to intern.
+        :return: The index of the string in the string table.
+        """
+        index = self._string_indices.get(value)
+        if index is None:
+            index = len(self.strings)
+            self.strings.append(value)
+            self._string_indices[value] = index
+        return index
+
+    def _encode(self, value: Any) -> Tuple[int, float]:
+        value_type = type(value)
+        if value_type is int and -_MAX_EXACT_INT <= value <= _MAX_EXACT_INT:
+            return KIND_INT, value
+        if value_type is float:
+            return KIND_FLOAT, value
+        if value_type is bool:
+            return KIND_BOOL, value
+        if value_type is str:
+            return KIND_STR, self.intern(value)
+        self._objects.append(value)
+        return KIND_OBJECT, len(self._objects) - 1
+
+    def _decode(self, kind: int, value: float) -> Any:
+        if kind == KIND_INT:
+            return int(value)
+        if kind == KIND_FLOAT:
+            return value
+        if kind == KIND_BOOL:
+            return value != 0
+        if kind == KIND_STR:
+            return self.strings[int(value)]
+        if kind == KIND_OBJECT:
+            return self._objects[int(value)]
+        return None
+
+    def append(
+            self,
+            for_id: str,
+            timestamp: SimTime,
+            action: EventAction,
+            values: Tuple[Any, ...]):
+        """
+        Append an event to the log.
+
+        :param for_id: The id of the component the event is for.
+        :param timestamp: The timestamp of the event.
+        :param action: The action of the event.
+        :param values: The argument values of the event, in the order of the
+            argument names of the action.
+        :raises TypeError: If the number of values does not match the number
+            of argument names of the action.
+        """
+        code = ACTION_CODES[action]
+        if len(values) != len(ARG_NAMES[code]):
+            raise TypeError(ErrorText.VALUES_MUST_MATCH_ARG_NAMES)
+        kinds = KIND_INT if type(timestamp) is int else KIND_FLOAT
+        arg0 = arg1 = 0
+        if values:
+            kind, arg0 = self._encode(values[0])
+            kinds |= kind << _ARG0_SHIFT
+            if len(values) > 1:
+                kind, arg1 = self._encode(values[1])
+                kinds |= kind << _ARG1_SHIFT
+        self._for_ids.append(self.intern(for_id))
+        self._actions.append(code)
+        self._timestamps.append(timestamp)
+        self._kinds.append(kinds)
+        self._arg0.append(arg0)
+        self._arg1.append(arg1)
+
+    def _append_raw(
+            self,
+            for_id: str,
+            timestamp: SimTime,
+            code: int,
+            args: Dict[str, Any]):
+        self._objects.append(args)
+        self._for_ids.append(self.intern(for_id))
+        self._actions.append(code)
+        self._timestamps.append(timestamp)
+        self._kinds.append(
+            _RAW_ARGS | (KIND_INT if type(timestamp) is int else KIND_FLOAT))
+        self._arg0.append(len(self._objects) - 1)
+        self._arg1.append(0)
+
+    def append_event(self, event: VisualEvent):
+        """
+        Append an event object to the log.
+
+        :param event: The event to append.
+        """
+        code = _VALUE_CODES[event.action]
+        names = ARG_NAMES[code]
+        if len(names) <= 2 and tuple(event.args) == names:
+            self.append(event.for_id, event.timestamp, ACTIONS[code],
+                        tuple(event.args.values()))
+        else:
+            self._append_raw(event.for_id, event.timestamp, code,
+                             dict(event.args))
+
+    def validate(self, start: int = 0):
+        """
+        Validate the events of the log, starting at the given position.
+
+        Rows are grouped by their action and the kinds of their values, and
+        the event type is constructed once for a representative row of every
+        group. Rows that hold values from the side table are checked one by
+        one.
+
+        :param start: The position of the first event to validate.
+        :raises TypeError: If an event has arguments of the wrong type.
+        """
+        for value in self.strings:
+            if not isinstance(value, str):
+                raise TypeError(ErrorText.ID_MUST_BE_STRING)
+        shapes = list(zip(self._actions[start:], self._kinds[start:]))
+        representatives = dict(zip(shapes, range(start, len(self))))
+        for (code, kinds), index in representatives.items():
+            if not _holds_objects(kinds):
+                self._construct(index)
+                continue
+            for offset, shape in enumerate(shapes):
+                if shape == (code, kinds):
+                    self._construct(start + offset)
+
+    def _construct(self, index: int) -> VisualEvent:
+        for_id, timestamp, action, args = self.record(index)
+        action = EventAction(action)
+        if self._kinds[index] & _RAW_ARGS or action not in EVENT_TYPES:
+            return VisualEvent(for_id, timestamp, action, **args)
+        return EVENT_TYPES[action](for_id, timestamp, *args.values())
+
+    def record(self, index: int) -> Tuple[str, SimTime, str, Dict[str, Any]]:
+        """
+        Get a single event of the log as a tuple.
+
+        :param index: The position of the event in the log.
+        :return: A tuple of id, timestamp, action value and arguments.
+        """
+        kinds = self._kinds[index]
+        code = self._actions[index]
+        timestamp = self._timestamps[index]
+        if kinds & _KIND_MASK == KIND_INT:
+            timestamp = int(timestamp)
+        if kinds & _RAW_ARGS:
+            args = dict(self._objects[int(self._arg0[index])])
+        else:
+            names = ARG_NAMES[code]
+            args = {}
+            if names:
+                args[names[0]] = self._decode(
+                    (kinds >> _ARG0_SHIFT) & _KIND_MASK, self._arg0[index])
+                if len(names) > 1:
+                    args[names[1]] = self._decode(
+                        (kinds >> _ARG1_SHIFT) & _KIND_MASK,
+                        self._arg1[index])
+        return (self.strings[self._for_ids[index]], timestamp,
+                ACTIONS[code].value, args)
+
+    def records(self, start: int = 0) -> Iterator[Record]:
+        """
+        Iterate over the events of the log as tuples.
+
+        :param start: The position of the first event.
+        :return: An iterator of tuples of id, timestamp, action value and
+            arguments.
+        """
+        for index in range(start, len(self)):
+            yield self.record(index)
+
+    def timestamps(self) -> Iterator[SimTime]:
+        return iter(self._timestamps)
+
+    def event(self, index: int) -> VisualEvent:
+        """
+        Get a single event of the log as a
+        :class:`~simplay.events.VisualEvent`.
+
+        :param index: The position of the event in the log.
+        :return: The event.
+        """
+        for_id, timestamp, action, args = self.record(index)
+        event_type = VisualEvent
+        if not self._kinds[index] & _RAW_ARGS:
+            event_type = EVENT_TYPES.get(ACTIONS[self._actions[index]],
+                                         VisualEvent)
+        return _materialize(event_type, for_id, timestamp, action, args)
+
+    def write_events(self, file: TextIO):
+        """
+        Write all events of the log to the given file, as the comma
+        separated items of a JSON array.
+
+        :param file: The file to write to.
+        """
+        separator = ""
+        for line in self.json_records():
+            file.write(separator)
+            file.write(line)
+            separator = ", "
+
+    def json_records(self, start: int = 0) -> Iterator[str]:
+        """
+        Iterate over the events of the log, serialized to JSON.
+
+        The output is the same as that of :func:`dumps_record`, but events
+        are encoded straight from the columns of the log with precomputed
+        templates. Only events that hold values from the side table are
+        passed to :func:`dumps_record`.
+
+        :param start: The position of the first event.
+        :return: An iterator of JSON strings, one per event.
+        """
+        # the string table only grows, so strings are encoded once, even if
+        # the log is streamed in many batches
+        strings = self._encoded_strings
+        strings.extend(encode_basestring_ascii(value)
+                       for value in self.strings[len(strings):])
+        templates = _RECORD_TEMPLATES
+        columns = zip(self._for_ids[start:], self._actions[start:],
+                      self._timestamps[start:], self._kinds[start:],
+                      self._arg0[start:], self._arg1[start:])
+        for index, (for_id, code, timestamp, kinds, arg0, arg1) in enumerate(
+                columns, start):
+            if _holds_objects(kinds):
+                yield dumps_record(*self.record(index))
+                continue
+            head, middle, tail = templates[code]
+            values = []
+            for kind, value in (((kinds >> _ARG0_SHIFT) & _KIND_MASK, arg0),
+                                ((kinds >> _ARG1_SHIFT) & _KIND_MASK, arg1)):
+                if kind == KIND_INT:
+                    values.append(str(int(value)))
+                elif kind == KIND_FLOAT:
+                    values.append(_float_json(value))
+                elif kind == KIND_BOOL:
+                    values.append("true" if value else "false")
+                elif kind == KIND_STR:
+                    values.append(strings[int(value)])
+                else:
+                    values.append("")
+            if kinds & _KIND_MASK == KIND_INT:
+                timestamp = str(int(timestamp))
+            else:
+                timestamp = _float_json(timestamp)
+            yield (f"{head}{values[0]}{middle}{values[1]}{tail}"
+                   f'{strings[for_id]}, "timestamp": {timestamp}}}')
+
+
+class FileSink(EventSink):
+    """
+    Sink that writes events to a file while the simulation runs.
+
+    Events are collected in a small :class:`EventLog` and written to the file
+    as newline-delimited JSON whenever the buffer is full, so the memory
+    held by the sink does not grow with the length of the simulation.
+    Buffered events are validated before they are written.
+
+    Events that have already been written are read back from the file when
+    they are accessed, which makes random access slow. Iterating over the
+    events reads the file once.
+
+    :param path: The path of the file to write to. An existing file is
+        overwritten.
+    :param buffer_size: The number of events kept in memory before they are
+        written to the file.
+    """
+
+    def __init__(self, path: str, buffer_size: int = 4096):
+        self.path = path
+        """
+        The path of the file the events are written to.
+        """
+        self.buffer_size = buffer_size
+        """
+        The number of events kept in memory before they are written.
+        """
+        self._buffer = EventLog()
+        self._written = 0
+        # the number of lines and the byte offset the last read stopped at
+        self._read_until = (0, 0)
+        self._file = open(path, "w")
+
+    def __len__(self) -> int:
+        return self._written + len(self._buffer)
+
+    def append(
+            self,
+            for_id: str,
+            timestamp: SimTime,
+            action: EventAction,
+            values: Tuple[Any, ...]):
+        self._buffer.append(for_id, timestamp, action, values)
+        if len(self._buffer) >= self.buffer_size:
+            self.flush()
+
+    def append_event(self, event: VisualEvent):
+        self._buffer.append_event(event)
+        if len(self._buffer) >= self.buffer_size:
+            self.flush()
+
+    def flush(self):
+        """
+        Validate the buffered events and write them to the file.
+
+        :raises TypeError: If an event has arguments of the wrong type.
+        """
+        if not len(self._buffer):
+            return
+        self._buffer.validate()
+        for line in self._buffer.json_records():
+            self._file.write(line)
+            self._file.write("\n")
+        self._file.flush()
+        self._written += len(self._buffer)
+        self._buffer = EventLog()
+
+    def validate(self, start: int = 0):
+        self._buffer.validate(max(0, start - self._written))
+
+    def event(self, index: int) -> VisualEvent:
+        if index >= self._written:
+            return self._buffer.event(index - self._written)
+        for position, event in enumerate(self.events()):
+            if position == index:
+                return event
+
+    def events(self) -> Iterator[VisualEvent]:
+        with open(self.path) as file:
+            for line, _ in zip(file, range(self._written)):
+                yield self._parse(line)
+        yield from self._buffer.events()
+
+    def _parse(self, line: str) -> VisualEvent:
+        data = json.loads(line)
+        action = data["action"]
+        args = data["args"]
+        code = _VALUE_CODES[action]
+        event_type = VisualEvent
+        if tuple(args) == _CAMEL_ARG_NAMES[code]:
+            args = dict(zip(ARG_NAMES[code], args.values()))
+            event_type = EVENT_TYPES.get(ACTIONS[code], VisualEvent)
+        return _materialize(
+            event_type, data["forId"], data["timestamp"], action, args)
+
+    def records(self, start: int = 0) -> Iterator[Record]:
+        for line in self._lines(start):
+            event = self._parse(line)
+            yield event.for_id, event.timestamp, event.action, event.args
+        yield from self._buffer.records(max(0, start - self._written))
+
+    def json_records(self, start: int = 0) -> Iterator[str]:
+        self.flush()
+        yield from self._lines(start)
+
+    def _lines(self, start: int) -> Iterator[str]:
+        """
+        Iterate over the written lines from the given position, starting at
+        the end of the previous read if it is not after the position.
+        """
+        index, offset = self._read_until
+        if start < index:
+            index, offset = 0, 0
+        with open(self.path, "rb") as source:
+            source.seek(offset)
+            while index < self._written:
+                line = source.readline()
+                index += 1
+                offset += len(line)
+                self._read_until = (index, offset)
+                if index > start:
+                    yield line.decode("utf-8").rstrip("\r\n")
+
+    def write_events(self, file: TextIO):
+        self.flush()
+        separator = ""
+        with open(self.path) as source:
+            for line in source:
+                file.write(separator)
+                file.write(line.rstrip("\n"))
+                separator = ", "
+
+    def close(self):
+        """
+        Write the buffered events and close the file.
+        """
+        if not self._file.closed:
+            self.flush()
+            self._file.close()
+
+
+class EventLogView(Sequence):
+    """
+    Read-only, lazy view of an :class:`~simplay.eventlog.EventSink`.
+
+    Events are materialized as :class:`~simplay.events.VisualEvent` objects
+    only when they are accessed.
+
+    :param log: The sink to view.
+    """
+
+    def __init__(self, log: EventSink):
+        self._log = log
+
+    def __len__(self) -> int:
+        return len(self._log)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self._log.event(i)
+                    for i in range(*index.indices(len(self._log)))]
+        if index < 0:
+            index += len(self._log)
+        if not 0 <= index < len(self._log):
+            raise IndexError("event index out of range")
+        return self._log.event(index)
+
+    def __iter__(self) -> Iterator[VisualEvent]:
+        return self._log.events()
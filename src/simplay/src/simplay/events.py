@@ -18,6 +18,21 @@ class VisualEvent:
     :raises TypeError: If action is not a string.
     """
 
+    ACTION = None
+    """
+    The :class:`~simplay.primitives.EventAction` of this event type.
+    """
+    ARG_NAMES = ()
+    """
+    The names of the arguments of this event type, in constructor order.
+    """
+    CONVERTS_ARGS = False
+    """
+    Whether the constructor converts the arguments, in which case events of
+    this type are always constructed when recorded, even without
+    validation.
+    """
+
     def __init__(
             self,
             for_id: str,
@@ -35,6 +50,18 @@ class VisualEvent:
         self.action = action.value
         self.args = kwargs
 
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, VisualEvent):
+            return NotImplemented
+        return (self.for_id == other.for_id
+                and self.timestamp == other.timestamp
+                and self.action == other.action
+                and self.args == other.args)
+
+    def __repr__(self) -> str:
+        return (f"{type(self).__name__}({self.for_id!r}, {self.timestamp!r},"
+                f" {self.action!r}, {self.args!r})")
+
 
 class SetVisible(VisualEvent):
     """
@@ -46,6 +73,9 @@ class SetVisible(VisualEvent):
     :raises TypeError: If visible is not a boolean.
     """
 
+    ACTION = EventAction.SET_VISIBLE
+    ARG_NAMES = ("visible",)
+
     def __init__(self, for_id: str,
                  timestamp: SimTime, visible: bool):
         if not isinstance(visible, bool):
@@ -66,6 +96,9 @@ class SetPosition(VisualEvent):
     :raises TypeError: If y is not an integer.
     """
 
+    ACTION = EventAction.SET_POSITION
+    ARG_NAMES = ("x", "y")
+
     def __init__(self, for_id: str,
                  timestamp: SimTime, x: int, y: int):
         if not isinstance(x, int):
@@ -87,6 +120,9 @@ class SetInteracting(VisualEvent):
     :raises TypeError: If with_id is not a string.
     """
 
+    ACTION = EventAction.SET_INTERACTING
+    ARG_NAMES = ("with_id",)
+
     def __init__(self, for_id: str,
                  timestamp: SimTime, with_id: str):
         if not isinstance(with_id, str):
@@ -106,6 +142,9 @@ class SetNotInteracting(VisualEvent):
     :raises TypeError: If with_id is not a string.
     """
 
+    ACTION = EventAction.SET_NOT_INTERACTING
+    ARG_NAMES = ("with_id",)
+
     def __init__(self, for_id: str,
                  timestamp: SimTime, with_id: str):
         if not isinstance(with_id, str):
@@ -125,6 +164,9 @@ class MoveNear(VisualEvent):
     :raises TypeError: If target_id is not a string.
     """
 
+    ACTION = EventAction.MOVE_NEAR
+    ARG_NAMES = ("target_id",)
+
     def __init__(self, for_id: str,
                  timestamp: SimTime, target_id: str):
         if not isinstance(target_id, str):
@@ -145,6 +187,9 @@ class MoveNearCell(VisualEvent):
     :raises TypeError: If y is not an integer.
     """
 
+    ACTION = EventAction.MOVE_NEAR_CELL
+    ARG_NAMES = ("x", "y")
+
     def __init__(self, for_id: str,
                  timestamp: SimTime, x: int, y: int):
         if not isinstance(x, int):
@@ -169,6 +214,9 @@ class SetTintColor(VisualEvent):
     :raises TypeError: If color is not a string.
     """
 
+    ACTION = EventAction.SET_TINT_COLOR
+    ARG_NAMES = ("color",)
+
     def __init__(self, for_id: str,
                  timestamp: SimTime, color: int):
         if not isinstance(color, int):
@@ -187,6 +235,9 @@ class SetDecoratingText(VisualEvent):
     :raises TypeError: If text is not a string.
     """
 
+    ACTION = EventAction.SET_DECORATING_TEXT
+    ARG_NAMES = ("text",)
+
     def __init__(self, for_id: str,
                  timestamp: SimTime, text: str):
         if not isinstance(text, str):
@@ -205,6 +256,9 @@ class SetSpriteFrame(VisualEvent):
     :raises TypeError: If frame is not an integer.
     """
 
+    ACTION = EventAction.SET_SPRITE_FRAME
+    ARG_NAMES = ("frame",)
+
     def __init__(self, for_id: str,
                  timestamp: SimTime, frame: int):
         if not isinstance(frame, int):
@@ -223,6 +277,9 @@ class ResourceSetCapacity(VisualEvent):
     :raises TypeError: If capacity is not a positive integer.
     """
 
+    ACTION = EventAction.RESOURCE_SET_CAPACITY
+    ARG_NAMES = ("capacity",)
+
     def __init__(self, for_id: str,
                  timestamp: SimTime, capacity: int):
         if not isinstance(capacity, int):
@@ -242,6 +299,9 @@ class ResourceSetUtilization(VisualEvent):
     :raises TypeError: If utilization is not a integer.
     """
 
+    ACTION = EventAction.RESOURCE_SET_UTILIZATION
+    ARG_NAMES = ("utilization",)
+
     def __init__(self, for_id: str,
                  timestamp: SimTime, utilization: int):
         if not isinstance(utilization, int):
@@ -263,6 +323,9 @@ class ContainerSetCapacity(VisualEvent):
     :raises TypeError: If capacity is not a positive integer.
     """
 
+    ACTION = EventAction.CONTAINER_SET_CAPACITY
+    ARG_NAMES = ("capacity",)
+
     def __init__(self, for_id: str,
                  timestamp: SimTime, capacity: Union[int, float]):
         if not isinstance(capacity, int) and not isinstance(capacity, float):
@@ -282,6 +345,9 @@ class ContainerSetLevel(VisualEvent):
     :raises TypeError: If level is not a positive integer or float.
     """
 
+    ACTION = EventAction.CONTAINER_SET_LEVEL
+    ARG_NAMES = ("level",)
+
     def __init__(
             self,
             for_id: str,
@@ -303,6 +369,9 @@ class StoreSetCapacity(VisualEvent):
     :raises TypeError: If capacity is not a positive integer or float.
     """
 
+    ACTION = EventAction.STORE_SET_CAPACITY
+    ARG_NAMES = ("capacity",)
+
     def __init__(self, for_id: str, timestamp: SimTime,
                  capacity: Union[float, int]):
         if not isinstance(capacity, (float, int)):
@@ -320,9 +389,78 @@ class StoreSetContent(VisualEvent):
     :param content: The content to set the store to. Must be JSON serializable.
     """
 
+    ACTION = EventAction.STORE_SET_CONTENT
+    ARG_NAMES = ("content",)
+    CONVERTS_ARGS = True
+
     def __init__(self, for_id: str,
                  timestamp: SimTime, content):
         content = jsons.dumps(content, strip_privates=True,
                               key_transformer=jsons.KEY_TRANSFORMER_CAMELCASE)
         super().__init__(for_id, timestamp, EventAction.STORE_SET_CONTENT,
                          content=content)
+
+
+class StoreUpdateContent(VisualEvent):
+    """
+    Event to update the content of a store incrementally.
+
+    Every item in a store is identified by a key that stays the same while
+    the item is in the store. Instead of the whole content, the event only
+    holds the items that were added to and the keys of the items that were
+    removed from the store. The items that remain in the store keep their
+    order, added items are appended after them.
+
+    :param for_id: The if of the component this event is for.
+    :param timestamp: The timestamp of the event.
+    :param added: A JSON array of ``[key, item]`` pairs, the items that were
+        added to the store.
+    :param removed: A JSON array of the keys of the items that were removed
+        from the store, or :attr:`REMOVE_ALL` to remove all items before the
+        added ones are inserted, which makes the event a snapshot of the
+        whole content.
+    :raises TypeError: If added is not a string.
+    :raises TypeError: If removed is not a string.
+    """
+
+    ACTION = EventAction.STORE_UPDATE_CONTENT
+    ARG_NAMES = ("added", "removed")
+    REMOVE_ALL = "*"
+    """
+    The value of ``removed`` that removes all items from the store.
+    """
+
+    def __init__(self, for_id: str, timestamp: SimTime, added: str,
+                 removed: str):
+        if not isinstance(added, str):
+            raise TypeError(ErrorText.ADDED_MUST_BE_STRING)
+        if not isinstance(removed, str):
+            raise TypeError(ErrorText.REMOVED_MUST_BE_STRING)
+        super().__init__(for_id, timestamp, EventAction.STORE_UPDATE_CONTENT,
+                         added=added, removed=removed)
+
+
+EVENT_TYPES = {
+    event_type.ACTION: event_type
+    for event_type in (
+        SetVisible,
+        SetPosition,
+        SetInteracting,
+        SetNotInteracting,
+        MoveNear,
+        MoveNearCell,
+        SetTintColor,
+        SetDecoratingText,
+        SetSpriteFrame,
+        ResourceSetCapacity,
+        ResourceSetUtilization,
+        ContainerSetCapacity,
+        ContainerSetLevel,
+        StoreSetCapacity,
+        StoreSetContent,
+        StoreUpdateContent,
+    )
+}
+"""
+Maps every :class:`~simplay.primitives.EventAction` to its event type.
+"""
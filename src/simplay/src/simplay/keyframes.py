@@ -0,0 +1,152 @@
+"""
+Keyframes let the player seek without replaying a visualization from the
+start.
+
+A keyframe holds the state of all entities at the start of a step, as the
+smallest list of events that recreates it: for every entity the last event
+that set its visibility, position, tint, frame, text, capacity, level or
+content, the whole content of stores and the interactions that are active.
+To seek to a step, the player resets all entities, executes the events of
+the last keyframe before the step and replays only the steps in between.
+"""
+import json
+import math
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List, Tuple
+
+import jsons
+from simpy.core import SimTime
+
+from .eventlog import Record, _dump_value
+from .events import StoreUpdateContent
+from .primitives import EventAction
+
+_SLOTS = {
+    EventAction.SET_VISIBLE.value: "visible",
+    EventAction.SET_POSITION.value: "position",
+    EventAction.MOVE_NEAR.value: "position",
+    EventAction.MOVE_NEAR_CELL.value: "position",
+    EventAction.SET_TINT_COLOR.value: "tint",
+    EventAction.SET_SPRITE_FRAME.value: "frame",
+    EventAction.SET_DECORATING_TEXT.value: "text",
+    EventAction.RESOURCE_SET_CAPACITY.value: "capacity",
+    EventAction.CONTAINER_SET_CAPACITY.value: "capacity",
+    EventAction.STORE_SET_CAPACITY.value: "capacity",
+    EventAction.RESOURCE_SET_UTILIZATION.value: "level",
+    EventAction.CONTAINER_SET_LEVEL.value: "level",
+    EventAction.STORE_SET_CONTENT.value: "content",
+}
+_INTERACTION_ACTIONS = (EventAction.SET_INTERACTING.value,
+                        EventAction.SET_NOT_INTERACTING.value)
+
+
+_camel_case = lru_cache(maxsize=None)(jsons.KEY_TRANSFORMER_CAMELCASE)
+
+
+def step_of(timestamp: SimTime) -> int:
+    """
+    Get the step of the player a timestamp belongs to.
+
+    The player rounds timestamps half up, unlike :func:`round`.
+
+    :param timestamp: The timestamp of an event.
+    :return: The step.
+    """
+    return math.floor(timestamp + 0.5)
+
+
+def _in_step_order(records: Iterable[Record]) -> List[Tuple[int, Record]]:
+    # the player executes the events step by step, in the order they were
+    # recorded within a step
+    records = list(enumerate(records))
+    steps = [step_of(record[1]) for _, record in records]
+    if any(a > b for a, b in zip(steps, steps[1:])):
+        records.sort(key=lambda item: steps[item[0]])
+    return records
+
+
+class _State:
+    """
+    The state of all entities, as the events that last changed each part of
+    it, keyed by the position of the event.
+    """
+
+    def __init__(self):
+        self.slots: Dict[Tuple, Tuple[int, Record]] = {}
+        self.items: Dict[str, Dict[int, Any]] = {}
+
+    def apply(self, index: int, record: Record):
+        for_id, _, action, args = record
+        slot = _SLOTS.get(action)
+        if slot is not None:
+            self.slots[(for_id, slot)] = (index, record)
+        elif action in _INTERACTION_ACTIONS:
+            self.slots[(for_id, "interaction", args["with_id"])] = (
+                index, record)
+        elif action == EventAction.STORE_UPDATE_CONTENT.value:
+            self.__update_content(index, record)
+
+    def __update_content(self, index: int, record: Record):
+        for_id, _, _, args = record
+        items = self.items.setdefault(for_id, {})
+        if args["removed"] == StoreUpdateContent.REMOVE_ALL:
+            items.clear()
+        else:
+            for key in json.loads(args["removed"]):
+                items.pop(key, None)
+        for key, item in json.loads(args["added"]):
+            items[key] = item
+        self.slots[(for_id, "items")] = (index, record)
+
+    def events(self) -> List[Dict[str, Any]]:
+        """
+        Get the events that recreate the state, in the order they were
+        recorded.
+        """
+        events = []
+        for index, (for_id, timestamp, action, args) in sorted(
+                self.slots.values(), key=lambda item: item[0]):
+            if action == EventAction.SET_NOT_INTERACTING.value:
+                continue
+            if action == EventAction.STORE_UPDATE_CONTENT.value:
+                # replaces the content of the store at once
+                args = {
+                    "added": json.dumps(list(self.items[for_id].items())),
+                    "removed": StoreUpdateContent.REMOVE_ALL,
+                }
+            events.append({
+                "action": action,
+                "args": {_camel_case(name): _dump_value(value)
+                         for name, value in args.items()},
+                "forId": for_id,
+                "timestamp": timestamp,
+            })
+        return events
+
+
+def keyframes(
+        records: Iterable[Record],
+        interval: int) -> List[Dict[str, Any]]:
+    """
+    Compute the keyframes of a visualization.
+
+    :param records: The events as tuples of id, timestamp, action value and
+        arguments, see :meth:`~simplay.eventlog.EventSink.records`.
+    :param interval: The number of steps between two keyframes.
+    :return: The keyframes, each with its ``step`` and the ``events`` that
+        recreate the state at the start of the step. Steps without any
+        events since the previous keyframe get no keyframe.
+    """
+    state = _State()
+    frames = []
+    next_step = interval
+    for index, record in _in_step_order(records):
+        step = step_of(record[1])
+        if step >= next_step:
+            # the state did not change since the last multiple of the
+            # interval before this step, one keyframe covers the gap
+            frame_step = step - step % interval
+            frames.append({"step": frame_step, "events": state.events()})
+            next_step = frame_step + interval
+        state.apply(index, record)
+    return frames
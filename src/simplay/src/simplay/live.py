@@ -0,0 +1,138 @@
+"""
+Stream a visualization to the Jupyter player while the simulation runs.
+
+The stream is a single output of the notebook that is updated with
+``update_display_data`` messages, so no kernel extension is needed. Every
+update carries a ``live`` entry with the ``id`` of the stream and a
+``sequence`` number:
+
+* The first update is the whole visualization so far, as the JSON output of
+  :meth:`~simplay.core.VisualizationManager.serialize`, and ``until`` the
+  first step that is not complete yet.
+* Every further update only holds the ``events`` recorded since the
+  previous one, ordered as they were recorded, and the new ``until``.
+* The last update is the whole visualization again, with ``done`` set and
+  the number of events that were ``streamed`` before it. The player appends
+  the remaining events, and the notebook keeps the complete visualization.
+
+Components and visuals have to be created before the stream starts, events
+after it are streamed. Events recorded with timestamps before the events
+that were already streamed are only shown once the stream is done.
+"""
+import json
+import time
+import uuid
+from typing import TYPE_CHECKING, Any, Dict
+
+from .keyframes import step_of
+from .primitives import SimplayConsts
+
+if TYPE_CHECKING:
+    from .core import VisualizationManager
+
+
+class LiveDisplay:
+    """
+    Streams the events of a visualization to the Jupyter player in batches
+    while the simulation runs.
+
+    Use it as a context manager around running the simulation, see
+    :meth:`~simplay.core.VisualizationManager.live`. Requires IPython.
+
+    :param manager: The visualization to stream.
+    :param interval: The minimum number of seconds between two updates.
+    """
+
+    def __init__(
+            self,
+            manager: "VisualizationManager",
+            interval: float = 0.5):
+        self.manager = manager
+        """
+        The visualization that is streamed.
+        """
+        self.interval = interval
+        """
+        The minimum number of seconds between two updates.
+        """
+        self.display_id = uuid.uuid4().hex
+        """
+        The id of the output that is updated, also the id of the stream.
+        """
+        self.sequence = 0
+        """
+        The sequence number of the next update.
+        """
+        self.streamed = 0
+        """
+        The number of events sent to the player.
+        """
+        self._until = 0
+        self._last_update = 0.0
+
+    def __enter__(self) -> "LiveDisplay":
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.finish()
+
+    def start(self):
+        """
+        Display the visualization so far and stream the events recorded
+        from now on.
+        """
+        data = json.loads(self.manager.serialize())
+        self.streamed = len(data["events"])
+        self.__advance_until(data["events"])
+        self.__publish(data)
+        self.manager._streams.append(self)
+
+    def poll(self):
+        """
+        Send the events recorded since the last update, if the last update
+        is at least :attr:`interval` seconds ago. Called by the manager
+        whenever an event is recorded.
+        """
+        if time.monotonic() - self._last_update >= self.interval:
+            self.flush()
+
+    def flush(self):
+        """
+        Send the events recorded since the last update.
+        """
+        if len(self.manager.sink) == self.streamed:
+            return
+        events = [json.loads(record) for record in
+                  self.manager.sink.json_records(self.streamed)]
+        self.streamed += len(events)
+        self.__advance_until(events)
+        self.__publish({"events": events})
+
+    def finish(self):
+        """
+        Stop streaming and replace the output with the complete
+        visualization.
+        """
+        self.manager._streams.remove(self)
+        data = json.loads(self.manager.serialize())
+        self.__publish(data, done=True)
+
+    def __advance_until(self, events):
+        # later events may still be recorded at the step of the latest event
+        if events:
+            latest = max(event["timestamp"] for event in events)
+            self._until = max(self._until, step_of(latest))
+
+    def __publish(self, data: Dict[str, Any], done: bool = False):
+        from IPython.display import display
+        live = {"id": self.display_id, "sequence": self.sequence}
+        if done:
+            live.update(done=True, streamed=self.streamed)
+        else:
+            live["until"] = self._until
+        data["live"] = live
+        display({SimplayConsts.JUPYTERLAB_MIMETYPE: data}, raw=True,
+                display_id=self.display_id, update=self.sequence > 0)
+        self.sequence += 1
+        self._last_update = time.monotonic()
@@ -3,6 +3,13 @@ from enum import Enum
 
 class SimplayConsts:
     JUPYTERLAB_MIMETYPE = "application/simplay+json"
+    JUPYTERLAB_GZIP_MIMETYPE = "application/simplay+gzip"
+
+
+class Compression(Enum):
+    """Enum for the compression of written visualizations."""
+    GZIP = "gzip"
+    XZ = "xz"
 
 
 class ComponentType(Enum):
@@ -54,6 +61,11 @@ class ErrorText:
     FRAMES_MUST_NOT_BE_EMPTY = "Frames must not be empty."
     GRID_MUST_NOT_BE_NONE = "Grid must not be None."
     GRID_MUST_BE_VISUAL_GRID = "Grid must be of type VisualGrid."
+    CACHE_MUST_BE_DISK_CACHE = "Cache must be of type DiskCache."
+    CACHED_PARAMS_MUST_BE_JSON = ("Parameters of a cached sweep must be"
+                                  " JSON serializable.")
+    DIRECTORY_MUST_BE_STRING = "Directory must be a string."
+    MAX_SIZE_MUST_BE_POSITIVE_INT = "Max size must be a positive integer."
     NAME_MUST_BE_STRING = "Name must be a string."
     HEIGHT_MUST_BE_POSITIVE_INT = "Height must be a positive integer."
     WIDTH_MUST_BE_POSITIVE_INT = "Width must be a positive integer."
@@ -64,6 +76,20 @@ class ErrorText:
                                       " (id, amount).")
     RESOURCE_ID_MUST_BE_STR = "Resource id must be a string."
     AMOUNT_MUST_BE_INT_OR_FLOAT = ("Amount must be a integer or float.")
+    ADDED_MUST_BE_STRING = "Added items must be a JSON string."
+    REMOVED_MUST_BE_STRING = "Removed keys must be a JSON string."
+    INVALID_BINARY_FORMAT = "Data is not a binary SimPlay visualization."
+    KEYFRAME_INTERVAL_MUST_BE_POSITIVE_INT = ("Keyframe interval must be a"
+                                              " positive integer.")
+    CHUNK_STEPS_MUST_BE_POSITIVE_INT = ("Chunk steps must be a positive"
+                                        " integer.")
+    RECORDED_SEEDS_MUST_BE_REPLICATED = ("Recorded seeds must be among the"
+                                         " replicated seeds.")
+    INVALID_COMPRESSION = "Compression must be of type Compression."
+    JUPYTER_COMPRESSION_MUST_BE_GZIP = ("Jupyter only supports GZIP"
+                                        " compression.")
+    VALUES_MUST_MATCH_ARG_NAMES = ("Number of values must match the argument"
+                                   " names of the action.")
 
 
 class EventAction(Enum):
@@ -83,3 +109,4 @@ class EventAction(Enum):
     STORE_SET_CONTENT = "STORE.SET_CONTENT"
     STORE_SET_CAPACITY = "STORE.SET_CAPACITY"
     CONTAINER_SET_LEVEL = "CONTAINER.SET_LEVEL"
+    STORE_UPDATE_CONTENT = "STORE.UPDATE_CONTENT"
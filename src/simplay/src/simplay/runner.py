@@ -0,0 +1,257 @@
+"""
+Run many replications of a model at once, one per seed, in a pool of
+processes.
+
+A model is a function ``model(env, seed, params)`` that creates the
+processes and components of one replication in ``env``. Whatever it returns
+is the summary of the replication, taken after the run, so a model can
+return a dictionary its processes fill with statistics while the simulation
+runs. Models, parameters and summaries are sent between processes, so they
+must be picklable: define models at the top level of a module.
+
+Only the replications whose seeds are recorded keep their visualization.
+All others run with a disabled
+:class:`~simplay.core.VisualizationManager`, at about the speed of plain
+simpy, and do not send any events back to the parent process.
+
+:func:`sweep` runs the replications for every combination of parameters
+and can keep their results in a :class:`~simplay.cache.DiskCache`, so
+configurations that were run before are not run again.
+"""
+import hashlib
+import inspect
+import itertools
+import json
+import marshal
+import pickle
+from concurrent.futures import ProcessPoolExecutor
+from typing import (Any, Callable, Dict, Iterable, List, Optional, Sequence,
+                    Tuple)
+
+from simpy.core import SimTime
+
+from .cache import DiskCache
+from .core import VisualEnvironment, VisualizationManager
+from .primitives import ErrorText
+
+Model = Callable[[VisualEnvironment, int, Any], Any]
+
+
+class Replication:
+    """
+    The result of a single replication.
+
+    :param seed: The seed of the replication.
+    :param summary: What the model returned.
+    :param recording: The visualization, if the seed was recorded.
+    :param params: The parameters passed to the model.
+    """
+
+    def __init__(
+            self,
+            seed: int,
+            summary: Any,
+            recording: Optional[VisualizationManager] = None,
+            params: Any = None):
+        self.seed = seed
+        """
+        The seed of the replication.
+        """
+        self.params = params
+        """
+        The parameters passed to the model.
+        """
+        self.summary = summary
+        """
+        What the model returned, after the run.
+        """
+        self.recording = recording
+        """
+        The visualization of the replication, or ``None`` if its seed was not
+        recorded.
+        """
+
+
+def run_replication(
+        model: Model,
+        seed: int,
+        params: Any = None,
+        until: SimTime = None,
+        record: bool = False,
+        validate: bool = True) -> Replication:
+    """
+    Run a single replication in the current process.
+
+    :param model: The model, see :mod:`simplay.runner`.
+    :param seed: The seed of the replication.
+    :param params: The parameters passed to the model.
+    :param until: When the simulation stops, see :meth:`simpy.Environment.run`.
+    :param record: Whether to keep the visualization of the replication.
+    :param validate: Whether to validate events as they are recorded.
+    :return: The result of the replication.
+    """
+    env = VisualEnvironment(validate=validate, enabled=record)
+    summary = model(env, seed, params)
+    env.run(until)
+    return Replication(
+        seed, summary, env.visualization_manager if record else None, params)
+
+
+Job = Tuple[Model, int, Any, SimTime, bool, bool]
+
+
+def _run(job: Job) -> Replication:
+    return run_replication(*job)
+
+
+def _run_all(
+        jobs: Sequence[Job],
+        max_workers: Optional[int],
+        chunksize: int) -> List[Replication]:
+    if max_workers == 1 or not jobs:
+        return [_run(job) for job in jobs]
+    with ProcessPoolExecutor(max_workers) as executor:
+        return list(executor.map(_run, jobs, chunksize=chunksize))
+
+
+def run_replications(
+        model: Model,
+        seeds: Iterable[int],
+        params: Any = None,
+        until: SimTime = None,
+        record: Iterable[int] = (),
+        max_workers: int = None,
+        chunksize: int = 1,
+        validate: bool = True) -> List[Replication]:
+    """
+    Run a replication of a model for every seed, in a pool of processes.
+
+    :param model: The model, see :mod:`simplay.runner`.
+    :param seeds: The seeds of the replications, e.g. ``range(1000)``.
+    :param params: The parameters passed to the model in every replication.
+    :param until: When the simulations stop, see
+        :meth:`simpy.Environment.run`.
+    :param record: The seeds whose visualization is kept and returned.
+    :param max_workers: The number of processes, by default the number of
+        processors. With ``1``, the replications run in the current process.
+    :param chunksize: The number of replications sent to a process at once.
+        Raise it for many short replications.
+    :param validate: Whether to validate events as they are recorded.
+    :return: The results of the replications, in the order of the seeds.
+    :raises ValueError: If a recorded seed is not replicated.
+    """
+    seeds = list(seeds)
+    record = set(record)
+    if not record.issubset(seeds):
+        raise ValueError(ErrorText.RECORDED_SEEDS_MUST_BE_REPLICATED)
+    jobs = [(model, seed, params, until, seed in record, validate)
+            for seed in seeds]
+    return _run_all(jobs, max_workers, chunksize)
+
+
+def _model_digest(model: Model) -> str:
+    try:
+        code = inspect.getsource(model).encode("utf-8")
+    except (OSError, TypeError):
+        # e.g. defined in an interactive session without source
+        code = marshal.dumps(model.__code__)
+    name = f"{model.__module__}.{model.__qualname__}".encode("utf-8")
+    return hashlib.sha256(name + b"\n" + code).hexdigest()
+
+
+def _cache_key(model_digest: str, job: Job) -> str:
+    _, seed, params, until, record, validate = job
+    try:
+        params = json.dumps(params, sort_keys=True)
+    except TypeError:
+        # e.g. objects whose repr holds their address would never be found
+        # in the cache again
+        raise TypeError(ErrorText.CACHED_PARAMS_MUST_BE_JSON) from None
+    return (f"sweep:{model_digest}:{params}:{seed}:{until}:{record}"
+            f":{validate}")
+
+
+def grid(**values: Iterable[Any]) -> List[Dict[str, Any]]:
+    """
+    Get every combination of parameter values.
+
+    :param values: The values of every parameter.
+    :return: A dictionary of parameters for every combination, the last
+        parameter varying fastest.
+    """
+    names = list(values)
+    return [dict(zip(names, combination))
+            for combination in itertools.product(*values.values())]
+
+
+def sweep(
+        model: Model,
+        points: Iterable[Any],
+        seeds: Iterable[int],
+        until: SimTime = None,
+        record: Iterable[int] = (),
+        cache: DiskCache = None,
+        max_workers: int = None,
+        chunksize: int = 1,
+        validate: bool = True) -> List[Replication]:
+    """
+    Run a replication of a model for every combination of parameters and
+    seed, in a pool of processes.
+
+    With a cache, the result of every replication is stored under a hash of
+    the source of the model, the parameters, the seed and the other
+    arguments. Replications whose results are in the cache are not run
+    again, and only the remaining ones are sent to the pool. Changing the
+    model invalidates its results, changing functions it calls does not.
+    Parameters are hashed as JSON, so with a cache they must consist of JSON
+    values only: dictionaries with string keys, lists, tuples, strings,
+    numbers, booleans and ``None``. Pass anything else, such as a
+    distribution function, as the name of a choice the model looks up.
+
+    :param model: The model, see :mod:`simplay.runner`.
+    :param points: The parameters of every point of the sweep, e.g.
+        ``grid(pumps=[1, 2, 3], arrival_rate=[0.5, 1.0])``.
+    :param seeds: The seeds replicated for every point.
+    :param until: When the simulations stop, see
+        :meth:`simpy.Environment.run`.
+    :param record: The seeds whose visualization is kept and returned, for
+        every point.
+    :param cache: The cache for the results, by default nothing is cached.
+    :param max_workers: The number of processes, see
+        :func:`run_replications`.
+    :param chunksize: The number of replications sent to a process at once.
+    :param validate: Whether to validate events as they are recorded.
+    :return: The results of the replications, grouped by point in the
+        order of the points and in the order of the seeds within a point.
+    :raises TypeError: If the cache is not a
+        :class:`~simplay.cache.DiskCache`.
+    :raises TypeError: If there is a cache and the parameters are not JSON
+        serializable.
+    :raises ValueError: If a recorded seed is not replicated.
+    """
+    if cache is not None and not isinstance(cache, DiskCache):
+        raise TypeError(ErrorText.CACHE_MUST_BE_DISK_CACHE)
+    seeds = list(seeds)
+    record = set(record)
+    if not record.issubset(seeds):
+        raise ValueError(ErrorText.RECORDED_SEEDS_MUST_BE_REPLICATED)
+    jobs = [(model, seed, params, until, seed in record, validate)
+            for params in points for seed in seeds]
+    results: List[Optional[Replication]] = [None] * len(jobs)
+    keys: List[Optional[str]] = [None] * len(jobs)
+    if cache is not None:
+        model_digest = _model_digest(model)
+        for index, job in enumerate(jobs):
+            keys[index] = _cache_key(model_digest, job)
+            cached = cache.get(keys[index])
+            if cached is not None:
+                results[index] = pickle.loads(cached)
+    missing = [index for index, result in enumerate(results)
+               if result is None]
+    computed = _run_all([jobs[index] for index in missing],
+                        max_workers, chunksize)
+    for index, result in zip(missing, computed):
+        results[index] = result
+        if cache is not None:
+            cache.put(keys[index], pickle.dumps(result))
+    return results
@@ -0,0 +1,491 @@
+"""
+Serve a visualization to the browser while the simulation runs.
+
+The :class:`VisualizationServer` runs an HTTP server in a background thread.
+It serves the files of the player from a directory and broadcasts the
+events of the visualization to every player connected to the WebSocket at
+``/events``. Every message is a JSON object with a ``type``:
+
+* ``state``: The ``header`` with the ``entities``, ``visuals``, ``assets``
+  and ``grid`` of the visualization, the ``events`` that recreate the
+  current state of all entities, as the events of a keyframe, see
+  :mod:`simplay.keyframes`, and ``until``, the first step whose events may
+  still follow. It is the first message of every connection.
+* ``events``: The ``events`` recorded since the previous message and the new
+  ``until``.
+
+A player that falls behind, because its connection cannot keep up with the
+events, does not get the backlog of events. Once more than ``max_pending``
+messages wait for it, they are dropped and it gets a single ``state``
+message with the current state instead, so a slow player never slows down
+the simulation nor makes the server buffer an unbounded number of events.
+If entities or visuals are added while the simulation runs, every player
+gets a new ``state`` message.
+
+Only the standard library is used: the server implements the parts of the
+WebSocket protocol (RFC 6455) the player needs. Browsers may only connect
+to the WebSocket from pages served by the server itself, and frames larger
+than the control frames the player sends close the connection.
+"""
+import asyncio
+import base64
+import hashlib
+import json
+import mimetypes
+import os
+import struct
+import threading
+from collections import deque
+from typing import TYPE_CHECKING, Deque, Optional, Set, Tuple
+from urllib.parse import urlsplit
+
+import jsons
+
+from .eventlog import dumps_record
+from .keyframes import _State, step_of
+
+if TYPE_CHECKING:
+    from .core import VisualizationManager
+
+_WEBSOCKET_GUID = "258EAFA5-E914-47DA-95CA-C5AB0DC85B11"
+_OPCODE_TEXT = 0x1
+_OPCODE_CLOSE = 0x8
+_OPCODE_PING = 0x9
+_OPCODE_PONG = 0xA
+_MAX_REQUEST_SIZE = 16 * 1024
+# the player only sends control frames, which carry at most 125 bytes
+_MAX_FRAME_SIZE = 4 * 1024
+_CLOSE_MESSAGE_TOO_BIG = 1009
+
+
+class _FrameTooLarge(Exception):
+    pass
+
+
+def _frame(opcode: int, payload: bytes) -> bytes:
+    # frames of the server are never masked
+    length = len(payload)
+    if length < 126:
+        header = struct.pack("!BB", 0x80 | opcode, length)
+    elif length < 1 << 16:
+        header = struct.pack("!BBH", 0x80 | opcode, 126, length)
+    else:
+        header = struct.pack("!BBQ", 0x80 | opcode, 127, length)
+    return header + payload
+
+
+async def _read_frame(reader: asyncio.StreamReader) -> Tuple[int, bytes]:
+    first, second = await reader.readexactly(2)
+    length = second & 0x7F
+    if length == 126:
+        length, = struct.unpack("!H", await reader.readexactly(2))
+    elif length == 127:
+        length, = struct.unpack("!Q", await reader.readexactly(8))
+    if length > _MAX_FRAME_SIZE:
+        raise _FrameTooLarge()
+    mask = await reader.readexactly(4) if second & 0x80 else b"\0" * 4
+    payload = await reader.readexactly(length)
+    payload = bytes(byte ^ mask[index % 4]
+                    for index, byte in enumerate(payload))
+    return first & 0x0F, payload
+
+
+class _Client:
+    """
+    A connected player and the messages that wait to be sent to it.
+    """
+
+    def __init__(self, writer: asyncio.StreamWriter, max_pending: int):
+        self.writer = writer
+        self.max_pending = max_pending
+        self.pending: Deque[Tuple[int, str]] = deque()
+        self.needs_state = True
+        self.wake = asyncio.Event()
+        self.wake.set()
+
+    def offer(self, end: int, message: str):
+        """
+        Queue a message with the events before position ``end``, or replace
+        all queued messages with a state if the player fell behind.
+        """
+        if not self.needs_state:
+            if len(self.pending) < self.max_pending:
+                self.pending.append((end, message))
+            else:
+                self.pending.clear()
+                self.needs_state = True
+        self.wake.set()
+
+    def resync(self):
+        """
+        Replace all queued messages with a state.
+        """
+        self.pending.clear()
+        self.needs_state = True
+        self.wake.set()
+
+
+class VisualizationServer:
+    """
+    Serves the player and broadcasts the events of a visualization to it
+    while the simulation runs.
+
+    Use it as a context manager around running the simulation. Components
+    and visuals should be created before, entities added later make every
+    player load the state again:
+
+    .. code-block:: python
+
+        env = simplay.VisualRealtimeEnvironment(factor=0.1)
+        ...
+        with simplay.VisualizationServer(
+                env.visualization_manager, static_dir="player") as server:
+            print(server.url)
+            env.run()
+
+    :param manager: The visualization to serve.
+    :param host: The address the server listens on.
+    :param port: The port the server listens on, ``0`` picks a free port.
+    :param static_dir: The directory the files of the player are served
+        from, ``/`` serves its ``index.html``. Without a directory, only the
+        WebSocket is served.
+    :param interval: The minimum number of seconds between two batches of
+        events, unless the simulation waits for the wall clock, see
+        :class:`~simplay.core.VisualRealtimeEnvironment`.
+    :param max_pending: The number of messages that may wait for a player
+        before they are replaced with the current state.
+    """
+
+    def __init__(
+            self,
+            manager: "VisualizationManager",
+            host: str = "127.0.0.1",
+            port: int = 8765,
+            static_dir: Optional[str] = None,
+            interval: float = 0.1,
+            max_pending: int = 16):
+        self.manager = manager
+        """
+        The visualization that is served.
+        """
+        self.host = host
+        """
+        The address the server listens on.
+        """
+        self.port = port
+        """
+        The port the server listens on, set to the actual port once the
+        server is started.
+        """
+        self.static_dir = static_dir
+        """
+        The directory the files of the player are served from.
+        """
+        self.interval = interval
+        """
+        The minimum number of seconds between two batches of events.
+        """
+        self.max_pending = max_pending
+        """
+        The number of messages that may wait for a player before they are
+        replaced with the current state.
+        """
+        self.streamed = 0
+        """
+        The number of events broadcast to the players.
+        """
+        self._state = _State()
+        self._until = 0
+        self._header = None
+        self._header_size = (0, 0)
+        self._lock = threading.Lock()
+        self._clients: Set[_Client] = set()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._stopped: Optional[asyncio.Event] = None
+        self._thread: Optional[threading.Thread] = None
+        self._ready = threading.Event()
+        self._error: Optional[BaseException] = None
+        self._last_flush = 0.0
+
+    @property
+    def url(self) -> str:
+        """
+        The URL of the player.
+        """
+        return f"http://{self.host}:{self.port}/"
+
+    def __enter__(self) -> "VisualizationServer":
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def start(self):
+        """
+        Start the server in a background thread and broadcast the events
+        recorded from now on.
+
+        :raises OSError: If the server cannot listen on :attr:`host` and
+            :attr:`port`, e.g. because the port is in use.
+        """
+        self._ready.clear()
+        self._error = None
+        self._thread = threading.Thread(
+            target=asyncio.run, args=(self.__serve(),), daemon=True)
+        self._thread.start()
+        self._ready.wait()
+        if self._error is not None:
+            self._thread.join()
+            raise self._error
+        self.flush()
+        self.manager._streams.append(self)
+
+    def stop(self):
+        """
+        Broadcast the remaining events, close all connections and stop the
+        server.
+        """
+        self.manager._streams.remove(self)
+        self.flush()
+        self._loop.call_soon_threadsafe(self._stopped.set)
+        self._thread.join()
+
+    def poll(self):
+        """
+        Broadcast the events recorded since the last batch, if the last
+        batch is at least :attr:`interval` seconds ago. Called by the
+        manager whenever an event is recorded.
+        """
+        if self._loop.time() - self._last_flush >= self.interval:
+            self.flush()
+
+    def flush(self):
+        """
+        Broadcast the events recorded since the last batch.
+        """
+        self._last_flush = self._loop.time()
+        manager = self.manager
+        with self._lock:
+            header_size = (len(manager.entities), len(manager.visuals))
+            if header_size != self._header_size:
+                self._header = None
+                self._header_size = header_size
+                self._loop.call_soon_threadsafe(self.__resync)
+            start = self.streamed
+            if len(manager.sink) == start:
+                return
+            latest = self._until
+            events = []
+            # the batch is read once, sinks resume reading where it ends
+            for index, record in enumerate(manager.sink.records(start),
+                                           start):
+                self._state.apply(index, record)
+                latest = max(latest, step_of(record[1]))
+                events.append(dumps_record(*record))
+            events = ", ".join(events)
+            self.streamed = len(manager.sink)
+            self._until = latest
+            message = (f'{{"type": "events", "until": {latest}, '
+                       f'"events": [{events}]}}')
+            end = self.streamed
+        self._loop.call_soon_threadsafe(self.__broadcast, end, message)
+
+    def __state_message(self) -> Tuple[int, str]:
+        with self._lock:
+            if self._header is None:
+                manager = self.manager
+                self._header = jsons.dumps(
+                    {
+                        "entities": manager.entities,
+                        "visuals": manager.visuals,
+                        "assets": manager.assets,
+                        "grid": manager.grid,
+                    },
+                    strip_privates=True,
+                    key_transformer=jsons.KEY_TRANSFORMER_CAMELCASE,
+                )
+            events = json.dumps(self._state.events())
+            return self.streamed, (
+                f'{{"type": "state", "until": {self._until}, '
+                f'"header": {self._header}, "events": {events}}}')
+
+    def __broadcast(self, end: int, message: str):
+        for client in self._clients:
+            client.offer(end, message)
+
+    def __resync(self):
+        for client in self._clients:
+            client.resync()
+
+    async def __serve(self):
+        self._loop = asyncio.get_running_loop()
+        self._stopped = asyncio.Event()
+        try:
+            server = await asyncio.start_server(
+                self.__handle, self.host, self.port)
+            self.port = server.sockets[0].getsockname()[1]
+        except Exception as error:
+            # raised by start() in the thread that waits for the server
+            self._error = error
+            return
+        finally:
+            self._ready.set()
+        async with server:
+            await self._stopped.wait()
+            # give the players a moment to receive the last batch
+            deadline = self._loop.time() + 1.0
+            while (any(client.pending or client.wake.is_set()
+                       for client in self._clients)
+                   and self._loop.time() < deadline):
+                await asyncio.sleep(0.01)
+            for client in list(self._clients):
+                client.writer.close()
+        # let the handlers of the closed connections finish
+        await asyncio.sleep(0)
+
+    async def __handle(
+            self,
+            reader: asyncio.StreamReader,
+            writer: asyncio.StreamWriter):
+        try:
+            request = await reader.readuntil(b"\r\n\r\n")
+        except (asyncio.IncompleteReadError, asyncio.LimitOverrunError):
+            writer.close()
+            return
+        if len(request) > _MAX_REQUEST_SIZE:
+            writer.close()
+            return
+        lines = request.decode("latin-1").split("\r\n")
+        method, path, *_ = lines[0].split(" ") + ["", ""]
+        headers = {}
+        for line in lines[1:]:
+            name, _, value = line.partition(":")
+            headers[name.strip().lower()] = value.strip()
+        path = path.split("?", 1)[0]
+        try:
+            if (path == "/events"
+                    and headers.get("upgrade", "").lower() == "websocket"
+                    and "sec-websocket-key" in headers):
+                if not self.__same_origin(headers):
+                    await self.__respond(writer, "403 Forbidden")
+                    return
+                await self.__handle_websocket(
+                    reader, writer, headers["sec-websocket-key"])
+            else:
+                await self.__handle_file(writer, method, path)
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def __handle_file(
+            self,
+            writer: asyncio.StreamWriter,
+            method: str,
+            path: str):
+        file = self.__static_file(path) if method in ("GET", "HEAD") else None
+        if file is None:
+            await self.__respond(writer, "404 Not Found")
+            return
+        with open(file, "rb") as source:
+            body = source.read()
+        content_type = (mimetypes.guess_type(file)[0]
+                        or "application/octet-stream")
+        await self.__respond(
+            writer, "200 OK", body if method != "HEAD" else b"",
+            content_type, len(body))
+
+    @staticmethod
+    async def __respond(
+            writer: asyncio.StreamWriter,
+            status: str,
+            body: bytes = b"",
+            content_type: str = "text/plain",
+            length: Optional[int] = None):
+        writer.write(
+            (f"HTTP/1.1 {status}\r\n"
+             f"Content-Type: {content_type}\r\n"
+             f"Content-Length: {len(body) if length is None else length}\r\n"
+             "Cache-Control: no-store\r\n"
+             "Connection: close\r\n\r\n").encode("latin-1"))
+        writer.write(body)
+        await writer.drain()
+
+    @staticmethod
+    def __same_origin(headers: dict) -> bool:
+        # browsers send the origin of the page that opens the WebSocket, only
+        # the player served by this server may connect, other clients
+        # send no origin
+        origin = headers.get("origin")
+        if origin is None:
+            return True
+        return urlsplit(origin).netloc.lower() == headers.get(
+            "host", "").lower()
+
+    def __static_file(self, path: str) -> Optional[str]:
+        if self.static_dir is None:
+            return None
+        root = os.path.realpath(self.static_dir)
+        relative = path.lstrip("/") or "index.html"
+        file = os.path.realpath(os.path.join(root, relative))
+        if os.path.commonpath([root, file]) != root:
+            return None
+        return file if os.path.isfile(file) else None
+
+    async def __handle_websocket(
+            self,
+            reader: asyncio.StreamReader,
+            writer: asyncio.StreamWriter,
+            key: str):
+        accept = base64.b64encode(hashlib.sha1(
+            (key + _WEBSOCKET_GUID).encode("ascii")).digest()).decode("ascii")
+        writer.write(
+            ("HTTP/1.1 101 Switching Protocols\r\n"
+             "Upgrade: websocket\r\n"
+             "Connection: Upgrade\r\n"
+             f"Sec-WebSocket-Accept: {accept}\r\n\r\n").encode("latin-1"))
+        await writer.drain()
+        client = _Client(writer, self.max_pending)
+        self._clients.add(client)
+        sender = asyncio.ensure_future(self.__send(client))
+        try:
+            while True:
+                try:
+                    opcode, payload = await _read_frame(reader)
+                except _FrameTooLarge:
+                    writer.write(_frame(_OPCODE_CLOSE, struct.pack(
+                        "!H", _CLOSE_MESSAGE_TOO_BIG)))
+                    await writer.drain()
+                    break
+                if opcode == _OPCODE_CLOSE:
+                    writer.write(_frame(_OPCODE_CLOSE, payload[:2]))
+                    break
+                if opcode == _OPCODE_PING:
+                    writer.write(_frame(_OPCODE_PONG, payload))
+        finally:
+            self._clients.discard(client)
+            sender.cancel()
+
+    async def __send(self, client: _Client):
+        # the events up to this position were sent to the player
+        sent = 0
+        while True:
+            await client.wake.wait()
+            client.wake.clear()
+            if client.needs_state:
+                client.needs_state = False
+                client.pending.clear()
+                sent, message = self.__state_message()
+                await self.__send_text(client, message)
+            while client.pending and not client.needs_state:
+                end, message = client.pending.popleft()
+                if end > sent:
+                    sent = end
+                    await self.__send_text(client, message)
+
+    async def __send_text(self, client: _Client, message: str):
+        client.writer.write(_frame(_OPCODE_TEXT, message.encode("utf-8")))
+        # waits while the connection of the player cannot keep up, meanwhile
+        # its messages pile up and are replaced with the state
+        await client.writer.drain()
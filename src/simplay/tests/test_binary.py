@@ -0,0 +1,74 @@
+import json
+
+import pytest
+import src.simplay.binary as binary
+import src.simplay.core as simplay
+from src.simplay.components import VisualStore
+from src.simplay.eventlog import FileSink
+from src.simplay.primitives import ComponentType, ErrorText, EventAction
+
+SAMPLE_IMG_PATH = "tests/sample.png"
+
+
+def record(env):
+    manager = env.visualization_manager
+    manager.register_visual("visual", SAMPLE_IMG_PATH)
+    grid = simplay.VisualGrid(100, 100, 2, 2)
+    grid.set_area("area", "Area", 1, 1, 0, 0, 0)
+    manager.set_grid(grid)
+    comp = simplay.VisualComponent(
+        env, "test", ComponentType.CUSTOM, "visual", 0)
+    comp.is_at(1, 2)
+    comp.is_visible()
+    comp.has_decorating_text("tëxt")
+    env.run(until=0.5)
+    comp.is_near(comp)
+    comp.has_tint(2 ** 40)
+    manager.add_event(simplay.VisualEvent(
+        comp.id, 1, EventAction.MOVE_NEAR, some_arg={"nested_key": 1}))
+    store = VisualStore(env, "store", "visual", 0, 5)
+    store.put("item")
+    env.run(until=2)
+    return manager
+
+
+def test_round_trip(tmp_path):
+    manager = record(simplay.VisualEnvironment())
+    filename = tmp_path / "output.simplay"
+    manager.write_binary(str(filename))
+    assert binary.load(filename.read_bytes()) == \
+        json.loads(manager.serialize())
+
+
+def test_round_trip_with_asset_dir(tmp_path):
+    manager = record(simplay.VisualEnvironment())
+    (tmp_path / "out").mkdir()
+    filename = tmp_path / "out" / "output.simplay"
+    manager.write_binary(str(filename), str(tmp_path / "assets"))
+    output = binary.load(filename.read_bytes())
+    expected = json.loads(manager.serialize(
+        str(tmp_path / "assets"), "../assets/"))
+    assert output == expected
+
+
+def test_round_trip_from_file_sink(tmp_path):
+    sink = FileSink(str(tmp_path / "events.ndjson"), buffer_size=2)
+    manager = record(simplay.VisualEnvironment(sink=sink))
+    filename = tmp_path / "output.simplay"
+    manager.write_binary(str(filename))
+    assert binary.load(filename.read_bytes()) == \
+        json.loads(manager.serialize())
+
+
+def test_columns_are_aligned(tmp_path):
+    manager = record(simplay.VisualEnvironment())
+    filename = tmp_path / "output.simplay"
+    manager.write_binary(str(filename))
+    data = filename.read_bytes()
+    assert data.startswith(binary.MAGIC)
+    assert len(data) % 8 == 0
+
+
+def test_invalid_data():
+    with pytest.raises(ValueError, match=ErrorText.INVALID_BINARY_FORMAT):
+        binary.load(b"\0" * 16)
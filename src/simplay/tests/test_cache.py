@@ -0,0 +1,87 @@
+import os
+import time
+
+import pytest
+import src.simplay.core as simplay
+from src.simplay.cache import DiskCache
+from src.simplay.primitives import ErrorText
+
+SAMPLE_IMG_PATH = "tests/sample.png"
+
+
+def test_put_and_get(tmp_path):
+    cache = DiskCache(str(tmp_path / "cache"))
+    assert cache.get("key") is None
+    cache.put("key", b"value")
+    assert cache.get("key") == b"value"
+    assert DiskCache(str(tmp_path / "cache")).get("key") == b"value"
+
+
+def test_invalid_arguments(tmp_path):
+    with pytest.raises(TypeError, match=ErrorText.DIRECTORY_MUST_BE_STRING):
+        DiskCache(0)
+    with pytest.raises(ValueError,
+                       match=ErrorText.MAX_SIZE_MUST_BE_POSITIVE_INT):
+        DiskCache(str(tmp_path), 0)
+
+
+def test_evicts_least_recently_used(tmp_path):
+    cache = DiskCache(str(tmp_path), max_size=30)
+    cache.put("first", b"x" * 10)
+    cache.put("second", b"x" * 10)
+    past = time.time() - 100
+    for entry in os.scandir(tmp_path):
+        os.utime(entry.path, (past, past))
+    assert cache.get("first") is not None
+    cache.put("third", b"x" * 10)
+    cache.put("fourth", b"x" * 10)
+    assert cache.get("second") is None
+    assert cache.get("first") is not None
+    assert cache.get("fourth") is not None
+
+
+def test_overwriting_keeps_size(tmp_path):
+    cache = DiskCache(str(tmp_path), max_size=30)
+    cache.put("first", b"x" * 10)
+    cache.put("second", b"x" * 10)
+    cache.put("second", b"x" * 5)
+    assert cache._size == 15
+    cache.put("third", b"x" * 10)
+    assert cache._size == 25
+    assert cache.get("first") is not None
+
+
+def test_get_returns_value_evicted_after_read(tmp_path, monkeypatch):
+    cache = DiskCache(str(tmp_path))
+    cache.put("key", b"value")
+
+    def utime(path):
+        raise FileNotFoundError(path)
+
+    monkeypatch.setattr(os, "utime", utime)
+    assert cache.get("key") == b"value"
+
+
+def test_manager_uses_cache(tmp_path):
+    cache = DiskCache(str(tmp_path))
+    first = simplay.VisualEnvironment().visualization_manager
+    first.set_asset_cache(cache)
+    first.register_visual("test", SAMPLE_IMG_PATH)
+    assert len(os.listdir(tmp_path)) == 1
+
+    second = simplay.VisualEnvironment().visualization_manager
+    second.set_asset_cache(cache)
+    for entry in os.scandir(tmp_path):
+        with open(entry.path, "rb") as file:
+            digest, data_url = file.read().decode().split("\n", 1)
+        with open(entry.path, "wb") as file:
+            file.write(f"{digest}\ncached".encode())
+    second.register_visual("test", SAMPLE_IMG_PATH)
+    assert second.assets == {digest: "cached"}
+    assert first.assets == {digest: data_url}
+
+
+def test_invalid_asset_cache():
+    manager = simplay.VisualEnvironment().visualization_manager
+    with pytest.raises(TypeError, match=ErrorText.CACHE_MUST_BE_DISK_CACHE):
+        manager.set_asset_cache("cache")
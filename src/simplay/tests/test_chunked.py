@@ -0,0 +1,72 @@
+import json
+
+import pytest
+import src.simplay.chunked as chunked
+import src.simplay.core as simplay
+from src.simplay.eventlog import EventLog, FileSink
+from src.simplay.primitives import ComponentType, ErrorText, EventAction
+
+SAMPLE_IMG_PATH = "tests/sample.png"
+
+
+def record(env):
+    manager = env.visualization_manager
+    manager.register_visual("visual", SAMPLE_IMG_PATH)
+    manager.set_grid(simplay.VisualGrid(100, 100, 2, 2))
+    comp = simplay.VisualComponent(
+        env, "test", ComponentType.CUSTOM, "visual", 0)
+    comp.is_visible()
+    for step in range(1, 25):
+        env.run(until=step)
+        comp.is_at(step, step)
+    return manager
+
+
+def test_round_trip(tmp_path):
+    manager = record(simplay.VisualEnvironment())
+    filename = tmp_path / "output.simplay"
+    manager.write_chunked(str(filename), 10)
+    assert chunked.load(filename.read_text()) == \
+        json.loads(manager.serialize())
+
+
+def test_lines(tmp_path):
+    manager = record(simplay.VisualEnvironment())
+    manager.set_keyframe_interval(10)
+    filename = tmp_path / "output.simplay"
+    manager.write_chunked(str(filename), 10)
+    lines = [json.loads(line)
+             for line in filename.read_text().splitlines()]
+    assert lines[0]["format"] == chunked.FORMAT
+    assert lines[0]["chunkSteps"] == 10
+    assert [keyframe["step"] for keyframe in lines[0]["keyframes"]] == \
+        [10, 20]
+    assert [line["until"] for line in lines[1:]] == [10, 20, 30]
+    assert [len(line["events"]) for line in lines[1:]] == [10, 10, 5]
+
+
+def test_chunks_are_ordered_by_step():
+    log = EventLog()
+    log.append("a", 12, EventAction.SET_VISIBLE, (True,))
+    log.append("a", 0.4, EventAction.SET_VISIBLE, (False,))
+    log.append("a", 3, EventAction.SET_VISIBLE, (True,))
+    assert [(until, [json.loads(event)["timestamp"] for event in events])
+            for until, events in chunked.chunks(log, 5)] == \
+        [(5, [0.4, 3]), (15, [12])]
+
+
+def test_file_sink(tmp_path):
+    env = simplay.VisualEnvironment(
+        sink=FileSink(str(tmp_path / "events.jsonl"), buffer_size=4))
+    manager = record(env)
+    filename = tmp_path / "output.simplay"
+    manager.write_chunked(str(filename), 10)
+    assert chunked.load(filename.read_text()) == \
+        json.loads(manager.serialize())
+
+
+def test_invalid_chunk_steps(tmp_path):
+    manager = record(simplay.VisualEnvironment())
+    with pytest.raises(ValueError,
+                       match=ErrorText.CHUNK_STEPS_MUST_BE_POSITIVE_INT):
+        manager.write_chunked(str(tmp_path / "output.simplay"), 0)
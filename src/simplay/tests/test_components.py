@@ -1,10 +1,31 @@
-import jsons
+import json
 import pytest
+from simpy import Store
+from simpy.resources.container import ContainerGet
+from simpy.resources.resource import Request
+from simpy.resources.store import StorePut
 import src.simplay.core as simplay
 import src.simplay.components as simplay
+from src.simplay.components import _StoreContent
+from src.simplay.events import StoreUpdateContent
 from src.simplay.primitives import ComponentType, ErrorText, EventAction
 
 
+def replay_content(manager, for_id):
+    content = {}
+    for event in manager.events:
+        if event.for_id != for_id or event.action != (
+                EventAction.STORE_UPDATE_CONTENT.value):
+            continue
+        if event.args["removed"] == StoreUpdateContent.REMOVE_ALL:
+            content.clear()
+        else:
+            for key in json.loads(event.args["removed"]):
+                del content[key]
+        content.update(json.loads(event.args["added"]))
+    return list(content.values())
+
+
 class TestVisualResource:
     def test_visualResource(self):
         env = simplay.VisualEnvironment()
@@ -69,6 +90,14 @@ class TestVisualResource:
         assert manager.events[2].args["utilization"] == 1
         assert manager.events[2].timestamp == 0
 
+    def test_unchanged_capacity_causes_no_event(self):
+        env = simplay.VisualEnvironment()
+        resource = simplay.VisualResource(env, "test", 1, "", 1)
+        manager = env.visualization_manager
+        resource.capacity = 1
+        assert len(manager.events) == 2
+        assert manager.suppressed_events == 1
+
 
 class TestVisualPreemtiveResource:
     def test_visualPreemptiveResource(self):
@@ -323,17 +352,60 @@ class TestVisualStore:
         env = simplay.VisualEnvironment()
         store = simplay.VisualStore(env, "test", "", 10)
         manager = env.visualization_manager
-        some_thing = {"my": "thing"}
+        some_thing = {"my_thing": 1}
         store.put(some_thing)
         assert (manager.events[2].action ==
-                EventAction.STORE_SET_CONTENT.value)
+                EventAction.STORE_UPDATE_CONTENT.value)
         assert manager.events[2].for_id == "test"
-        assert manager.events[2].args["content"] == jsons.dumps(
-            [some_thing],
-            strip_privates=True,
-            key_transformer=jsons.KEY_TRANSFORMER_CAMELCASE)
+        assert manager.events[2].args == {"added": '[[0, {"myThing": 1}]]',
+                                          "removed": "[]"}
         assert manager.events[2].timestamp == 0
 
+    def test_initial_snapshot(self):
+        env = simplay.VisualEnvironment()
+        _ = simplay.VisualStore(env, "test", "", 10)
+        manager = env.visualization_manager
+        assert (manager.events[1].action ==
+                EventAction.STORE_UPDATE_CONTENT.value)
+        assert manager.events[1].args == {"added": "[]", "removed": "*"}
+
+    def test_get_causes_event(self):
+        env = simplay.VisualEnvironment()
+        store = simplay.VisualStore(env, "test", "", 10)
+        manager = env.visualization_manager
+        store.put("first")
+        store.put("second")
+        store.get()
+        assert manager.events[-1].args == {"added": "[]", "removed": "[0]"}
+
+    def test_periodic_snapshot(self, monkeypatch):
+        monkeypatch.setattr(_StoreContent, "SNAPSHOT_INTERVAL", 3)
+        env = simplay.VisualEnvironment()
+        store = simplay.VisualStore(env, "test", "", 10)
+        manager = env.visualization_manager
+        for item in range(3):
+            store.put(item)
+        assert len(manager.events) == 5
+        assert manager.events[-1].args == {"added": "[[0, 0], [1, 1], [2, 2]]",
+                                           "removed": "*"}
+
+    def test_updates_replay_content(self, monkeypatch):
+        monkeypatch.setattr(_StoreContent, "SNAPSHOT_INTERVAL", 7)
+        env = simplay.VisualEnvironment()
+        store = simplay.VisualStore(env, "test", "", 5)
+
+        def process(env):
+            for i in range(20):
+                yield store.put({"number": i})
+                if i % 3 == 0:
+                    yield store.get()
+                yield env.timeout(1)
+
+        env.process(process(env))
+        env.run()
+        assert replay_content(env.visualization_manager, "test") == [
+            {"number": i} for i in range(20)][-len(store.items):]
+
 
 class TestVisualFilterStore:
     def test_visualFilterStore(self):
@@ -378,10 +450,107 @@ class TestVisualFilterStore:
         some_thing = {"my": "thing"}
         store.put(some_thing)
         assert (manager.events[2].action ==
-                EventAction.STORE_SET_CONTENT.value)
+                EventAction.STORE_UPDATE_CONTENT.value)
         assert manager.events[2].for_id == "test"
-        assert manager.events[2].args["content"] == jsons.dumps(
-            [some_thing],
-            strip_privates=True,
-            key_transformer=jsons.KEY_TRANSFORMER_CAMELCASE)
+        assert manager.events[2].args == {"added": '[[0, {"my": "thing"}]]',
+                                          "removed": "[]"}
         assert manager.events[2].timestamp == 0
+
+    def test_filtered_get_causes_event(self):
+        env = simplay.VisualEnvironment()
+        store = simplay.VisualFilterStore(env, "test", 10, "")
+        manager = env.visualization_manager
+        for item in ("a", "b", "c"):
+            store.put(item)
+        store.get(lambda item: item == "b")
+        assert manager.events[-1].args == {"added": "[]", "removed": "[1]"}
+        assert replay_content(manager, "test") == ["a", "c"]
+
+    def test_filtered_get_calls_filter_once(self):
+        env = simplay.VisualEnvironment()
+        store = simplay.VisualFilterStore(env, "test", 10, "")
+        manager = env.visualization_manager
+        for item in ("a", "b", "c"):
+            store.put(item)
+        calls = []
+
+        def matches_once(item):
+            # stateful, only the first item it sees matches
+            calls.append(item)
+            return len(calls) == 1
+
+        get = store.get(matches_once)
+        assert calls == ["a"]
+        assert get.value == "a"
+        assert store.items == ["b", "c"]
+        assert replay_content(manager, "test") == ["b", "c"]
+
+    def test_unmatched_get_causes_no_event(self):
+        env = simplay.VisualEnvironment()
+        store = simplay.VisualFilterStore(env, "test", 10, "")
+        manager = env.visualization_manager
+        store.put("item")
+        store.get(lambda item: item == "other")
+        assert len(manager.events) == 3
+
+
+def visual_callbacks(event):
+    # simpy registers its own callbacks, only the component's count
+    return [callback for callback in event.callbacks
+            if not callback.__module__.startswith("simpy")]
+
+
+class TestDisabledVisualization:
+    def test_resource_adds_no_callbacks(self):
+        env = simplay.VisualEnvironment(enabled=False)
+        resource = simplay.VisualResource(env, "test", 1, "", 0)
+        req = resource.request()
+        rel = resource.release(req)
+        assert not visual_callbacks(req)
+        assert not visual_callbacks(rel)
+        env.run()
+        assert len(env.visualization_manager.events) == 0
+
+    def test_priority_resources_add_no_callbacks(self):
+        env = simplay.VisualEnvironment(enabled=False)
+        for resource in (
+                simplay.VisualPreemptiveResource(env, "a", 1, "", 0),
+                simplay.VisualPriorityResource(env, "b", 1, "", 0)):
+            req = resource.request()
+            rel = resource.release(req)
+            assert not visual_callbacks(req)
+            assert not visual_callbacks(rel)
+
+    def test_container_adds_no_callbacks(self):
+        env = simplay.VisualEnvironment(enabled=False)
+        container = simplay.VisualContainer(env, "test", "", 0, 10, 5)
+        put = container.put(1)
+        get = container.get(2)
+        assert not visual_callbacks(put)
+        assert not visual_callbacks(get)
+        env.run()
+        assert container.level == 4
+        assert len(env.visualization_manager.events) == 0
+
+    def test_stores_record_no_content(self):
+        env = simplay.VisualEnvironment(enabled=False)
+        store = simplay.VisualStore(env, "a", "", 0, 10)
+        filter_store = simplay.VisualFilterStore(env, "b", 10, "")
+        store.put("item")
+        filter_store.put("item")
+        got = store.get()
+        filtered = filter_store.get(lambda item: item == "item")
+        env.run()
+        assert got.value == "item"
+        assert filtered.value == "item"
+        assert len(env.visualization_manager.events) == 0
+
+    def test_components_call_simpy_directly(self):
+        env = simplay.VisualEnvironment(enabled=False)
+        store = simplay.VisualStore(env, "a", "", 0, 10)
+        container = simplay.VisualContainer(env, "b", "", 0, 10)
+        resource = simplay.VisualResource(env, "c", 1, "", 0)
+        assert store._do_get.__func__ is Store._do_get
+        assert store.put.__func__ is StorePut
+        assert container.get.__func__ is ContainerGet
+        assert resource.request.__func__ is Request
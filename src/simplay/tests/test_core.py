@@ -1,14 +1,23 @@
+import base64
+import gzip
+import json
+import jsons
+import lzma
 import pytest
 import simpy
 import src.simplay.core as simplay
 from src.simplay.core import VisualComponent
-from src.simplay.primitives import ComponentType, ErrorText, EventAction
+from src.simplay.events import StoreSetContent
+from src.simplay.primitives import (ComponentType, Compression, ErrorText,
+                                    EventAction, SimplayConsts)
 
 SAMPLE_BASE64 = ("data:image/png;base64,iVBORw0KGgoAAAANSUhEUgAAAAsAAAAJCAIAAA"
                  "BrBkF6AAAAAXNSR0IArs4c6QAAAARnQU1BAACxjwv8YQUAAAAJcEhZcwAADs"
                  "MAAA7DAcdvqGQAAAA5SURBVChTY/hPCFCgYsWKFa2trUAGigq4KBAAGQwMIF"
                  "kUFXBRZIDTFjggTgWy9ZgApAKr9VDw/z8AS5ITTSmJ+xoAAAAASUVORK5CYI"
                  "I=")
+SAMPLE_HASH = ("7d14e7d5f686b731d45e5c86bdc9863cad7e6ca34d2190e95d88ceff2053f"
+               "2a3")
 SAMPLE_IMG_PATH = "tests/sample.png"
 
 
@@ -17,6 +26,45 @@ class TestVisualEnvironment:
         env = simplay.VisualEnvironment()
         assert env.visualization_manager is not None
 
+    def test_disabled_records_no_events(self):
+        env = simplay.VisualEnvironment(enabled=False)
+        comp = simplay.VisualComponent(
+            env, "test", ComponentType.RESOURCE, "", 0)
+        comp.is_at(1, 2)
+        comp.is_visible()
+        comp.has_decorating_text("text")
+        env.visualization_manager.add_event(simplay.VisualEvent(
+            comp.id, 0, EventAction.CONTAINER_SET_CAPACITY, test="test"))
+        assert len(env.visualization_manager.events) == 0
+        assert env.visualization_manager.entities[0]["id"] == "test"
+
+
+class TestVisualRealtimeEnvironment:
+    def test_flushes_streams_before_waiting(self):
+        env = simplay.VisualRealtimeEnvironment(factor=0.001)
+        comp = simplay.VisualComponent(
+            env, "test", ComponentType.RESOURCE, "", 0)
+        flushed = []
+
+        class Stream:
+            def poll(self):
+                pass
+
+            def flush(self):
+                flushed.append((env.now, len(env.visualization_manager.sink)))
+
+        def process():
+            for x in range(3):
+                comp.is_at(x, 0)
+                yield env.timeout(1)
+
+        env.visualization_manager._streams.append(Stream())
+        env.process(process())
+        env.run()
+        assert env.now == 3
+        # also once the schedule is empty
+        assert flushed == [(0, 1), (1, 2), (2, 3), (3, 3)]
+
 
 class TestNonSimComponentShortHand:
     def test_create_custom_component_min(self):
@@ -285,7 +333,127 @@ class TestVisualizationManager:
         self.reset()
         self.manager.register_visual("test", SAMPLE_IMG_PATH)
         assert {"id": "test", "frames": [
-            SAMPLE_BASE64]} in self.manager.visuals
+            SAMPLE_HASH]} in self.manager.visuals
+        assert self.manager.assets == {SAMPLE_HASH: SAMPLE_BASE64}
+
+    def test_serialize_with_asset_dir(self, tmp_path):
+        self.reset()
+        self.manager.register_visual("test", SAMPLE_IMG_PATH)
+        output = json.loads(self.manager.serialize(
+            str(tmp_path / "assets"), "https://example.com/assets"))
+        assert output["assets"] == {
+            SAMPLE_HASH: f"https://example.com/assets/{SAMPLE_HASH}.png"}
+        with open(SAMPLE_IMG_PATH, "rb") as sample:
+            assert ((tmp_path / "assets" / f"{SAMPLE_HASH}.png").read_bytes()
+                    == sample.read())
+
+    def test_write_to_file_with_asset_dir(self, tmp_path):
+        self.reset()
+        self.manager.register_visual("test", SAMPLE_IMG_PATH)
+        (tmp_path / "out").mkdir()
+        filename = tmp_path / "out" / "output.simplay"
+        self.manager.write_to_file(str(filename), str(tmp_path / "assets"))
+        output = json.loads(filename.read_text())
+        assert output["assets"] == {
+            SAMPLE_HASH: f"../assets/{SAMPLE_HASH}.png"}
+        assert SAMPLE_BASE64 not in filename.read_text()
+
+    def test_serialize_columnar(self):
+        self.reset()
+        comp = simplay.VisualComponent(
+            self.env, "test", ComponentType.CUSTOM, "", 0)
+        other = simplay.VisualComponent(
+            self.env, "other", ComponentType.CUSTOM, "", 0)
+        comp.is_at(1, 2)
+        other.is_visible()
+        self.env.run(until=0.5)
+        comp.is_interacting_with(other)
+        comp.is_at(3, 4)
+        expected = json.loads(self.manager.serialize())
+        output = json.loads(self.manager.serialize(columnar=True))
+        assert output.pop("events") == []
+        columns = output.pop("eventColumns")
+        positions = [0] * len(columns["groups"])
+        events = []
+        for index in columns["order"]:
+            group = columns["groups"][index]
+            row = positions[index]
+            positions[index] += 1
+            events.append({
+                "action": group["action"],
+                "args": {name: values[row]
+                         for name, values in group["args"].items()},
+                "forId": output["entities"][group["forIds"][row]]["id"],
+                "timestamp": group["timestamps"][row],
+            })
+        assert events == expected.pop("events")
+        assert output == expected
+
+    def test_write_compressed_file(self, tmp_path):
+        self.reset()
+        comp = simplay.VisualComponent(
+            self.env, "test", ComponentType.CUSTOM, "", 0)
+        comp.is_at(1, 2)
+        expected = json.loads(self.manager.serialize())
+        for compression, module in ((Compression.GZIP, gzip),
+                                    (Compression.XZ, lzma)):
+            filename = str(tmp_path / f"output.{compression.value}")
+            self.manager.write_to_file(filename, compression=compression)
+            with module.open(filename, "rt", encoding="utf-8") as f:
+                assert json.load(f) == expected
+
+    def test_gzip_output_is_reproducible(self, tmp_path):
+        self.reset()
+        for name in ("first", "second"):
+            (tmp_path / name).mkdir()
+            self.manager.write_to_file(str(tmp_path / name / "output.gz"),
+                                       compression=Compression.GZIP)
+        assert (tmp_path / "first" / "output.gz").read_bytes() == \
+            (tmp_path / "second" / "output.gz").read_bytes()
+
+    def test_invalid_compression(self, tmp_path):
+        self.reset()
+        with pytest.raises(TypeError, match=ErrorText.INVALID_COMPRESSION):
+            self.manager.write_to_file(
+                str(tmp_path / "output"), compression="gzip")
+        with pytest.raises(ValueError,
+                           match=ErrorText.JUPYTER_COMPRESSION_MUST_BE_GZIP):
+            self.manager.serialize_for_jupyter(compression=Compression.XZ)
+
+    def test_serialize_for_jupyter_compressed(self):
+        self.reset()
+        comp = simplay.VisualComponent(
+            self.env, "test", ComponentType.CUSTOM, "", 0)
+        comp.is_at(1, 2)
+        output = self.manager.serialize_for_jupyter(
+            compression=Compression.GZIP)
+        data = output[SimplayConsts.JUPYTERLAB_GZIP_MIMETYPE]
+        assert json.loads(gzip.decompress(base64.b64decode(data))) == \
+            json.loads(self.manager.serialize())
+
+    def test_export_assets_keeps_existing_files(self, tmp_path):
+        self.reset()
+        self.manager.register_visual("test", SAMPLE_IMG_PATH)
+        self.manager.export_assets(str(tmp_path))
+        path = tmp_path / f"{SAMPLE_HASH}.png"
+        path.write_bytes(b"shared")
+        self.manager.export_assets(str(tmp_path))
+        assert path.read_bytes() == b"shared"
+
+    def test_assets_are_deduplicated(self, tmp_path):
+        self.reset()
+        copy = tmp_path / "copy.png"
+        with open(SAMPLE_IMG_PATH, "rb") as sample:
+            copy.write_bytes(sample.read())
+        self.manager.register_sprites(
+            "test", [SAMPLE_IMG_PATH, SAMPLE_IMG_PATH])
+        self.manager.register_sprites("copy", [str(copy)])
+        assert self.manager.visuals == [
+            {"id": "test", "frames": [SAMPLE_HASH, SAMPLE_HASH]},
+            {"id": "copy", "frames": [SAMPLE_HASH]},
+        ]
+        assert self.manager.assets == {SAMPLE_HASH: SAMPLE_BASE64}
+        assert self.manager.serialize().count(SAMPLE_BASE64) == 1
 
     def test_no_duplicate_visuals(self):
         self.reset()
@@ -325,7 +493,8 @@ class TestVisualizationManager:
         self.reset()
         self.manager.register_sprites("test", [SAMPLE_IMG_PATH])
         assert {"id": "test", "frames": [
-            SAMPLE_BASE64]} in self.manager.visuals
+            SAMPLE_HASH]} in self.manager.visuals
+        assert self.manager.assets == {SAMPLE_HASH: SAMPLE_BASE64}
 
     def test_no_duplicate_sprites(self):
         self.reset()
@@ -379,3 +548,137 @@ class TestVisualizationManager:
                 TypeError,
                 match=ErrorText.GRID_MUST_BE_VISUAL_GRID):
             self.manager.set_grid("INVALID")
+
+    def test_serialize_matches_jsons(self):
+        self.reset()
+        self.manager.register_visual("visual", SAMPLE_IMG_PATH)
+        grid = simplay.VisualGrid(100, 100, 2, 2)
+        grid.set_area("area", "Area", 1, 1, 0, 0, 0)
+        self.manager.set_grid(grid)
+        comp = simplay.VisualComponent(
+            self.env, "test", ComponentType.CUSTOM, "visual", 0)
+        comp.is_at(1, 2)
+        comp.has_decorating_text("tëxt")
+        self.env.run(until=0.5)
+        comp.is_near(comp)
+        self.manager.add_event(simplay.VisualEvent(
+            comp.id, 1, EventAction.MOVE_NEAR, some_arg={"nested_key": 1}))
+        expected = jsons.dumps(
+            {
+                "events": [
+                    {
+                        "action": event.action,
+                        "args": event.args,
+                        "for_id": event.for_id,
+                        "timestamp": event.timestamp,
+                    }
+                    for event in self.manager.events
+                ],
+                "entities": self.manager.entities,
+                "visuals": self.manager.visuals,
+                "assets": self.manager.assets,
+                "grid": self.manager.grid,
+            },
+            strip_privates=True,
+            key_transformer=jsons.KEY_TRANSFORMER_CAMELCASE,
+        )
+        assert self.manager.serialize() == expected
+
+
+class TestTrustedRecording:
+    def record_sample(self, env):
+        component = simplay.VisualComponent(
+            env, "id", ComponentType.CUSTOM, "", 0)
+        other = simplay.VisualComponent(
+            env, "other", ComponentType.CUSTOM, "", 0)
+        component.is_at(1, 2)
+        component.is_visible()
+        component.is_near(other)
+        component.has_tint(0xFF0000)
+        component.has_decorating_text("text")
+        return component
+
+    def test_records_same_events(self):
+        validated = simplay.VisualEnvironment()
+        trusted = simplay.VisualEnvironment(validate=False)
+        self.record_sample(validated)
+        self.record_sample(trusted)
+        assert not trusted.visualization_manager.validate_on_record
+        assert (list(trusted.visualization_manager.events) ==
+                list(validated.visualization_manager.events))
+        assert (trusted.visualization_manager.serialize() ==
+                validated.visualization_manager.serialize())
+
+    def test_converted_values_are_recorded_the_same(self):
+        validated = simplay.VisualEnvironment()
+        trusted = simplay.VisualEnvironment(validate=False)
+        for env in (validated, trusted):
+            env.visualization_manager.record(
+                StoreSetContent, "s", 0, [1, 2])
+        assert trusted.visualization_manager.events[0].args == {
+            "content": "[1, 2]"}
+        assert (list(trusted.visualization_manager.events) ==
+                list(validated.visualization_manager.events))
+        trusted.visualization_manager.validate()
+
+    def test_invalid_values_are_recorded(self):
+        env = simplay.VisualEnvironment(validate=False)
+        component = self.record_sample(env)
+        component.is_at(1.5, 2)
+        assert env.visualization_manager.events[-1].args == {"x": 1.5,
+                                                             "y": 2}
+
+    def test_validate(self):
+        env = simplay.VisualEnvironment(validate=False)
+        component = self.record_sample(env)
+        env.visualization_manager.validate()
+        component.is_at(1.5, 2)
+        with pytest.raises(TypeError, match=ErrorText.X_MUST_BE_INT):
+            env.visualization_manager.validate()
+
+    def test_serialize_validates(self):
+        env = simplay.VisualEnvironment(validate=False)
+        component = self.record_sample(env)
+        component.has_decorating_text(42)
+        with pytest.raises(TypeError, match=ErrorText.TEXT_MUST_BE_STRING):
+            env.visualization_manager.serialize()
+
+    def test_validate_invalid_id(self):
+        env = simplay.VisualEnvironment(validate=False)
+        env.visualization_manager.record(simplay.SetVisible, 0, 0, True)
+        with pytest.raises(TypeError, match=ErrorText.ID_MUST_BE_STRING):
+            env.visualization_manager.validate()
+
+    def test_record_wrong_number_of_values(self):
+        env = simplay.VisualEnvironment(validate=False)
+        with pytest.raises(TypeError,
+                           match=ErrorText.VALUES_MUST_MATCH_ARG_NAMES):
+            env.visualization_manager.record(simplay.SetPosition, "id", 0, 1)
+
+
+class TestSuppressUnchangedEvents:
+    def test_record_if_changed(self):
+        env = simplay.VisualEnvironment()
+        manager = env.visualization_manager
+        manager.record_if_changed(simplay.SetVisible, "id", 0, True)
+        manager.record_if_changed(simplay.SetVisible, "id", 1, True)
+        manager.record_if_changed(simplay.SetVisible, "id", 2, False)
+        assert [e.args["visible"] for e in manager.events] == [True, False]
+        assert manager.suppressed_events == 1
+
+    def test_record_if_changed_per_component(self):
+        env = simplay.VisualEnvironment()
+        manager = env.visualization_manager
+        manager.record_if_changed(simplay.SetVisible, "a", 0, True)
+        manager.record_if_changed(simplay.SetVisible, "b", 0, True)
+        assert len(manager.events) == 2
+        assert manager.suppressed_events == 0
+
+    def test_add_event_if_changed(self):
+        env = simplay.VisualEnvironment()
+        manager = env.visualization_manager
+        manager.add_event_if_changed(simplay.SetPosition("id", 0, 1, 2))
+        manager.add_event_if_changed(simplay.SetPosition("id", 1, 1, 2))
+        manager.add_event_if_changed(simplay.SetPosition("id", 2, 2, 2))
+        assert len(manager.events) == 2
+        assert manager.suppressed_events == 1
@@ -0,0 +1,298 @@
+from json.encoder import encode_basestring_ascii
+import pytest
+import src.simplay.core as core
+import src.simplay.eventlog as eventlog
+import src.simplay.events as events
+from src.simplay.eventlog import (EventLog, EventLogView, EventSink,
+                                  FileSink, columnar_events, dumps_record)
+from src.simplay.primitives import ErrorText, EventAction
+
+
+def test_append_and_record():
+    log = EventLog()
+    log.append("id", 0, EventAction.SET_POSITION, (1, 2))
+    log.append("id", 1.5, EventAction.SET_VISIBLE, (True,))
+    log.append("other", 2, EventAction.SET_DECORATING_TEXT, ("text",))
+    assert len(log) == 3
+    assert log.record(0) == ("id", 0, "SET_POSITION", {"x": 1, "y": 2})
+    assert log.record(1) == ("id", 1.5, "SET_VISIBLE", {"visible": True})
+    assert log.record(2) == ("other", 2, "SET_DECORATING_TEXT",
+                             {"text": "text"})
+
+
+def test_value_types_are_preserved():
+    log = EventLog()
+    log.append("id", 0, EventAction.CONTAINER_SET_CAPACITY, (float("inf"),))
+    log.append("id", 0, EventAction.CONTAINER_SET_LEVEL, (2.5,))
+    log.append("id", 0, EventAction.SET_VISIBLE, (False,))
+    log.append("id", 0, EventAction.SET_TINT_COLOR, (2 ** 60,))
+    _, timestamp, _, args = log.record(0)
+    assert type(timestamp) is int
+    assert args["capacity"] == float("inf")
+    assert log.record(1)[3]["level"] == 2.5
+    assert log.record(2)[3]["visible"] is False
+    assert log.record(3)[3]["color"] == 2 ** 60
+
+
+def test_strings_are_interned():
+    log = EventLog()
+    for _ in range(10):
+        log.append("id", 0, EventAction.SET_INTERACTING, ("other",))
+    assert sorted(log.strings) == ["id", "other"]
+
+
+def test_append_event():
+    log = EventLog()
+    event = events.SetPosition("id", 0, 1, 2)
+    log.append_event(event)
+    materialized = log.event(0)
+    assert isinstance(materialized, events.SetPosition)
+    assert materialized == event
+
+
+def test_append_event_with_custom_args():
+    log = EventLog()
+    event = events.VisualEvent("id", 0, EventAction.MOVE_NEAR,
+                               arg1="value1", arg2=[1, 2], arg3=None)
+    log.append_event(event)
+    materialized = log.event(0)
+    assert type(materialized) is events.VisualEvent
+    assert materialized.args == {"arg1": "value1", "arg2": [1, 2],
+                                 "arg3": None}
+
+
+def test_view():
+    log = EventLog()
+    log.append("id", 0, EventAction.SET_SPRITE_FRAME, (0,))
+    log.append("id", 1, EventAction.SET_SPRITE_FRAME, (1,))
+    view = EventLogView(log)
+    assert len(view) == 2
+    assert view[-1].args == {"frame": 1}
+    assert [e.timestamp for e in view] == [0, 1]
+    assert [e.timestamp for e in view[1:]] == [1]
+    with pytest.raises(IndexError):
+        view[2]
+
+
+def test_memory_per_event():
+    log = EventLog()
+    for i in range(1000):
+        log.append("id", i * 0.5, EventAction.SET_POSITION, (i, i))
+    column_bytes = sum(
+        column.itemsize * len(column)
+        for column in (log._for_ids, log._actions, log._timestamps,
+                       log._kinds, log._arg0, log._arg1))
+    assert column_bytes / len(log) < 40
+
+
+def test_manager_events_view():
+    env = core.VisualEnvironment()
+    component = core.VisualComponent.create_custom_component(env, "id", "")
+    manager = env.visualization_manager
+    assert isinstance(manager.events, EventLogView)
+    assert len(manager.events) == 2
+    assert events.SetPosition(component.id, 0, 0, 0) in manager.events
+
+
+def record_sample(env):
+    component = core.VisualComponent.create_custom_component(env, "id", "")
+    for i in range(25):
+        component.is_at(i, i * 2)
+        component.has_decorating_text(f"text {i}")
+        component.has_frame(i)
+    return component
+
+
+def test_file_sink_spills_events(tmp_path):
+    sink = FileSink(str(tmp_path / "events.ndjson"), buffer_size=10)
+    env = core.VisualEnvironment(sink=sink)
+    record_sample(env)
+    assert len(sink) == 77
+    assert len(sink._buffer) < 10
+    with open(sink.path) as file:
+        assert len(file.readlines()) == 70
+
+
+def test_file_sink_events(tmp_path):
+    sink = FileSink(str(tmp_path / "events.ndjson"), buffer_size=10)
+    env = core.VisualEnvironment(sink=sink)
+    record_sample(env)
+    expected = core.VisualEnvironment()
+    record_sample(expected)
+    view = env.visualization_manager.events
+    assert list(view) == list(expected.visualization_manager.events)
+    assert view[2] == expected.visualization_manager.events[2]
+    assert isinstance(view[2], events.SetPosition)
+
+
+def test_file_sink_write_to_file(tmp_path):
+    sink = FileSink(str(tmp_path / "events.ndjson"), buffer_size=10)
+    env = core.VisualEnvironment(sink=sink)
+    record_sample(env)
+    expected = core.VisualEnvironment()
+    record_sample(expected)
+    output = tmp_path / "output.simplay"
+    env.visualization_manager.write_to_file(str(output))
+    assert output.read_text() == expected.visualization_manager.serialize()
+
+
+def test_file_sink_validates_before_writing(tmp_path):
+    sink = FileSink(str(tmp_path / "events.ndjson"), buffer_size=2)
+    env = core.VisualEnvironment(validate=False, sink=sink)
+    component = core.VisualComponent.create_custom_component(env, "id", "")
+    component.is_at(1.5, 2)
+    with pytest.raises(TypeError, match=ErrorText.X_MUST_BE_INT):
+        component.has_frame(0)
+
+
+def test_file_sink_close(tmp_path):
+    sink = FileSink(str(tmp_path / "events.ndjson"))
+    sink.append("id", 0, EventAction.SET_SPRITE_FRAME, (0,))
+    sink.close()
+    sink.close()
+    with open(sink.path) as file:
+        assert file.read() == ('{"action": "SET_SPRITE_FRAME", '
+                               '"args": {"frame": 0}, "forId": "id", '
+                               '"timestamp": 0}\n')
+
+
+def test_json_records_match_jsons():
+    log = EventLog()
+    log.append("id", 0, EventAction.SET_POSITION, (1, -2))
+    log.append("id", 0.1, EventAction.SET_POSITION, (1.5, 2e20))
+    log.append("ü", 2, EventAction.SET_DECORATING_TEXT, (" \"\\",))
+    log.append("id", 3, EventAction.SET_VISIBLE, (False,))
+    log.append("id", 4, EventAction.SET_INTERACTING, ("other",))
+    log.append("id", 5, EventAction.CONTAINER_SET_CAPACITY, (float("inf"),))
+    log.append("id", 6, EventAction.CONTAINER_SET_LEVEL, (float("nan"),))
+    log.append("id", 7, EventAction.SET_TINT_COLOR, (2 ** 60,))
+    log.append("id", 8, EventAction.SET_POSITION, (None, {"a_b": 1}))
+    log.append_event(events.VisualEvent("id", 9, EventAction.MOVE_NEAR,
+                                        some_arg=[1, {"c_d": 2}]))
+    assert list(log.json_records()) == [
+        dumps_record(*record) for record in log.records()]
+
+
+def test_json_records_from_start(tmp_path):
+    sink = FileSink(str(tmp_path / "events.ndjson"), buffer_size=2)
+    log = EventLog()
+    for target in (sink, log):
+        for step in range(5):
+            target.append("a", step, EventAction.SET_POSITION, (step, 0))
+        target.append_event(events.VisualEvent(
+            "a", 5, EventAction.MOVE_NEAR, some_arg=[1, {"c_d": 2}]))
+    expected = list(log.json_records())
+    for start in (0, 3, 6):
+        assert list(log.json_records(start)) == expected[start:]
+        assert list(sink.json_records(start)) == expected[start:]
+
+
+def test_columnar_events():
+    log = EventLog()
+    log.append("a", 0, EventAction.SET_POSITION, (1, 2))
+    log.append("b", 0.5, EventAction.SET_VISIBLE, (True,))
+    log.append("unknown", 1, EventAction.SET_POSITION, (3, 4.5))
+    log.append_event(events.VisualEvent("a", 2, EventAction.MOVE_NEAR,
+                                        some_arg={"nested_key": 1}))
+    assert columnar_events(log.records(), {"a": 0, "b": 1}) == {
+        "order": [0, 1, 0, 2],
+        "groups": [
+            {
+                "action": "SET_POSITION",
+                "forIds": [0, "unknown"],
+                "timestamps": [0, 1],
+                "args": {"x": [1, 3], "y": [2, 4.5]},
+            },
+            {
+                "action": "SET_VISIBLE",
+                "forIds": [1],
+                "timestamps": [0.5],
+                "args": {"visible": [True]},
+            },
+            {
+                "action": "MOVE_NEAR",
+                "forIds": [0],
+                "timestamps": [2],
+                "args": {"someArg": [{"nestedKey": 1}]},
+            },
+        ],
+    }
+
+
+def test_file_sink_records(tmp_path):
+    sink = FileSink(str(tmp_path / "events.ndjson"), buffer_size=1)
+    log = EventLog()
+    for target in (sink, log):
+        target.append("a", 0, EventAction.SET_POSITION, (1, 2))
+        target.append("a", 1, EventAction.SET_DECORATING_TEXT, ("text",))
+    assert list(sink.records()) == list(log.records())
+
+
+def test_file_sink_reads_batches_once(tmp_path, monkeypatch):
+    lines_read = []
+
+    class CountingFile:
+        def __init__(self, file):
+            self.file = file
+
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *exc_info):
+            self.file.close()
+
+        def seek(self, offset):
+            self.file.seek(offset)
+
+        def readline(self):
+            lines_read.append(1)
+            return self.file.readline()
+
+    def counting_open(path, mode="r"):
+        if mode == "rb":
+            return CountingFile(open(path, mode))
+        return open(path, mode)
+
+    monkeypatch.setattr(eventlog, "open", counting_open, raising=False)
+    sink = FileSink(str(tmp_path / "events.ndjson"), buffer_size=3)
+    log = EventLog()
+    streamed = []
+    for step in range(20):
+        for target in (sink, log):
+            target.append("a", step, EventAction.SET_POSITION, (step, 0))
+            target.append("a", step, EventAction.SET_DECORATING_TEXT,
+                          (f"text {step}",))
+        if step < 10:
+            streamed.extend(sink.json_records(len(streamed)))
+        else:
+            streamed.extend(dumps_record(*record)
+                            for record in sink.records(len(streamed)))
+    assert streamed == list(log.json_records())
+    assert len(lines_read) == len(sink) - len(sink._buffer)
+
+
+def test_json_records_encode_strings_once(monkeypatch):
+    encoded = []
+
+    def encode(value):
+        encoded.append(value)
+        return encode_basestring_ascii(value)
+
+    monkeypatch.setattr(eventlog, "encode_basestring_ascii", encode)
+    log = EventLog()
+    streamed = []
+    for step in range(10):
+        log.append("a", step, EventAction.SET_DECORATING_TEXT,
+                   (f"text {step}",))
+        streamed.extend(log.json_records(len(streamed)))
+    assert len(streamed) == 10
+    assert sorted(encoded) == sorted(log.strings)
+
+
+def test_incomplete_sink_cannot_be_created():
+    class Incomplete(EventSink):
+        def __len__(self):
+            return 0
+
+    with pytest.raises(TypeError):
+        Incomplete()
@@ -224,3 +224,18 @@ def test_store_set_content():
     assert event.timestamp == 0
     assert event.action == EventAction.STORE_SET_CONTENT.value
     assert event.args == {"content": "1"}
+
+
+def test_store_update_content():
+    event = simplay.StoreUpdateContent(comp.id, 0, "[[0, 1]]", "[]")
+    assert event.for_id == "id"
+    assert event.timestamp == 0
+    assert event.action == EventAction.STORE_UPDATE_CONTENT.value
+    assert event.args == {"added": "[[0, 1]]", "removed": "[]"}
+
+
+def test_store_update_content_invalid_args():
+    with pytest.raises(TypeError, match=ErrorText.ADDED_MUST_BE_STRING):
+        simplay.StoreUpdateContent(comp.id, 0, [[0, 1]], "[]")
+    with pytest.raises(TypeError, match=ErrorText.REMOVED_MUST_BE_STRING):
+        simplay.StoreUpdateContent(comp.id, 0, "[]", [0])
@@ -0,0 +1,111 @@
+import json
+
+import pytest
+import src.simplay.binary as binary
+import src.simplay.core as simplay
+from src.simplay.components import VisualStore
+from src.simplay.eventlog import EventLog
+from src.simplay.keyframes import keyframes, step_of
+from src.simplay.primitives import ComponentType, ErrorText, EventAction
+
+
+def test_step_of_rounds_half_up():
+    assert [step_of(t) for t in (0, 0.49, 0.5, 1.5, 2.5)] == [0, 0, 1, 2, 3]
+
+
+def test_keyframe_holds_last_event_per_slot():
+    log = EventLog()
+    log.append("a", 0, EventAction.SET_VISIBLE, (True,))
+    log.append("a", 0, EventAction.SET_POSITION, (1, 2))
+    log.append("a", 1, EventAction.MOVE_NEAR_CELL, (3, 4))
+    log.append("a", 1, EventAction.SET_INTERACTING, ("b",))
+    log.append("a", 1, EventAction.SET_INTERACTING, ("c",))
+    log.append("a", 2, EventAction.SET_NOT_INTERACTING, ("b",))
+    log.append("a", 3, EventAction.SET_VISIBLE, (False,))
+    assert keyframes(log.records(), 3) == [{
+        "step": 3,
+        "events": [
+            {"action": "SET_VISIBLE", "args": {"visible": True},
+             "forId": "a", "timestamp": 0},
+            {"action": "MOVE_NEAR_CELL", "args": {"x": 3, "y": 4},
+             "forId": "a", "timestamp": 1},
+            {"action": "SET_INTERACTING", "args": {"withId": "c"},
+             "forId": "a", "timestamp": 1},
+        ],
+    }]
+
+
+def test_keyframe_holds_whole_store_content():
+    log = EventLog()
+    log.append("s", 0, EventAction.STORE_UPDATE_CONTENT, ('[[0, "x"]]', "*"))
+    log.append("s", 1, EventAction.STORE_UPDATE_CONTENT,
+               ('[[1, {"key": 1}]]', "[]"))
+    log.append("s", 1, EventAction.STORE_UPDATE_CONTENT, ("[]", "[0]"))
+    log.append("s", 2, EventAction.STORE_SET_CAPACITY, (5,))
+    (frame,) = keyframes(log.records(), 2)
+    assert frame["events"] == [{
+        "action": "STORE.UPDATE_CONTENT",
+        "args": {"added": '[[1, {"key": 1}]]', "removed": "*"},
+        "forId": "s",
+        "timestamp": 1,
+    }]
+
+
+def test_one_keyframe_per_gap():
+    log = EventLog()
+    log.append("a", 0, EventAction.SET_POSITION, (1, 2))
+    log.append("a", 2, EventAction.SET_POSITION, (2, 2))
+    log.append("a", 95, EventAction.SET_POSITION, (3, 2))
+    assert [frame["step"] for frame in keyframes(log.records(), 10)] == [90]
+
+
+def test_events_are_ordered_by_step():
+    log = EventLog()
+    log.append("a", 5, EventAction.SET_POSITION, (5, 5))
+    log.append("a", 1, EventAction.SET_POSITION, (1, 1))
+    log.append("a", 12, EventAction.SET_VISIBLE, (True,))
+    (frame,) = keyframes(log.records(), 10)
+    assert frame["events"][0]["args"] == {"x": 5, "y": 5}
+
+
+class TestVisualizationManager:
+    def record(self, env):
+        comp = simplay.VisualComponent(
+            env, "comp", ComponentType.CUSTOM, "", 0)
+        store = VisualStore(env, "store", "", 0, 5)
+        for step in range(30):
+            env.run(until=step + 1)
+            comp.is_at(step % 4, 1)
+            store.put(step)
+            if len(store.items) > 3:
+                store.get()
+        return env.visualization_manager
+
+    def test_invalid_interval(self):
+        manager = simplay.VisualEnvironment().visualization_manager
+        for interval in (0, -1, 1.5, "10"):
+            with pytest.raises(
+                    ValueError,
+                    match=ErrorText.KEYFRAME_INTERVAL_MUST_BE_POSITIVE_INT):
+                manager.set_keyframe_interval(interval)
+
+    def test_no_keyframes_by_default(self):
+        manager = self.record(simplay.VisualEnvironment())
+        assert "keyframes" not in json.loads(manager.serialize())
+
+    def test_serialize_with_keyframes(self):
+        manager = self.record(simplay.VisualEnvironment())
+        manager.set_keyframe_interval(10)
+        output = json.loads(manager.serialize())
+        assert [frame["step"] for frame in output["keyframes"]] == \
+            [10, 20, 30]
+        assert output["events"] == json.loads(
+            self.record(simplay.VisualEnvironment()).serialize())["events"]
+
+    def test_write_binary_with_keyframes(self, tmp_path):
+        manager = self.record(simplay.VisualEnvironment())
+        manager.set_keyframe_interval(10)
+        filename = tmp_path / "output.simplay"
+        manager.write_binary(str(filename))
+        assert binary.load(filename.read_bytes()) == \
+            json.loads(manager.serialize())
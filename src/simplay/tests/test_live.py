@@ -0,0 +1,77 @@
+import json
+import pytest
+import src.simplay.components as simplay
+from src.simplay.live import LiveDisplay
+from src.simplay.primitives import SimplayConsts
+
+display_module = pytest.importorskip("IPython.display")
+
+
+@pytest.fixture
+def updates(monkeypatch):
+    published = []
+
+    def display(data, raw, display_id, update):
+        assert raw
+        published.append((display_id, update,
+                          json.loads(json.dumps(
+                              data[SimplayConsts.JUPYTERLAB_MIMETYPE]))))
+    monkeypatch.setattr(display_module, "display", display)
+    return published
+
+
+def simulate(env, container, steps):
+    for _ in range(steps):
+        yield env.timeout(1)
+        container.put(1)
+
+
+def test_streams_batches(updates):
+    env = simplay.VisualEnvironment()
+    container = simplay.VisualContainer(env, "tank", "", capacity=100)
+    env.process(simulate(env, container, 5))
+    manager = env.visualization_manager
+    with manager.live(interval=0) as live:
+        env.run()
+    display_id = live.display_id
+    assert all(update[0] == display_id for update in updates)
+    assert [update[1] for update in updates] == [False] + [True] * (
+        len(updates) - 1)
+    first, *batches, last = [update[2] for update in updates]
+    assert first["entities"] == manager.entities
+    assert first["live"] == {"id": display_id, "sequence": 0, "until": 0}
+    streamed = first["events"] + [event for batch in batches
+                                  for event in batch["events"]]
+    assert streamed == last["events"]
+    assert [batch["live"]["sequence"] for batch in batches] == list(
+        range(1, len(batches) + 1))
+    assert batches[-1]["live"]["until"] == 5
+    assert "entities" not in batches[0]
+    assert last["live"] == {"id": display_id, "sequence": len(batches) + 1,
+                            "done": True, "streamed": len(streamed)}
+    assert manager._streams == []
+
+
+def test_batches_respect_interval(updates):
+    env = simplay.VisualEnvironment()
+    container = simplay.VisualContainer(env, "tank", "", capacity=100)
+    env.process(simulate(env, container, 100))
+    with env.visualization_manager.live(interval=3600):
+        env.run()
+    # the start and the end, the events are sent with the end
+    assert len(updates) == 2
+    assert updates[1][2]["live"]["streamed"] == len(updates[0][2]["events"])
+
+
+def test_flush(updates):
+    env = simplay.VisualEnvironment()
+    container = simplay.VisualContainer(env, "tank", "", capacity=100)
+    live = LiveDisplay(env.visualization_manager, interval=3600)
+    live.start()
+    live.flush()
+    assert len(updates) == 1
+    container.put(5)
+    env.run()
+    live.flush()
+    assert updates[-1][2]["events"][0]["args"] == {"level": 5}
+    assert live.streamed == len(env.visualization_manager.events)
@@ -0,0 +1,135 @@
+import random
+import pytest
+import src.simplay.components as simplay
+import src.simplay.runner as runner
+from src.simplay.cache import DiskCache
+from src.simplay.primitives import ErrorText
+
+
+def model(env, seed, params):
+    rng = random.Random(seed)
+    stats = {"served": 0}
+    counter = simplay.VisualResource(env, "counter", params["servers"], "")
+
+    def customer():
+        with counter.request() as req:
+            yield req
+            yield env.timeout(rng.random())
+        stats["served"] += 1
+
+    def source():
+        while True:
+            env.process(customer())
+            yield env.timeout(rng.expovariate(1.0))
+
+    env.process(source())
+    return stats
+
+
+def test_summaries_in_seed_order():
+    results = runner.run_replications(
+        model, [3, 1, 2], {"servers": 2}, until=50, max_workers=1)
+    assert [result.seed for result in results] == [3, 1, 2]
+    assert all(result.summary["served"] > 0 for result in results)
+    assert all(result.recording is None for result in results)
+
+
+def test_replications_are_reproducible():
+    first = runner.run_replications(
+        model, range(4), {"servers": 1}, until=50, max_workers=1)
+    second = runner.run_replications(
+        model, range(4), {"servers": 1}, until=50, max_workers=2)
+    assert [result.summary for result in first] == [
+        result.summary for result in second]
+
+
+def test_recorded_seeds_keep_visualization():
+    results = runner.run_replications(
+        model, range(3), {"servers": 1}, until=20, record=[1],
+        max_workers=2)
+    assert results[0].recording is None
+    assert results[2].recording is None
+    recording = results[1].recording
+    assert len(recording.events) > 0
+    assert recording.entities[0]["id"] == "counter"
+
+
+def test_recording_matches_single_run():
+    env = simplay.VisualEnvironment()
+    model(env, 7, {"servers": 1})
+    env.run(20)
+    result = runner.run_replication(model, 7, {"servers": 1}, 20, True)
+    expected = env.visualization_manager.serialize()
+    assert result.recording.serialize() == expected
+
+
+def test_recorded_seed_must_be_replicated():
+    with pytest.raises(ValueError,
+                       match=ErrorText.RECORDED_SEEDS_MUST_BE_REPLICATED):
+        runner.run_replications(model, range(3), record=[5])
+
+
+def test_grid():
+    assert runner.grid(a=[1, 2], b=["x", "y"]) == [
+        {"a": 1, "b": "x"}, {"a": 1, "b": "y"},
+        {"a": 2, "b": "x"}, {"a": 2, "b": "y"}]
+
+
+def test_sweep_without_cache():
+    results = runner.sweep(
+        model, runner.grid(servers=[1, 2]), [0, 1], until=20,
+        max_workers=1)
+    assert [(result.params["servers"], result.seed)
+            for result in results] == [(1, 0), (1, 1), (2, 0), (2, 1)]
+
+
+def test_sweep_reuses_cached_results(tmp_path, monkeypatch):
+    cache = DiskCache(str(tmp_path))
+    points = runner.grid(servers=[1, 2])
+    first = runner.sweep(model, points, range(2), until=20, record=[0],
+                         cache=cache, max_workers=1)
+    runs = []
+    run = runner._run
+    monkeypatch.setattr(runner, "_run", lambda job: runs.append(job) or
+                        run(job))
+    second = runner.sweep(model, points + [{"servers": 3}], range(2),
+                          until=20, record=[0], cache=cache, max_workers=1)
+    assert [(job[1], job[2]) for job in runs] == [
+        (0, {"servers": 3}), (1, {"servers": 3})]
+    assert [result.summary for result in second[:4]] == [
+        result.summary for result in first]
+    assert second[0].recording.serialize() == first[0].recording.serialize()
+    assert second[1].recording is None
+
+
+def test_sweep_cache_depends_on_arguments(tmp_path):
+    cache = DiskCache(str(tmp_path))
+    digest = runner._model_digest(model)
+    job = (model, 0, {"servers": 1}, 20, False, True)
+    keys = {runner._cache_key(digest, job),
+            runner._cache_key(digest, (model, 1) + job[2:]),
+            runner._cache_key(digest, job[:2] + ({"servers": 2},) + job[3:]),
+            runner._cache_key(digest, job[:3] + (30,) + job[4:]),
+            runner._cache_key(digest, job[:4] + (True, True)),
+            runner._cache_key(runner._model_digest(test_grid), job)}
+    assert len(keys) == 6
+    assert runner._cache_key(digest, job) == runner._cache_key(
+        runner._model_digest(model),
+        (model, 0, {"servers": 1}, 20, False, True))
+    runner.sweep(model, [{"servers": 1}], [0], 20, cache=cache,
+                 max_workers=1)
+    assert cache.get(runner._cache_key(digest, job)) is not None
+
+
+def test_sweep_invalid_cache():
+    with pytest.raises(TypeError, match=ErrorText.CACHE_MUST_BE_DISK_CACHE):
+        runner.sweep(model, [{"servers": 1}], [0], cache="cache")
+
+
+def test_cached_sweep_rejects_params_that_are_not_json(tmp_path):
+    cache = DiskCache(str(tmp_path))
+    with pytest.raises(TypeError, match=ErrorText.CACHED_PARAMS_MUST_BE_JSON):
+        runner.sweep(model, [{"servers": 1, "arrivals": random.expovariate}],
+                     [0], 20, cache=cache, max_workers=1)
+    assert runner.sweep(model, [{"servers": 1}], [0], 20, cache=cache,
+                        max_workers=1)
@@ -0,0 +1,213 @@
+import base64
+import json
+import os
+import socket
+import struct
+import urllib.error
+import urllib.request
+import pytest
+import src.simplay.components as simplay
+from src.simplay.core import VisualRealtimeEnvironment
+from src.simplay.server import VisualizationServer, _Client
+
+
+class WebSocket:
+    def __init__(self, port, origin=None):
+        self.socket = socket.create_connection(("127.0.0.1", port), timeout=5)
+        key = base64.b64encode(os.urandom(16)).decode("ascii")
+        origin = f"Origin: {origin}\r\n" if origin else ""
+        self.socket.sendall(
+            ("GET /events HTTP/1.1\r\n"
+             f"Host: 127.0.0.1:{port}\r\n"
+             f"{origin}"
+             "Upgrade: websocket\r\n"
+             "Connection: Upgrade\r\n"
+             f"Sec-WebSocket-Key: {key}\r\n"
+             "Sec-WebSocket-Version: 13\r\n\r\n").encode("ascii"))
+        self.buffer = b""
+        while b"\r\n\r\n" not in self.buffer:
+            self.buffer += self.socket.recv(4096)
+        response, self.buffer = self.buffer.split(b"\r\n\r\n", 1)
+        self.response = response.decode("latin-1")
+
+    def read(self, size):
+        while len(self.buffer) < size:
+            chunk = self.socket.recv(65536)
+            if not chunk:
+                raise ConnectionError("closed")
+            self.buffer += chunk
+        data, self.buffer = self.buffer[:size], self.buffer[size:]
+        return data
+
+    def receive(self):
+        first, length = self.read(2)
+        assert first == 0x81
+        if length == 126:
+            length, = struct.unpack("!H", self.read(2))
+        elif length == 127:
+            length, = struct.unpack("!Q", self.read(8))
+        return json.loads(self.read(length))
+
+    def close(self):
+        # masked close frame without payload
+        self.socket.sendall(bytes([0x88, 0x80, 1, 2, 3, 4]))
+        self.socket.close()
+
+
+def simulate(env, container, steps):
+    for _ in range(steps):
+        yield env.timeout(1)
+        container.put(1)
+
+
+def test_handshake_and_state():
+    env = simplay.VisualEnvironment()
+    container = simplay.VisualContainer(env, "tank", "", capacity=100)
+    container.put(5)
+    container.put(3)
+    with VisualizationServer(env.visualization_manager, port=0) as server:
+        client = WebSocket(server.port)
+        assert client.response.startswith("HTTP/1.1 101")
+        state = client.receive()
+        client.close()
+    assert state["type"] == "state"
+    assert state["until"] == 0
+    assert state["header"]["entities"] == env.visualization_manager.entities
+    assert [(event["action"], event["args"]) for event in state["events"]] == [
+        ("CONTAINER.SET_CAPACITY", {"capacity": 100}),
+        ("CONTAINER.SET_LEVEL", {"level": 8}),
+    ]
+    assert env.visualization_manager._streams == []
+
+
+def test_broadcasts_batches():
+    env = simplay.VisualEnvironment()
+    container = simplay.VisualContainer(env, "tank", "", capacity=100)
+    env.process(simulate(env, container, 5))
+    with VisualizationServer(env.visualization_manager, port=0,
+                             interval=0) as server:
+        client = WebSocket(server.port)
+        assert client.receive()["type"] == "state"
+        env.run()
+        events = []
+        while len(events) < 5:
+            batch = client.receive()
+            assert batch["type"] == "events"
+            events.extend(batch["events"])
+        client.close()
+    assert [event["args"]["level"] for event in events] == [1, 2, 3, 4, 5]
+    assert batch["until"] == 5
+    assert server.streamed == len(env.visualization_manager.sink)
+
+
+def test_realtime_environment():
+    env = VisualRealtimeEnvironment(factor=0.01)
+    container = simplay.VisualContainer(env, "tank", "", capacity=100)
+    env.process(simulate(env, container, 3))
+    with VisualizationServer(env.visualization_manager, port=0,
+                             interval=3600) as server:
+        client = WebSocket(server.port)
+        client.receive()
+        env.run()
+        # flushed whenever the simulation waits for the wall clock
+        batches = [client.receive() for _ in range(3)]
+        client.close()
+    assert [batch["until"] for batch in batches] == [1, 2, 3]
+
+
+def get(port, path):
+    with socket.create_connection(("127.0.0.1", port), timeout=5) as client:
+        client.sendall(f"GET {path} HTTP/1.1\r\n\r\n".encode("ascii"))
+        return client.makefile("rb").readline()
+
+
+def test_serves_static_files(tmp_path):
+    (tmp_path / "secret.txt").write_text("secret")
+    player = tmp_path / "player"
+    player.mkdir()
+    (player / "index.html").write_text("<html></html>")
+    (player / "player.js").write_text("console.log(1);")
+    env = simplay.VisualEnvironment()
+    with VisualizationServer(env.visualization_manager, port=0,
+                             static_dir=str(player)) as server:
+        with urllib.request.urlopen(server.url) as response:
+            assert response.read() == b"<html></html>"
+            assert response.headers["Content-Type"] == "text/html"
+        with urllib.request.urlopen(server.url + "player.js") as response:
+            assert response.read() == b"console.log(1);"
+        for path in ("missing.js", "events"):
+            with pytest.raises(urllib.error.HTTPError) as error:
+                urllib.request.urlopen(server.url + path)
+            assert error.value.code == 404
+        assert get(server.port, "/../secret.txt").startswith(b"HTTP/1.1 404")
+
+
+def test_new_entities_resync_clients():
+    env = simplay.VisualEnvironment()
+    simplay.VisualContainer(env, "tank", "", capacity=100)
+    with VisualizationServer(env.visualization_manager, port=0,
+                             interval=0) as server:
+        client = WebSocket(server.port)
+        assert len(client.receive()["header"]["entities"]) == 1
+        simplay.VisualContainer(env, "silo", "", capacity=100).put(1)
+        server.flush()
+        state = client.receive()
+        client.close()
+    assert state["type"] == "state"
+    assert len(state["header"]["entities"]) == 2
+    assert {event["forId"] for event in state["events"]} == {"tank", "silo"}
+
+
+def test_rejects_other_origins():
+    env = simplay.VisualEnvironment()
+    with VisualizationServer(env.visualization_manager, port=0) as server:
+        client = WebSocket(server.port, "http://example.com")
+        assert client.response.startswith("HTTP/1.1 403")
+        client.socket.close()
+        client = WebSocket(server.port, f"http://127.0.0.1:{server.port}")
+        assert client.response.startswith("HTTP/1.1 101")
+        client.close()
+
+
+def test_closes_on_large_frames():
+    env = simplay.VisualEnvironment()
+    with VisualizationServer(env.visualization_manager, port=0) as server:
+        client = WebSocket(server.port)
+        assert client.receive()["type"] == "state"
+        # announces a ping of 1 TiB
+        client.socket.sendall(bytes([0x89, 0xFF])
+                              + struct.pack("!Q", 1 << 40) + b"\1\2\3\4")
+        assert client.read(4) == bytes([0x88, 2]) + struct.pack("!H", 1009)
+        client.socket.close()
+
+
+def test_start_fails_if_port_is_in_use():
+    env = simplay.VisualEnvironment()
+    with socket.socket() as taken:
+        taken.bind(("127.0.0.1", 0))
+        taken.listen()
+        server = VisualizationServer(env.visualization_manager,
+                                     port=taken.getsockname()[1])
+        with pytest.raises(OSError):
+            server.start()
+    assert env.visualization_manager._streams == []
+
+
+class TestClient:
+    def test_queues_messages(self):
+        client = _Client(None, max_pending=2)
+        client.needs_state = False
+        client.offer(1, "a")
+        client.offer(2, "b")
+        assert list(client.pending) == [(1, "a"), (2, "b")]
+        assert client.wake.is_set()
+
+    def test_coalesces_into_state_when_behind(self):
+        client = _Client(None, max_pending=2)
+        client.needs_state = False
+        for end in range(3):
+            client.offer(end, str(end))
+        assert not client.pending
+        assert client.needs_state
+        client.offer(4, "4")
+        assert not client.pending